@@ -1,8 +1,8 @@
 import time
-from selenium import webdriver
+from cobaTest.utils.driver_factory import get_firefox_driver
 
-# Set up the WebDriver (assuming Chrome)
-driver = webdriver.Firefox()
+# Set up the WebDriver (Firefox, driver path served from the local cache)
+driver = get_firefox_driver()
 
 # Open a web page
 driver.get("https://www.example.com")
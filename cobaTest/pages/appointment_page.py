@@ -1,28 +1,32 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
+from selenium.webdriver.common.keys import Keys
 from .base_page import BasePage
+from .element import Element
 
 class AppointmentPage(BasePage):
-    FACILITY = (By.ID, "combo_facility")
-    READMISSION = (By.ID, "chk_hospotal_readmission")
-    PROGRAM_MEDICARE = (By.ID, "radio_program_medicare")
-    PROGRAM_MEDICAID = (By.ID, "radio_program_medicaid")
-    PROGRAM_NONE = (By.ID, "radio_program_none")
-    VISIT_DATE = (By.ID, "txt_visit_date")
-    COMMENT = (By.ID, "txt_comment")
-    BOOK_BTN = (By.ID, "btn-book-appointment")
+    FACILITY = Element(By.ID, "combo_facility")
+    READMISSION = Element(By.ID, "chk_hospotal_readmission")
+    PROGRAM_MEDICARE = Element(By.ID, "radio_program_medicare")
+    PROGRAM_MEDICAID = Element(By.ID, "radio_program_medicaid")
+    PROGRAM_NONE = Element(By.ID, "radio_program_none")
+    VISIT_DATE = Element(By.ID, "txt_visit_date")
+    COMMENT = Element(By.ID, "txt_comment")
+    BOOK_BTN = Element(By.ID, "btn-book-appointment")
+
+    READY_WHEN = ("dom", FACILITY)
 
     def book_appointment(self, config):
-        Select(self.wait_for_element(self.FACILITY)).select_by_visible_text(config["facility"])
-        readmission = self.wait_for_element(self.READMISSION)
-        if config["readmission"] != readmission.is_selected():
-            readmission.click()
         program_map = {
             "Medicare": self.PROGRAM_MEDICARE,
             "Medicaid": self.PROGRAM_MEDICAID,
             "None": self.PROGRAM_NONE
         }
-        self.click(program_map[config["healthcare_program"]])
-        self.type(self.VISIT_DATE, config["visit_date"])
-        self.type(self.COMMENT, config["comment"])
-        self.click(self.BOOK_BTN)
\ No newline at end of file
+        self.fill_form({
+            self.FACILITY: config["facility"],
+            self.READMISSION: config["readmission"],
+            program_map[config["healthcare_program"]]: True,
+            self.COMMENT: config["comment"],
+            # Typed last; Tab closes the datepicker so it can't cover the Book button.
+            self.VISIT_DATE: config["visit_date"] + Keys.TAB,
+        }, native=(self.VISIT_DATE,))
+        self.BOOK_BTN.click()
\ No newline at end of file
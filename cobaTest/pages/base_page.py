@@ -1,25 +1,371 @@
-from selenium.webdriver.support.ui import WebDriverWait
+import time
+import weakref
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
+
+from cobaTest.utils.command_trace import register_caller_type
+
+from .js_locators import FIND_JS, js_locator
+from .observer_wait import wait_for
+
+DOCUMENT_STATES = {
+    "dom": ("interactive", "complete"),
+    "load": ("complete",),
+}
+NETWORK_IDLE_SECONDS = 0.5
+# Open dialogs block page scripts, so alerts can't be observed in-page and
+# are polled instead, at a rate that is cheap for a single round trip.
+ALERT_POLL_SECONDS = 0.05
+
+# Counts fetch/XHR requests in flight and finished resource loads. Finished
+# loads come from a PerformanceObserver, which (unlike the resource timing
+# buffer, 250 entries by default) never fills up. Idempotent per document.
+NETWORK_TRACKER_JS = """
+(function () {
+    if (window.__pyseleNet) return;
+    var net = window.__pyseleNet = {inFlight: 0, finished: 0};
+    function done() { net.inFlight = Math.max(0, net.inFlight - 1); }
+    try { performance.setResourceTimingBufferSize(100000); } catch (e) {}
+    try {
+        new PerformanceObserver(function (list) { net.finished += list.getEntries().length; })
+            .observe({type: "resource", buffered: true});
+    } catch (e) {}
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            net.inFlight++;
+            try {
+                var pending = fetch.apply(this, arguments);
+            } catch (e) {
+                done();
+                throw e;
+            }
+            pending.then(done, done);
+            return pending;
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        net.inFlight++;
+        this.addEventListener("loadend", done);
+        try {
+            return send.apply(this, arguments);
+        } catch (e) {
+            this.removeEventListener("loadend", done);
+            done();
+            throw e;
+        }
+    };
+})();
+"""
+
+NETWORK_STATE_JS = NETWORK_TRACKER_JS + """
+var net = window.__pyseleNet;
+return [net.inFlight, net.finished, performance.getEntriesByType("resource").length];
+"""
+
+def _attached(element):
+    element.is_enabled()  # raises StaleElementReferenceException once detached
+    return element
+
+
+# Drivers whose new documents already get the tracker before any page script.
+_tracked_drivers = weakref.WeakSet()
+
+READ_MANY_JS = FIND_JS + """
+var fields = arguments[0], values = {}, missing = [];
+for (var name in fields) {
+    var field = fields[name], el = pyseleFind(field[0], field[1]);
+    if (!el) {
+        missing.push(name);
+    } else if (field[2]) {
+        var attr = field[2], prop = el[attr];
+        values[name] = (attr in el && typeof prop !== "object" && typeof prop !== "function")
+            ? String(prop) : el.getAttribute(attr);
+    } else {
+        values[name] = (el.innerText || el.textContent || "").replace(/\\s+/g, " ").trim();
+    }
+}
+return {values: values, missing: missing};
+"""
+
+# Fills every field that is present and reports the indices of the rest, so
+# a retry only touches the fields that were missing.
+FILL_FORM_JS = FIND_JS + """
+var fields = arguments[0], missing = [];
 
+function fire(el, type) {
+    el.dispatchEvent(new Event(type, {bubbles: true}));
+}
+
+for (var i = 0; i < fields.length; i++) {
+    var el = pyseleFind(fields[i][0], fields[i][1]), value = fields[i][2];
+    if (!el) {
+        missing.push(i);
+        continue;
+    }
+    var tag = el.tagName.toLowerCase(), type = (el.type || "").toLowerCase();
+    if (tag === "select") {
+        var index = -1;
+        for (var j = 0; j < el.options.length; j++) {
+            if (el.options[j].text.replace(/\\s+/g, " ").trim() === value) { index = j; break; }
+        }
+        if (index === -1) return {missing: missing, badOption: i};
+        if (el.selectedIndex !== index) {
+            el.focus();
+            el.selectedIndex = index;
+            fire(el, "input");
+            fire(el, "change");
+        }
+    } else if (type === "checkbox" || type === "radio") {
+        // A real click fires click/input/change exactly as the browser would.
+        if (el.checked !== Boolean(value)) el.click();
+    } else {
+        el.focus();
+        var proto = tag === "textarea" ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+        fire(el, "input");
+        fire(el, "change");
+        el.blur();
+    }
+}
+return {missing: missing};
+"""
+
+@register_caller_type
 class BasePage:
+    # What "ready" means for this page, checked in order by wait_until_ready:
+    # "dom" (DOMContentLoaded), "load" (all subresources), "network_idle"
+    # (no fetch/XHR in flight and no resource finished loading for
+    # NETWORK_IDLE_SECONDS) or a locator that must be present.
+    READY_WHEN = ("dom",)
+
     def __init__(self, driver):
         self.driver = driver
+        # locator -> WebElement handle; cleared on open() and after every
+        # click, either of which may load a new document
+        self._elements = {}
+
+    def open(self, url, timeout=10):
+        self._elements.clear()
+        if "network_idle" in self.READY_WHEN:
+            self._track_network()
+        self.driver.get(url)
+        self.wait_until_ready(timeout)
+
+    def wait_until_ready(self, timeout=10):
+        deadline = time.monotonic() + timeout
+        for condition in self.READY_WHEN:
+            remaining = max(0.0, deadline - time.monotonic())
+            if condition in DOCUMENT_STATES:
+                states = DOCUMENT_STATES[condition]
+                WebDriverWait(self.driver, remaining).until(
+                    lambda d: d.execute_script("return document.readyState") in states,
+                    f"document.readyState never reached {states}",
+                )
+            elif condition == "network_idle":
+                self.wait_for_network_idle(remaining)
+            else:
+                self.wait_for_element(condition, remaining)
+
+    def _track_network(self):
+        """Have Chromium install the request tracker in every new document before its own scripts.
+
+        Elsewhere the tracker is installed by the first idle poll, so requests
+        started earlier are only seen once they finish.
+        """
+        if self.driver in _tracked_drivers:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_JS})
+        except (AttributeError, WebDriverException):
+            return
+        _tracked_drivers.add(self.driver)
+
+    def wait_for_network_idle(self, timeout=10, idle_seconds=NETWORK_IDLE_SECONDS):
+        last = {"activity": None, "since": time.monotonic()}
+
+        def idle(driver):
+            in_flight, *activity = driver.execute_script(NETWORK_STATE_JS)
+            now = time.monotonic()
+            if in_flight or activity != last["activity"]:
+                last["activity"], last["since"] = activity, now
+            return now - last["since"] >= idle_seconds
+
+        WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(idle, "network never became idle")
+
+    def wait_for(self, condition, locator, timeout=10, text=None):
+        result = wait_for(self.driver, condition, locator, timeout, text)
+        if isinstance(result, WebElement):
+            self._elements[tuple(locator)] = result
+        return result
 
     def wait_for_element(self, locator, timeout=10):
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(locator)
-        )
+        return self.wait_for("presence", locator, timeout)
+
+    def wait_for_visible(self, locator, timeout=10):
+        return self.wait_for("visibility", locator, timeout)
+
+    def wait_for_invisible(self, locator, timeout=10):
+        return self.wait_for("invisibility", locator, timeout)
+
+    def wait_for_text(self, locator, text, timeout=10):
+        return self.wait_for("text", locator, timeout, text)
 
     def wait_for_clickable(self, locator, timeout=10):
-        return WebDriverWait(self.driver, timeout).until(
-            EC.element_to_be_clickable(locator)
+        return self.wait_for("clickable", locator, timeout)
+
+    def wait_until(self, predicate, budget=10, interval=0.05, message=None):
+        """Return the first truthy ``predicate(driver)`` within ``budget`` seconds."""
+        return WebDriverWait(self.driver, budget, poll_frequency=interval).until(
+            predicate, message or f"condition not met within {budget}s"
+        )
+
+    def wait_for_alert(self, timeout=10):
+        return self.wait_until(
+            EC.alert_is_present(), timeout, ALERT_POLL_SECONDS, f"no alert appeared within {timeout}s"
         )
 
+    def accept_alert(self, timeout=10):
+        """Accept the next alert or confirm dialog and return its text."""
+        alert = self.wait_for_alert(timeout)
+        text = alert.text
+        alert.accept()
+        return text
+
+    def dismiss_alert(self, timeout=10):
+        alert = self.wait_for_alert(timeout)
+        text = alert.text
+        alert.dismiss()
+        return text
+
+    def answer_prompt(self, answer, timeout=10):
+        """Type ``answer`` into the next prompt, accept it and return its text."""
+        alert = self.wait_for_alert(timeout)
+        text = alert.text
+        alert.send_keys(answer)
+        alert.accept()
+        return text
+
+    def find(self, locator, timeout=10):
+        """The element for ``locator``, from this page's cache when it is still attached.
+
+        The handle leaves the page object, so unlike ``with_element`` a stale
+        one can't be caught later: a cached handle is checked with one cheap
+        command first, and on ``StaleElementReferenceException`` the element
+        is waited for again.
+        """
+        return self.with_element(locator, _attached, timeout=timeout, probe_cached=True)
+
+    def with_element(self, locator, action, condition="presence", timeout=10, probe_cached=False):
+        """Return ``action(element)``, using the cached element when there is one.
+
+        A cached handle skips the ``condition`` wait, so if it has gone stale
+        or isn't interactable yet the element is waited for again and the
+        action retried once. A freshly found element skips the action when
+        ``probe_cached`` is set, for actions that only check the handle.
+        """
+        key = tuple(locator)
+        cached = self._elements.get(key)
+        if cached is not None:
+            try:
+                return action(cached)
+            except StaleElementReferenceException:
+                self._elements.pop(key, None)
+            except (ElementNotInteractableException, ElementClickInterceptedException):
+                pass
+        element = self.wait_for(condition, locator, timeout)
+        return element if probe_cached else action(element)
+
     def click(self, locator):
-        self.wait_for_clickable(locator).click()
+        try:
+            self.with_element(locator, lambda el: el.click(), "clickable")
+        finally:
+            # A click can submit a form or follow a link, and the next
+            # document's elements are never the ones cached for this one.
+            self._elements.clear()
 
     def type(self, locator, text, clear_first=True):
-        el = self.wait_for_element(locator)
-        if clear_first:
-            el.clear()
-        el.send_keys(text)
\ No newline at end of file
+        def fill(el):
+            if clear_first:
+                el.clear()
+            el.send_keys(text)
+
+        self.with_element(locator, fill)
+
+    def read_many(self, fields, timeout=10):
+        """Wait for several elements at once and read them in one script call.
+
+        ``fields`` maps result keys to a locator (read the element's text) or
+        to ``(locator, attribute)``. Each poll is a single round trip; on
+        timeout the error names every key whose element never appeared.
+        """
+        spec = {}
+        for name, field in fields.items():
+            if isinstance(field[0], tuple):
+                locator, attribute = field
+                spec[name] = js_locator(locator) + [attribute]
+            else:
+                spec[name] = js_locator(field) + [None]
+
+        last = {}
+
+        def all_present(driver):
+            last.update(driver.execute_script(READ_MANY_JS, spec))
+            return not last["missing"]
+
+        try:
+            WebDriverWait(self.driver, timeout).until(all_present)
+            return last["values"]
+        except TimeoutException:
+            missing = {name: fields[name] for name in last.get("missing", spec)}
+            raise TimeoutException(f"Elements not found after {timeout}s: {missing}") from None
+
+    def fill_form(self, spec, native=(), timeout=10):
+        """Set many form fields with one script execution.
+
+        ``spec`` maps locators to values: selects take the visible option
+        text, checkboxes and radios a bool, everything else a string. Input and
+        change events are dispatched as real typing would. Locators in
+        ``native`` are typed with real ``send_keys`` instead, for widgets that
+        need genuine key events (e.g. datepickers); they are typed after the
+        batch, in ``spec`` order, so the rest still takes one script execution.
+        """
+        self._fill_batch([(locator, value) for locator, value in spec.items() if locator not in native], timeout)
+        for locator, value in spec.items():
+            if locator in native:
+                self.type(locator, value)
+
+    def _fill_batch(self, batch, timeout):
+        if not batch:
+            return
+        payload = [js_locator(locator) + [value] for locator, value in batch]
+        pending = list(range(len(batch)))
+        bad_option = []
+
+        def filled(driver):
+            result = driver.execute_script(FILL_FORM_JS, [payload[i] for i in pending])
+            if "badOption" in result:
+                bad_option.append(pending[result["badOption"]])
+                return True
+            pending[:] = [pending[i] for i in result["missing"]]
+            return not pending
+
+        try:
+            WebDriverWait(self.driver, timeout).until(filled)
+        except TimeoutException:
+            missing = [batch[i][0] for i in pending]
+            raise TimeoutException(f"Form fields not found after {timeout}s: {missing}") from None
+        if bad_option:
+            locator, value = batch[bad_option[0]]
+            raise NoSuchElementException(f"Could not locate option with visible text {value!r} in {locator}")
@@ -1,20 +1,25 @@
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from .element import Element
 
 class ConfirmationPage(BasePage):
-    CONFIRM_HEADER = (By.XPATH, "//h2[contains(text(), 'Appointment Confirmation')]")
-    FACILITY = (By.ID, "facility")
-    READMISSION = (By.ID, "hospital_readmission")
-    PROGRAM = (By.ID, "program")
-    VISIT_DATE = (By.ID, "visit_date")
-    COMMENT = (By.ID, "comment")
+    CONFIRM_HEADER = Element(By.XPATH, "//h2[contains(text(), 'Appointment Confirmation')]")
+    FACILITY = Element(By.ID, "facility")
+    READMISSION = Element(By.ID, "hospital_readmission")
+    PROGRAM = Element(By.ID, "program")
+    VISIT_DATE = Element(By.ID, "visit_date")
+    COMMENT = Element(By.ID, "comment")
+
+    READY_WHEN = ("dom", CONFIRM_HEADER)
 
     def get_details(self):
-        self.wait_for_element(self.CONFIRM_HEADER)
-        return {
-            "facility": self.wait_for_element(self.FACILITY).text,
-            "readmission": self.wait_for_element(self.READMISSION).text,
-            "program": self.wait_for_element(self.PROGRAM).text,
-            "visit_date": self.wait_for_element(self.VISIT_DATE).text,
-            "comment": self.wait_for_element(self.COMMENT).text,
-        }
\ No newline at end of file
+        details = self.read_many({
+            "header": self.CONFIRM_HEADER,
+            "facility": self.FACILITY,
+            "readmission": self.READMISSION,
+            "program": self.PROGRAM,
+            "visit_date": self.VISIT_DATE,
+            "comment": self.COMMENT,
+        })
+        del details["header"]
+        return details
\ No newline at end of file
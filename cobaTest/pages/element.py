@@ -0,0 +1,63 @@
+"""Declarative element locators for page objects.
+
+``Element(By.ID, "txt_comment")`` is still a ``(By, value)`` tuple, so it
+works anywhere a locator does. On a page instance it becomes a
+``BoundElement`` that can be used directly:
+
+    class AppointmentPage(BasePage):
+        COMMENT = Element(By.ID, "txt_comment")
+
+        def add_comment(self, text):
+            self.COMMENT.type(text)
+
+The element is looked up on first use and the handle is cached on the page
+instance. ``BasePage.open`` and every click (which may navigate) drop the
+cache, and a ``StaleElementReferenceException`` drops the handle, followed by
+one transparent retry. ``element`` checks a cached handle before returning
+it, since it is used outside the page object.
+"""
+
+
+class Element(tuple):
+    __slots__ = ()
+
+    def __new__(cls, by, value):
+        return super().__new__(cls, (by, value))
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+        return BoundElement(page, self)
+
+
+class BoundElement(tuple):
+    """An ``Element`` seen through a page instance."""
+
+    def __new__(cls, page, locator):
+        bound = super().__new__(cls, locator)
+        bound.page = page
+        return bound
+
+    @property
+    def element(self):
+        """The ``WebElement``, looked up (and waited for) unless a cached handle is still attached."""
+        return self.page.find(self)
+
+    @property
+    def text(self):
+        return self.page.with_element(self, lambda el: el.text)
+
+    def get_attribute(self, name):
+        return self.page.with_element(self, lambda el: el.get_attribute(name))
+
+    def is_displayed(self):
+        return self.page.with_element(self, lambda el: el.is_displayed())
+
+    def click(self):
+        self.page.click(self)
+
+    def type(self, text, clear_first=True):
+        self.page.type(self, text, clear_first)
+
+    def wait_until_visible(self, timeout=10):
+        return self.page.wait_for_visible(self, timeout)
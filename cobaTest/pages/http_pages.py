@@ -0,0 +1,177 @@
+"""Browserless implementations of the CURA page objects.
+
+``HttpDriver`` stands in for a WebDriver: it keeps the cookie jar, the
+current URL and the page source of the last response. The ``Http*Page``
+classes expose the same methods as their Selenium counterparts but submit
+the login and appointment forms directly, so data-driven volume runs don't
+need a browser. Every ``HttpDriver`` has its own cookies but shares the
+connection pool of ``cobaTest.utils.http_transport`` with the others.
+"""
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from cobaTest.utils import http_transport
+
+BASE_URL = "https://katalon-demo-cura.herokuapp.com/"
+
+
+class HttpDriver:
+    def __init__(self, base_url=BASE_URL, adapter=None):
+        self.base_url = base_url
+        self.session = http_transport.session({"User-Agent": "pysele-http-driver/1.0"})
+        if adapter is not None:
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        self.current_url = None
+        self.page_source = ""
+
+    def url(self, path):
+        return urljoin(self.base_url, path)
+
+    def get(self, url):
+        self._load(self.session.get(url))
+
+    def post(self, url, data):
+        self._load(self.session.post(url, data=data))
+
+    def _load(self, response):
+        response.raise_for_status()
+        self.current_url = response.url
+        self.page_source = response.text
+
+    def quit(self):
+        # Session.close() would also close the shared adapter's pool.
+        self.session.cookies.clear()
+
+
+class _TextById(HTMLParser):
+    """Collects the whitespace-normalized text of elements with given ids."""
+
+    VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+    # Start tags that implicitly close the open elements above them, e.g. a
+    # <li> ends the previous <li> and a <tr> ends the previous row's cell.
+    IMPLIED_END = {
+        "li": {"li"},
+        "option": {"option"},
+        "dt": {"dt", "dd"},
+        "dd": {"dt", "dd"},
+        "td": {"td", "th"},
+        "th": {"td", "th"},
+        "tr": {"tr", "td", "th"},
+    }
+    # Block start tags that end an open <p>.
+    CLOSES_P = {
+        "address", "article", "aside", "blockquote", "div", "dl", "fieldset", "footer", "form", "h1", "h2",
+        "h3", "h4", "h5", "h6", "header", "main", "nav", "ol", "p", "pre", "section", "table", "ul",
+    }
+
+    def __init__(self, ids):
+        super().__init__()
+        self.wanted = set(ids)
+        self.found = {}
+        self._stack = []  # [tag, id or None, chunks or None] for each open element
+
+    def handle_starttag(self, tag, attrs):
+        implied = self.IMPLIED_END.get(tag, set()) | ({"p"} if tag in self.CLOSES_P else set())
+        while self._stack and self._stack[-1][0] in implied:
+            self._close(self._stack.pop())
+        if tag in self.VOID_TAGS:
+            return
+        element_id = dict(attrs).get("id")
+        if element_id in self.wanted and element_id not in self.found and not self._collecting(element_id):
+            self._stack.append([tag, element_id, []])
+        else:
+            self._stack.append([tag, None, None])
+
+    def handle_endtag(self, tag):
+        # An end tag closes its own element and any left open inside it; a
+        # stray one with no open element of that name is ignored.
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                while len(self._stack) > depth:
+                    self._close(self._stack.pop())
+                return
+
+    def handle_data(self, data):
+        for _, _, chunks in self._stack:
+            if chunks is not None:
+                chunks.append(data)
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._close(self._stack.pop())
+
+    def _collecting(self, element_id):
+        return any(open_id == element_id for _, open_id, _ in self._stack)
+
+    def _close(self, element):
+        _, element_id, chunks = element
+        if chunks is not None:
+            self.found[element_id] = " ".join("".join(chunks).split())
+
+
+def text_by_id(page_source, ids):
+    parser = _TextById(ids)
+    parser.feed(page_source)
+    parser.close()
+    return parser.found
+
+
+class HttpPage:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def open(self, url, timeout=10):
+        self.driver.get(url)
+
+
+class HttpLoginPage(HttpPage):
+    def go_to_login(self):
+        self.driver.get(self.driver.url("profile.php#login"))
+
+    def login(self, username, password):
+        self.driver.post(
+            self.driver.url("authenticate.php"),
+            {"username": username, "password": password},
+        )
+        if 'id="combo_facility"' not in self.driver.page_source:
+            raise RuntimeError(f"Login failed for {username!r}: appointment form not returned")
+
+
+class HttpAppointmentPage(HttpPage):
+    def book_appointment(self, config):
+        data = {
+            "facility": config["facility"],
+            "programs": config["healthcare_program"],
+            "visit_date": config["visit_date"],
+            "comment": config["comment"],
+        }
+        if config["readmission"]:
+            data["hospital_readmission"] = "Yes"
+        self.driver.post(self.driver.url("appointment.php#summary"), data)
+
+
+class HttpConfirmationPage(HttpPage):
+    FIELDS = {
+        "facility": "facility",
+        "readmission": "hospital_readmission",
+        "program": "program",
+        "visit_date": "visit_date",
+        "comment": "comment",
+    }
+
+    def get_details(self):
+        source = self.driver.page_source
+        if "Appointment Confirmation" not in source:
+            raise RuntimeError(f"Not on the confirmation page: {self.driver.current_url}")
+        found = text_by_id(source, self.FIELDS.values())
+        missing = [key for key, element_id in self.FIELDS.items() if element_id not in found]
+        if missing:
+            raise RuntimeError(f"Confirmation page is missing {missing}")
+        return {key: found[element_id] for key, element_id in self.FIELDS.items()}
+
+
+class HttpMenuPage(HttpPage):
+    def logout(self):
+        self.driver.get(self.driver.url("authenticate.php?logout"))
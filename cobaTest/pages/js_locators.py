@@ -0,0 +1,44 @@
+"""In-page equivalents of Selenium's locator strategies.
+
+``FIND_JS`` defines ``pyseleFind(by, value)``, which resolves a ``(By, value)``
+locator to the first matching element (or ``null``) inside the page, so a
+single ``execute_script`` call can work with many locators at once.
+"""
+
+FIND_JS = """
+function pyseleFind(by, value) {
+    switch (by) {
+        case "id":
+            return document.getElementById(value);
+        case "css selector":
+            return document.querySelector(value);
+        case "name":
+            return document.getElementsByName(value)[0] || null;
+        case "class name":
+            return document.getElementsByClassName(value)[0] || null;
+        case "tag name":
+            return document.getElementsByTagName(value)[0] || null;
+        case "xpath":
+            return document.evaluate(
+                value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+        case "link text":
+        case "partial link text":
+            var links = document.getElementsByTagName("a");
+            for (var i = 0; i < links.length; i++) {
+                var text = (links[i].innerText || "").trim();
+                if (by === "link text" ? text === value : text.indexOf(value) !== -1) {
+                    return links[i];
+                }
+            }
+            return null;
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+"""
+
+
+def js_locator(locator):
+    """A ``(By, value)`` tuple as a JSON-friendly ``[by, value]`` pair."""
+    by, value = locator
+    return [by, value]
@@ -1,16 +1,19 @@
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from .element import Element
 
 class LoginPage(BasePage):
-    MAKE_APPOINTMENT = (By.LINK_TEXT, "Make Appointment")
-    USERNAME = (By.ID, "txt-username")
-    PASSWORD = (By.ID, "txt-password")
-    LOGIN_BTN = (By.ID, "btn-login")
+    MAKE_APPOINTMENT = Element(By.LINK_TEXT, "Make Appointment")
+    USERNAME = Element(By.ID, "txt-username")
+    PASSWORD = Element(By.ID, "txt-password")
+    LOGIN_BTN = Element(By.ID, "btn-login")
+
+    READY_WHEN = ("dom", MAKE_APPOINTMENT)
 
     def go_to_login(self):
-        self.click(self.MAKE_APPOINTMENT)
+        self.MAKE_APPOINTMENT.click()
 
     def login(self, username, password):
-        self.type(self.USERNAME, username)
-        self.type(self.PASSWORD, password)
-        self.click(self.LOGIN_BTN)
\ No newline at end of file
+        self.USERNAME.type(username)
+        self.PASSWORD.type(password)
+        self.LOGIN_BTN.click()
\ No newline at end of file
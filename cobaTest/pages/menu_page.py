@@ -1,10 +1,11 @@
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from .element import Element
 
 class MenuPage(BasePage):
-    MENU_TOGGLE = (By.XPATH, '//*[@id="menu-toggle"]')
-    LOGOUT = (By.LINK_TEXT, "Logout")
+    MENU_TOGGLE = Element(By.XPATH, '//*[@id="menu-toggle"]')
+    LOGOUT = Element(By.LINK_TEXT, "Logout")
 
     def logout(self):
-        self.click(self.MENU_TOGGLE)
-        self.click(self.LOGOUT)
\ No newline at end of file
+        self.MENU_TOGGLE.click()
+        self.LOGOUT.click()
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""Push-based waits built on an in-page MutationObserver.
+
+``WebDriverWait`` polls every 500 ms and each poll is a WebDriver round trip.
+``wait_for`` instead installs a MutationObserver with one async script call,
+which resolves as soon as the condition holds. An in-page 100 ms re-check
+covers changes no mutation reports, such as CSS transitions. Pages that unload
+mid-wait are re-observed, and anything else that stops the script falls back
+to ordinary polling. Set ``PYSELE_WAIT_ENGINE=poll`` to always poll.
+"""
+import os
+import time
+import weakref
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .js_locators import FIND_JS
+
+OBSERVE_JS = FIND_JS + """
+var by = arguments[0], value = arguments[1], condition = arguments[2],
+    expectedText = arguments[3], timeoutMs = arguments[4],
+    done = arguments[arguments.length - 1];
+
+function visible(el) {
+    if (!el.isConnected) return false;
+    var style = window.getComputedStyle(el);
+    if (style.display === "none" || style.visibility === "hidden" || parseFloat(style.opacity) === 0) {
+        return false;
+    }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+function check() {
+    var el = pyseleFind(by, value);
+    switch (condition) {
+        case "presence": return el;
+        case "visibility": return el && visible(el) ? el : null;
+        case "clickable": return el && visible(el) && !el.disabled ? el : null;
+        case "invisibility": return !el || !visible(el) ? true : null;
+        case "text":
+            return el && (el.innerText || el.textContent || "").indexOf(expectedText) !== -1 ? true : null;
+    }
+    throw new Error("Unsupported wait condition: " + condition);
+}
+
+var initial = check();
+if (initial) {
+    done(initial);
+} else {
+    var finished = false, observer, timer, backstop;
+    var finish = function (result) {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        clearInterval(backstop);
+        done(result);
+    };
+    var recheck = function () {
+        var result = check();
+        if (result) finish(result);
+    };
+    observer = new MutationObserver(recheck);
+    observer.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    backstop = setInterval(recheck, 100);
+    timer = setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
+
+FALLBACK_CONDITIONS = {
+    "presence": lambda locator, text: EC.presence_of_element_located(locator),
+    "visibility": lambda locator, text: EC.visibility_of_element_located(locator),
+    "clickable": lambda locator, text: EC.element_to_be_clickable(locator),
+    "invisibility": lambda locator, text: EC.invisibility_of_element_located(locator),
+    "text": lambda locator, text: EC.text_to_be_present_in_element(locator, text),
+}
+
+# Leave the browser room to resolve the script itself before WebDriver's
+# script timeout fires.
+SCRIPT_TIMEOUT_MARGIN = 2.0
+
+_script_timeouts = weakref.WeakKeyDictionary()
+
+
+def _ensure_script_timeout(driver, seconds):
+    current = _script_timeouts.get(driver, 30.0)  # WebDriver's default
+    if seconds + SCRIPT_TIMEOUT_MARGIN > current:
+        driver.set_script_timeout(seconds + SCRIPT_TIMEOUT_MARGIN)
+        _script_timeouts[driver] = seconds + SCRIPT_TIMEOUT_MARGIN
+
+
+def poll_for(driver, condition, locator, timeout=10, text=None):
+    return WebDriverWait(driver, timeout).until(
+        FALLBACK_CONDITIONS[condition](locator, text),
+        f"{condition} of {locator} not met after {timeout}s",
+    )
+
+
+def wait_for(driver, condition, locator, timeout=10, text=None):
+    """Wait until ``condition`` holds for ``locator``.
+
+    Returns the element for presence/visibility/clickable and ``True`` for
+    invisibility/text, like the matching expected conditions.
+    """
+    if condition not in FALLBACK_CONDITIONS:
+        raise ValueError(f"Unsupported wait condition: {condition}")
+    if os.environ.get("PYSELE_WAIT_ENGINE") == "poll":
+        return poll_for(driver, condition, locator, timeout, text)
+
+    by, value = locator
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(f"{condition} of {locator} not met after {timeout}s")
+        try:
+            _ensure_script_timeout(driver, remaining)
+            result = driver.execute_async_script(OBSERVE_JS, by, value, condition, text, int(remaining * 1000))
+        except JavascriptException as e:
+            if "unloaded" in str(e):
+                time.sleep(0.05)  # the page navigated mid-wait; observe the new document
+                continue
+            return poll_for(driver, condition, locator, max(deadline - time.monotonic(), 0.0), text)
+        except WebDriverException:
+            return poll_for(driver, condition, locator, max(deadline - time.monotonic(), 0.0), text)
+        if result:
+            return result
+        raise TimeoutException(f"{condition} of {locator} not met after {timeout}s")
@@ -1,10 +1,16 @@
-import requests
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from cobaTest.utils import http_transport
+from cobaTest.utils.petstore_stub import petstore_url
 
 def test_get_user():
     username = "apitestuser"  # Use the username you created previously
-    url = f"https://petstore.swagger.io/v2/user/{username}"
+    url = f"{petstore_url('v2')}/user/{username}"
 
-    response = requests.get(url)
+    response = http_transport.get(url)
     print(f"Status code: {response.status_code}")
     print(f"Response: {response.json()}")
 
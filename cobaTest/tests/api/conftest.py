@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+# The API suites are also run from their own directory, where the repository
+# root isn't on sys.path and the conftests above this one aren't loaded.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from cobaTest.utils import http_transport
+from cobaTest.utils.data_pool import default_pool
+from cobaTest.utils.petstore_stub import petstore_url, shared_stub, stub_enabled
+
+PETSTORE_URL = petstore_url("v2")
+
+
+def pytest_configure(config):
+    http_transport.register_pytest_plugin(config, PETSTORE_URL)
+
+
+def pytest_report_header(config):
+    lines = [f"data pool seed: {default_pool().seed} (set PYSELE_DATA_SEED to reproduce)"]
+    if stub_enabled():
+        stub = shared_stub()
+        lines.append(f"petstore: in-process stub at {stub.url('v2')} and {stub.url('v3')}")
+    return lines
+
+
+@pytest.fixture(scope="session")
+def data_pool():
+    """Seeded source of unique pets, users and appointment configs"""
+    return default_pool()
+
+
+@pytest.fixture(scope="session")
+def petstore_stub():
+    """The in-process Petstore stub, for tests that inject latency or failures"""
+    if not stub_enabled():
+        pytest.skip("set PYSELE_PETSTORE_STUB=1 to run against the in-process stub")
+    stub = shared_stub()
+    yield stub
+    stub.configure(latency_ms=0, jitter_ms=0, error_rate=0)
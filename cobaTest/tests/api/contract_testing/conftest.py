@@ -0,0 +1,49 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# The API suites are also run from their own directory, where the repository
+# root isn't on sys.path and the conftests above this one aren't loaded.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from cobaTest.utils import http_transport
+from cobaTest.utils.petstore_stub import petstore_url
+
+PETSTORE3_URL = petstore_url("v3")
+API_CONFTEST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "conftest.py")
+
+
+def pytest_configure(config):
+    # The shared API fixtures and report header live in the conftest above,
+    # which pytest doesn't load when this directory is the rootdir.
+    if not config.pluginmanager.has_plugin(API_CONFTEST):
+        spec = importlib.util.spec_from_file_location("pysele_api_conftest", API_CONFTEST)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        config.pluginmanager.register(module, API_CONFTEST)
+    http_transport.register_pytest_plugin(config, PETSTORE3_URL)
+
+
+@pytest.fixture(scope="session")
+def event_loop_thread():
+    """Background event loop that synchronous tests run coroutines on"""
+    pytest.importorskip("aiohttp")
+    from petstore3_async_client import EventLoopThread
+
+    loop_thread = EventLoopThread()
+    yield loop_thread
+    loop_thread.close()
+
+
+@pytest.fixture(scope="session")
+def async_api_client(event_loop_thread):
+    """Async API client whose connection pool is shared by the whole session"""
+    from petstore3_async_client import AsyncPetstore3APIClient
+
+    client = AsyncPetstore3APIClient()
+    yield client
+    event_loop_thread.run(client.close())
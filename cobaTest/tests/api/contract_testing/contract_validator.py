@@ -4,11 +4,14 @@ from typing import Dict, Any, List
 from jsonschema import validate, ValidationError
 import requests
 
+from cobaTest.utils.performance_contract import LatencyBudget, PerformanceContract
+
 class ContractValidator:
     """Contract testing validator for Petstore3 API"""
     
     def __init__(self):
         self.schemas = self._load_schemas()
+        self.latency_budgets = self._load_latency_budgets()
     
     def _load_schemas(self) -> Dict[str, Dict[str, Any]]:
         """Load API contract schemas"""
@@ -97,6 +100,23 @@ class ContractValidator:
             }
         }
     
+    def _load_latency_budgets(self) -> Dict[str, LatencyBudget]:
+        """Load per-endpoint latency budgets in milliseconds, sized for the public servers over the internet"""
+        return {
+            "POST /pet": LatencyBudget(percentiles={50: 2000, 90: 5000}),
+            "PUT /pet": LatencyBudget(percentiles={50: 2000, 90: 5000}),
+            "GET /pet/{petId}": LatencyBudget(percentiles={50: 1500, 90: 5000}),
+            "GET /pet/findByStatus": LatencyBudget(percentiles={50: 2000, 90: 5000}),
+            "DELETE /pet/{petId}": LatencyBudget(percentiles={50: 2000, 90: 5000}),
+            "POST /pet/{petId}/uploadImage": LatencyBudget(percentiles={50: 4000, 90: 10000}),
+        }
+    
+    def performance_contract(self, endpoint: str) -> PerformanceContract:
+        """Latency contract for an endpoint, e.g. 'GET /pet/findByStatus'"""
+        if endpoint not in self.latency_budgets:
+            raise KeyError(f"No latency budget for {endpoint}; known: {sorted(self.latency_budgets)}")
+        return PerformanceContract(endpoint, self.latency_budgets[endpoint])
+    
     def validate_pet_schema(self, pet_data: Dict[str, Any]) -> bool:
         """Validate pet data against schema"""
         try:
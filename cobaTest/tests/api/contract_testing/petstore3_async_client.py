@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+import aiohttp
+
+from cobaTest.utils.petstore_stub import petstore_url
+from petstore3_client import Pet
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncResponse:
+    """The parts of requests.Response the contract tests use, read eagerly so it outlives the connection"""
+
+    def __init__(self, status_code: int, headers, content: bytes, url: str, elapsed: float):
+        self.status_code = status_code
+        self.headers = headers  # case-insensitive, like requests
+        self.content = content
+        self.url = url
+        self.elapsed = timedelta(seconds=elapsed)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncPetstore3APIClient:
+    """asyncio counterpart of Petstore3APIClient, with every request drawn from one shared connection pool"""
+
+    def __init__(self, base_url: Optional[str] = None, limit: int = 100,
+                 timeout: float = 30.0, connector: Optional[aiohttp.BaseConnector] = None):
+        self.base_url = base_url or petstore_url("v3")
+        self.limit = limit
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.headers = {
+            'Accept': 'application/json',
+            'User-Agent': 'Petstore3-API-Test-Client/1.0'
+        }
+        # A connector passed in may be shared with other clients and is theirs to close
+        self._connector = connector
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The client session, created on first use inside the running loop"""
+        if self._session is None or self._session.closed:
+            owner = self._connector is None
+            connector = self._connector or aiohttp.TCPConnector(limit=self.limit, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector, connector_owner=owner, headers=self.headers, timeout=self.timeout
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncPetstore3APIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def request(self, method: str, path: str, **kwargs) -> AsyncResponse:
+        """Send one request and read the whole body"""
+        url = f"{self.base_url}{path}"
+        start = time.perf_counter()
+        async with self.session.request(method, url, **kwargs) as response:
+            content = await response.read()
+        logger.debug(f"{method} {url}: {response.status} in {time.perf_counter() - start:.3f}s")
+        return AsyncResponse(response.status, response.headers, content, str(response.url),
+                             time.perf_counter() - start)
+
+    async def add_pet(self, pet: Pet) -> AsyncResponse:
+        """Add a new pet to the store"""
+        return await self.request("POST", "/pet", json=pet.to_dict())
+
+    async def get_pet_by_id(self, pet_id: int) -> AsyncResponse:
+        """Find pet by ID"""
+        return await self.request("GET", f"/pet/{pet_id}")
+
+    async def update_pet(self, pet: Pet) -> AsyncResponse:
+        """Update an existing pet"""
+        return await self.request("PUT", "/pet", json=pet.to_dict())
+
+    async def delete_pet(self, pet_id: int, api_key: Optional[str] = None) -> AsyncResponse:
+        """Delete a pet"""
+        headers = {'api_key': api_key} if api_key else None
+        return await self.request("DELETE", f"/pet/{pet_id}", headers=headers)
+
+    async def find_pets_by_status(self, status: str) -> AsyncResponse:
+        """Find pets by status"""
+        return await self.request("GET", "/pet/findByStatus", params={'status': status})
+
+    async def upload_pet_image(self, pet_id: int, file_data, additional_metadata: str = None) -> AsyncResponse:
+        """Upload an image for a pet; file_data is a file object, bytes or a requests-style (name, data, type) tuple"""
+        form = aiohttp.FormData()
+        if isinstance(file_data, tuple):
+            filename, content, *content_type = file_data
+            form.add_field('file', content, filename=filename,
+                           content_type=content_type[0] if content_type else 'application/octet-stream')
+        else:
+            form.add_field('file', file_data, filename=getattr(file_data, 'name', 'file'))
+        if additional_metadata:
+            form.add_field('additionalMetadata', additional_metadata)
+        return await self.request("POST", f"/pet/{pet_id}/uploadImage", data=form)
+
+    async def map(self, method: Callable[..., Awaitable[T]], items: Iterable[Any],
+                  concurrency: Optional[int] = None) -> List[T]:
+        """Await method(item) for every item, at most concurrency at a time, returning results in order"""
+        gate = asyncio.Semaphore(concurrency or self.limit)
+
+        async def one(item):
+            async with gate:
+                return await method(item)
+
+        return await asyncio.gather(*(one(item) for item in items))
+
+
+class EventLoopThread:
+    """An event loop on a daemon thread, so synchronous code such as pytest tests can run coroutines on it
+
+    Keep one per session: the client's connection pool belongs to the loop it was first used on.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="petstore3-async", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the loop and block until it finishes"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
@@ -5,6 +5,9 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 
+from cobaTest.utils import http_transport
+from cobaTest.utils.petstore_stub import petstore_url
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,10 +46,11 @@ class Pet:
 class Petstore3APIClient:
     """Enhanced Petstore3 API Client with contract testing support"""
     
-    def __init__(self, base_url: str = "https://petstore3.swagger.io/api/v3"):
-        self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, base_url: Optional[str] = None):
+        # The public server, or the local stub when PYSELE_PETSTORE_STUB=1
+        self.base_url = base_url or petstore_url("v3")
+        # Own headers and cookies, connections shared with every other client
+        self.session = http_transport.session({
             'Content-Type': 'application/json',
             'Accept': 'application/json',
             'User-Agent': 'Petstore3-API-Test-Client/1.0'
@@ -0,0 +1,68 @@
+import random
+from collections import deque
+from typing import List
+
+from cobaTest.utils.fixture_files import image_file, mapped
+from cobaTest.utils.load_generator import Scenario
+from petstore3_async_client import AsyncPetstore3APIClient
+from petstore3_client import Pet
+
+PET_STATUSES = ["available", "pending", "sold"]
+
+# Relative weights of the default Petstore3 mix: mostly reads, some writes
+DEFAULT_WEIGHTS = {
+    "find_by_status": 30,
+    "get_pet": 30,
+    "add_pet": 15,
+    "update_pet": 10,
+    "delete_pet": 5,
+    "upload_image": 10,
+}
+
+
+def petstore3_scenarios(data_pool, weights=None) -> List[Scenario]:
+    """Weighted Petstore3 scenarios for AsyncPetstore3APIClient, each a single client call"""
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    rng = random.Random(data_pool.seed)
+    created = deque(maxlen=1000)  # pets this run added, for get/update/delete
+    image = mapped(image_file(100, 100, color='red'))
+
+    async def add_pet(client: AsyncPetstore3APIClient):
+        response = await client.add_pet(Pet(**data_pool.pet()))
+        if response.status_code == 200:
+            created.append(response.json()["id"])
+        return response
+
+    async def get_pet(client: AsyncPetstore3APIClient):
+        if not created:
+            return await find_by_status(client)
+        return await client.get_pet_by_id(rng.choice(created))
+
+    async def find_by_status(client: AsyncPetstore3APIClient):
+        return await client.find_pets_by_status(rng.choice(PET_STATUSES))
+
+    async def update_pet(client: AsyncPetstore3APIClient):
+        if not created:
+            return await add_pet(client)
+        pet = data_pool.pet(id=rng.choice(created), status=rng.choice(PET_STATUSES))
+        return await client.update_pet(Pet(**pet))
+
+    async def delete_pet(client: AsyncPetstore3APIClient):
+        if not created:
+            return await add_pet(client)
+        return await client.delete_pet(created.popleft())
+
+    async def upload_image(client: AsyncPetstore3APIClient):
+        if not created:
+            return await add_pet(client)
+        return await client.upload_pet_image(created[-1], ('load.jpg', image, 'image/jpeg'), 'Load test upload')
+
+    actions = {
+        "find_by_status": find_by_status,
+        "get_pet": get_pet,
+        "add_pet": add_pet,
+        "update_pet": update_pet,
+        "delete_pet": delete_pet,
+        "upload_image": upload_image,
+    }
+    return [Scenario(name, actions[name], weight) for name, weight in weights.items() if weight]
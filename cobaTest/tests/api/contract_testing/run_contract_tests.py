@@ -111,9 +111,17 @@ if __name__ == "__main__":
         action="store_true",
         help="List available contract tests"
     )
+    parser.add_argument(
+        "--stub",
+        action="store_true",
+        help="Run against the in-process Petstore stub instead of the public server"
+    )
     
     args = parser.parse_args()
     
+    if args.stub:
+        os.environ["PYSELE_PETSTORE_STUB"] = "1"
+    
     if args.list_tests:
         print("📋 Available Contract Test Categories:")
         print("   • add_pet_contract - Pet creation contract tests")
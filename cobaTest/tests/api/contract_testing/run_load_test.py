@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Petstore3 Load Test Runner
+Replays the weighted Petstore3 scenario mix at a target request rate (open model)
+or concurrency (closed model) and reports HDR latency percentiles as JSON and HTML
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..")))
+
+from cobaTest.utils.data_pool import default_pool
+from cobaTest.utils.load_generator import LoadGenerator
+from cobaTest.utils.petstore_stub import petstore_url
+from petstore3_async_client import AsyncPetstore3APIClient
+from petstore3_load import petstore3_scenarios
+
+
+async def run_load(base_url: str, duration: float, rps: float = None, concurrency: int = None,
+                   arrival: str = "constant", seed: int = None):
+    """Run one load test against base_url and return its LoadReport"""
+    pool = default_pool()
+    async with AsyncPetstore3APIClient(base_url=base_url) as client:
+        generator = LoadGenerator(petstore3_scenarios(pool), client=client, seed=pool.seed if seed is None else seed)
+        return await generator.run(duration, rps=rps, concurrency=concurrency, arrival=arrival)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Petstore3 load test")
+    model = parser.add_mutually_exclusive_group()
+    model.add_argument("--rps", type=float, help="Target arrival rate (open model, the default at 20 rps)")
+    model.add_argument("--concurrency", type=int, help="Number of closed-loop workers")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load for")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="constant",
+                        help="Open-model arrival process")
+    parser.add_argument("--base-url", help="API base URL (defaults to the public server)")
+    parser.add_argument("--stub", action="store_true",
+                        help="Run against the in-process Petstore stub instead of the public server")
+    parser.add_argument("--seed", type=int, help="Seed for the scenario mix (defaults to the data pool seed)")
+    parser.add_argument("--json", default="petstore3_load_report.json", help="JSON report path")
+    parser.add_argument("--html", default="petstore3_load_report.html", help="HTML report path")
+    args = parser.parse_args()
+    if args.rps is None and args.concurrency is None:
+        args.rps = 20.0
+    if args.stub:
+        os.environ["PYSELE_PETSTORE_STUB"] = "1"
+    args.base_url = args.base_url or petstore_url("v3")
+
+    print("=" * 70)
+    print("📈 PETSTORE3 API LOAD TEST")
+    print("=" * 70)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Target: {args.base_url}")
+    if args.rps is not None:
+        print(f"Model: open, {args.rps:g} rps ({args.arrival} arrivals) for {args.duration:g}s")
+    else:
+        print(f"Model: closed, {args.concurrency} workers for {args.duration:g}s")
+    print("=" * 70)
+
+    report = asyncio.run(run_load(args.base_url, args.duration, args.rps, args.concurrency, args.arrival, args.seed))
+
+    print(report.format_table())
+    print("\n📊 Reports generated:")
+    print(f"   • JSON Report: {report.write_json(args.json)}")
+    print(f"   • HTML Report: {report.write_html(args.html)}")
+    sys.exit(0 if report.overall.errors == 0 else 1)
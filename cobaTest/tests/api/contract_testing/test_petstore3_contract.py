@@ -1,10 +1,9 @@
-import pytest
-import requests
 import json
-from faker import Faker
 from typing import Dict, Any
-import time
-import random
+
+import pytest
+
+from cobaTest.utils import http_transport
 
 # Change these relative imports to absolute imports
 from petstore3_client import Petstore3APIClient, Pet
@@ -24,18 +23,14 @@ class TestPetstore3Contract:
         return ContractValidator()
     
     @pytest.fixture
-    def fake(self):
-        """Faker instance for generating test data"""
-        return Faker()
-    
-    @pytest.fixture
-    def sample_pet(self, fake) -> Pet:
-        """Generate a sample pet for testing"""
+    def sample_pet(self, data_pool) -> Pet:
+        """Take a unique sample pet from the seeded data pool"""
+        pet = data_pool.pet()
         return Pet(
-            id=random.randint(1000, 9999),
-            name=fake.first_name(),
+            id=pet["id"],
+            name=pet["name"],
             category={"id": 1, "name": "Dogs"},
-            photoUrls=[fake.image_url(), fake.image_url()],
+            photoUrls=pet["photoUrls"],
             tags=[
                 {"id": 1, "name": "friendly"},
                 {"id": 2, "name": "trained"}
@@ -169,7 +164,7 @@ class TestPetstore3Contract:
         assert response.status_code in [400, 404], f"Expected error status, got {response.status_code}"
     
     # Contract Tests for Update Pet
-    def test_update_pet_contract_success(self, api_client, contract_validator, created_pet_id, fake):
+    def test_update_pet_contract_success(self, api_client, contract_validator, created_pet_id, data_pool):
         """Test update pet contract - success scenario"""
         # First get the existing pet
         get_response = api_client.get_pet_by_id(created_pet_id)
@@ -178,7 +173,7 @@ class TestPetstore3Contract:
         # Update the pet
         updated_pet = Pet(
             id=created_pet_id,
-            name=fake.first_name() + " Updated",
+            name=data_pool.pet()["name"] + " Updated",
             category=existing_pet_data.get("category"),
             photoUrls=existing_pet_data.get("photoUrls"),
             tags=existing_pet_data.get("tags"),
@@ -199,12 +194,13 @@ class TestPetstore3Contract:
         assert pet_data["name"] == updated_pet.name
         assert pet_data["status"] == "sold"
     
-    def test_update_pet_contract_not_found(self, api_client, contract_validator, fake):
+    def test_update_pet_contract_not_found(self, api_client, contract_validator, data_pool):
         """Test update pet contract - pet not found scenario"""
+        pet = data_pool.pet()
         non_existent_pet = Pet(
             id=999999999,
-            name=fake.first_name(),
-            photoUrls=[fake.image_url()],
+            name=pet["name"],
+            photoUrls=pet["photoUrls"],
             status="available"
         )
         
@@ -290,17 +286,29 @@ class TestPetstore3Contract:
         # Should return 400 for invalid status
         assert response.status_code in [400, 200], f"Expected 400 or 200, got {response.status_code}"
     
+    # Concurrency Contract Tests
+    def test_concurrent_find_pets_contract(self, async_api_client, event_loop_thread, contract_validator):
+        """Test find pets by status contract under many concurrent requests"""
+        statuses = ["available", "pending", "sold"] * 20
+        responses = event_loop_thread.run(
+            async_api_client.map(async_api_client.find_pets_by_status, statuses, concurrency=30)
+        )
+        
+        for status, response in zip(statuses, responses):
+            assert response.status_code == 200, f"Expected 200 for status {status}, got {response.status_code}"
+            for pet in response.json()[:5]:
+                assert contract_validator.validate_pet_schema(pet), f"Pet schema validation failed for pet: {pet}"
+                assert pet.get("status") == status, f"Pet status should be {status}"
+    
     # Performance Contract Tests
     def test_api_response_time_contract(self, api_client, contract_validator):
-        """Test API response time contract"""
-        start_time = time.time()
-        response = api_client.find_pets_by_status("available")
-        end_time = time.time()
+        """Test find pets by status latency percentiles against its budget"""
+        contract = contract_validator.performance_contract("GET /pet/findByStatus")
         
-        response_time = end_time - start_time
+        result = contract.measure(lambda: api_client.find_pets_by_status("available"), target=api_client.base_url)
         
-        assert response.status_code == 200, "API should be accessible"
-        assert response_time < 5.0, f"API response time should be under 5 seconds, got {response_time:.2f}s"
+        print(result.format())
+        contract.assert_met(result)
     
     # Data Integrity Contract Tests
     def test_data_persistence_contract(self, api_client, contract_validator, sample_pet):
@@ -334,7 +342,7 @@ class TestPetstore3Contract:
         headers = {'Content-Type': 'application/json'}
         malformed_data = '{"name": "test", "invalid_json":}'
         
-        response = requests.post(url, data=malformed_data, headers=headers)
+        response = http_transport.post(url, data=malformed_data, headers=headers)
         
         # Should return 400 for malformed JSON
         assert response.status_code in [400, 422], f"Expected 400/422 for malformed JSON, got {response.status_code}"
@@ -345,7 +353,7 @@ class TestPetstore3Contract:
         
         # Send with wrong content type
         headers = {'Content-Type': 'text/plain'}
-        response = requests.post(url, data=str(sample_pet.to_dict()), headers=headers)
+        response = http_transport.post(url, data=str(sample_pet.to_dict()), headers=headers)
         
         # Should return 415 for unsupported media type
         assert response.status_code in [400, 415], f"Expected 400/415 for wrong content type, got {response.status_code}"
\ No newline at end of file
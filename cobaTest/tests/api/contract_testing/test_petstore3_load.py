@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from cobaTest.utils.load_generator import LoadGenerator
+from petstore3_load import petstore3_scenarios
+
+LOAD_DURATION = float(os.environ.get("PYSELE_LOAD_DURATION") or 0)
+LOAD_RPS = float(os.environ.get("PYSELE_LOAD_RPS") or 20)
+MAX_ERROR_RATE = float(os.environ.get("PYSELE_LOAD_MAX_ERROR_RATE") or 0.01)
+
+
+@pytest.mark.skipif(not LOAD_DURATION, reason="set PYSELE_LOAD_DURATION (seconds) to run the load test")
+def test_petstore3_load(request, event_loop_thread, async_api_client, data_pool):
+    """Test the weighted Petstore3 mix at PYSELE_LOAD_RPS for PYSELE_LOAD_DURATION seconds"""
+    generator = LoadGenerator(petstore3_scenarios(data_pool), client=async_api_client, seed=data_pool.seed)
+    report = event_loop_thread.run(generator.run(LOAD_DURATION, rps=LOAD_RPS))
+
+    print(f"\n{report.format_table()}")
+    report.write_json("petstore3_load_report.json")
+    if request.config.pluginmanager.hasplugin("html"):
+        from pytest_html import extras
+        request.getfixturevalue("extras").append(extras.html(report.to_html()))
+
+    summary = report.to_dict(histograms=False)["overall"]
+    assert report.dropped == 0, f"{report.dropped} arrivals dropped: the client could not keep up"
+    assert summary["error_rate"] <= MAX_ERROR_RATE, f"Error rate {summary['error_rate']:.2%}: {summary['top_errors']}"
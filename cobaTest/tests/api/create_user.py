@@ -1,7 +1,13 @@
-import requests
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from cobaTest.utils import http_transport
+from cobaTest.utils.petstore_stub import petstore_url
 
 def test_create_user():
-    url = "https://petstore.swagger.io/v2/user"
+    url = f"{petstore_url('v2')}/user"
     payload = {
         "id": 12345,
         "username": "apitestuser",
@@ -16,7 +22,7 @@ def test_create_user():
         "Content-Type": "application/json"
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = http_transport.post(url, json=payload, headers=headers)
     print(f"Status code: {response.status_code}")
     print(f"Response: {response.json()}")
 
@@ -2,13 +2,17 @@ import requests
 import json
 from typing import Optional, Dict, Any
 
+from cobaTest.utils import http_transport
+from cobaTest.utils.petstore_stub import petstore_url
+
 class PetstoreAPIClient:
     """Client for interacting with Swagger Petstore API"""
     
-    def __init__(self, base_url: str = "https://petstore.swagger.io/v2"): # type: ignore
-        self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, base_url: Optional[str] = None):
+        # The public server, or the local stub when PYSELE_PETSTORE_STUB=1
+        self.base_url = base_url or petstore_url("v2")
+        # Own headers and cookies, connections shared with every other client
+        self.session = http_transport.session({
             'User-Agent': 'Petstore-API-Test-Client/1.0'
         })
     
@@ -59,5 +63,5 @@ class PetstoreAPIClient:
         }
     
     def close(self):
-        """Close the session"""
+        """Close the session (the shared connection pool stays open)"""
         self.session.close()
\ No newline at end of file
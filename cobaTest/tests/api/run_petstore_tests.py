@@ -146,9 +146,17 @@ if __name__ == "__main__":
         "--specific", 
         help="Run a specific test by name"
     )
+    parser.add_argument(
+        "--stub",
+        action="store_true",
+        help="Run against the in-process Petstore stub instead of the public server"
+    )
     
     args = parser.parse_args()
     
+    if args.stub:
+        os.environ["PYSELE_PETSTORE_STUB"] = "1"
+    
     if args.specific:
         exit_code = run_specific_test(args.specific)
     elif args.test_type == "upload":
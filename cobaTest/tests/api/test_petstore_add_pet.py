@@ -1,8 +1,10 @@
-import requests
-import pytest
 import json
-from datetime import datetime
-import random
+
+import pytest
+
+from cobaTest.utils import http_transport
+from cobaTest.utils.petstore_stub import petstore_url
+from contract_testing.contract_validator import ContractValidator
 
 class TestPetstoreAddPet:
     """
@@ -10,19 +12,20 @@ class TestPetstoreAddPet:
     Endpoint: POST /pet
     """
     
-    BASE_URL = "https://petstore.swagger.io/v2"
+    BASE_URL = petstore_url("v2")
     ADD_PET_ENDPOINT = "/pet"
     
     @pytest.fixture
-    def valid_pet_data(self):
-        """Generate valid pet data for testing"""
+    def valid_pet_data(self, data_pool):
+        """Take unique, valid pet data from the seeded data pool"""
+        pet = data_pool.pet()
         return {
-            "id": random.randint(1000, 9999),
+            "id": pet["id"],
             "category": {
                 "id": 1,
                 "name": "Dogs"
             },
-            "name": f"Test Pet {datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "name": pet["name"],
             "photoUrls": [
                 "https://example.com/photo1.jpg",
                 "https://example.com/photo2.jpg"
@@ -41,10 +44,10 @@ class TestPetstoreAddPet:
         }
     
     @pytest.fixture
-    def minimal_pet_data(self):
-        """Generate minimal required pet data"""
+    def minimal_pet_data(self, data_pool):
+        """Take minimal required pet data from the seeded data pool"""
         return {
-            "name": f"Minimal Pet {datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "name": data_pool.pet()["name"],
             "photoUrls": ["https://example.com/photo.jpg"]
         }
     
@@ -52,7 +55,7 @@ class TestPetstoreAddPet:
         """Test pet creation with valid complete data"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         
-        response = requests.post(
+        response = http_transport.post(
             url,
             json=valid_pet_data,
             headers={"Content-Type": "application/json"}
@@ -69,7 +72,7 @@ class TestPetstoreAddPet:
         """Test pet creation with minimal required fields"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         
-        response = requests.post(
+        response = http_transport.post(
             url,
             json=minimal_pet_data,
             headers={"Content-Type": "application/json"}
@@ -81,18 +84,18 @@ class TestPetstoreAddPet:
         assert response_data["name"] == minimal_pet_data["name"]
         assert "photoUrls" in response_data
     
-    def test_add_pet_different_statuses(self, valid_pet_data):
+    def test_add_pet_different_statuses(self, valid_pet_data, data_pool):
         """Test pet creation with different status values"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         statuses = ["available", "pending", "sold"]
         
         for status in statuses:
             pet_data = valid_pet_data.copy()
-            pet_data["id"] = random.randint(10000, 99999)  # Unique ID for each
+            pet_data["id"] = data_pool.pet()["id"]  # Unique ID for each
             pet_data["status"] = status
             pet_data["name"] = f"Pet with {status} status"
             
-            response = requests.post(
+            response = http_transport.post(
                 url,
                 json=pet_data,
                 headers={"Content-Type": "application/json"}
@@ -111,7 +114,7 @@ class TestPetstoreAddPet:
             "photoUrls": ["https://example.com/photo.jpg"]
         }
         
-        response = requests.post(
+        response = http_transport.post(
             url,
             json=invalid_data,
             headers={"Content-Type": "application/json"}
@@ -129,7 +132,7 @@ class TestPetstoreAddPet:
             "photoUrls": "not_an_array"
         }
         
-        response = requests.post(
+        response = http_transport.post(
             url,
             json=invalid_data,
             headers={"Content-Type": "application/json"}
@@ -141,7 +144,7 @@ class TestPetstoreAddPet:
         """Test pet creation with empty request body"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         
-        response = requests.post(
+        response = http_transport.post(
             url,
             json={},
             headers={"Content-Type": "application/json"}
@@ -154,7 +157,7 @@ class TestPetstoreAddPet:
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         
         # Create first pet
-        response1 = requests.post(
+        response1 = http_transport.post(
             url,
             json=valid_pet_data,
             headers={"Content-Type": "application/json"}
@@ -166,7 +169,7 @@ class TestPetstoreAddPet:
         duplicate_data = valid_pet_data.copy()
         duplicate_data["name"] = "Duplicate ID Pet"
         
-        response2 = requests.post(
+        response2 = http_transport.post(
             url,
             json=duplicate_data,
             headers={"Content-Type": "application/json"}
@@ -175,12 +178,12 @@ class TestPetstoreAddPet:
         # Should either succeed (update) or handle gracefully
         assert response2.status_code in [200, 400]
     
-    def test_add_pet_large_data(self):
+    def test_add_pet_large_data(self, data_pool):
         """Test pet creation with large data sets"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         
         large_data = {
-            "id": random.randint(100000, 999999),
+            "id": data_pool.pet()["id"],
             "name": "A" * 100,  # Long name
             "photoUrls": [f"https://example.com/photo{i}.jpg" for i in range(10)],
             "tags": [
@@ -189,7 +192,7 @@ class TestPetstoreAddPet:
             "status": "available"
         }
         
-        response = requests.post(
+        response = http_transport.post(
             url,
             json=large_data,
             headers={"Content-Type": "application/json"}
@@ -197,18 +200,18 @@ class TestPetstoreAddPet:
         
         assert response.status_code == 200
     
-    def test_add_pet_special_characters(self):
+    def test_add_pet_special_characters(self, data_pool):
         """Test pet creation with special characters in name"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         
         special_data = {
-            "id": random.randint(1000, 9999),
+            "id": data_pool.pet()["id"],
             "name": "Pet with 特殊字符 & émojis 🐕",
             "photoUrls": ["https://example.com/photo.jpg"],
             "status": "available"
         }
         
-        response = requests.post(
+        response = http_transport.post(
             url,
             json=special_data,
             headers={"Content-Type": "application/json"}
@@ -222,7 +225,7 @@ class TestPetstoreAddPet:
         """Test that response has correct structure and data types"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         
-        response = requests.post(
+        response = http_transport.post(
             url,
             json=valid_pet_data,
             headers={"Content-Type": "application/json"}
@@ -245,32 +248,24 @@ class TestPetstoreAddPet:
         assert isinstance(response_data["photoUrls"], list)
     
     def test_add_pet_performance(self, valid_pet_data):
-        """Test API response time performance"""
-        import time
-        
+        """Test add pet latency percentiles against the POST /pet budget"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
+        contract = ContractValidator().performance_contract("POST /pet")
         
-        start_time = time.time()
-        response = requests.post(
-            url,
-            json=valid_pet_data,
-            headers={"Content-Type": "application/json"}
+        result = contract.measure(
+            lambda: http_transport.post(url, json=valid_pet_data, headers={"Content-Type": "application/json"}),
+            target=self.BASE_URL
         )
-        end_time = time.time()
-        
-        response_time = end_time - start_time
-        
-        assert response.status_code == 200
-        assert response_time < 5.0  # Should complete within 5 seconds
         
-        print(f"Add pet completed in {response_time:.2f} seconds")
+        print(result.format())
+        contract.assert_met(result)
     
     def test_add_pet_content_type_variations(self, valid_pet_data):
         """Test different content-type headers"""
         url = f"{self.BASE_URL}{self.ADD_PET_ENDPOINT}"
         
         # Test with application/json
-        response = requests.post(
+        response = http_transport.post(
             url,
             json=valid_pet_data,
             headers={"Content-Type": "application/json"}
@@ -289,7 +284,7 @@ class TestPetstoreAddPet:
         </Pet>
         """
         
-        response_xml = requests.post(
+        response_xml = http_transport.post(
             url,
             data=xml_data,
             headers={"Content-Type": "application/xml"}
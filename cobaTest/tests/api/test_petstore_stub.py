@@ -0,0 +1,85 @@
+import pytest
+
+from cobaTest.utils import http_transport
+from cobaTest.utils.petstore_stub import PetstoreStub
+
+
+@pytest.fixture(scope="module")
+def stub():
+    """A stub of this module's own, without injected latency or failures"""
+    with PetstoreStub(latency_ms=0, jitter_ms=0, error_rate=0) as stub:
+        yield stub
+
+
+class TestPetstoreStub:
+    """
+    Status-code contract of the in-process Petstore stub
+    Runs against its own PetstoreStub(), whatever PYSELE_PETSTORE_STUB says
+    """
+
+    INVALID_PET = {"name": "", "photoUrls": ["https://example.com/photo.jpg"]}
+
+    @pytest.fixture
+    def valid_pet_data(self, data_pool):
+        pet = data_pool.pet()
+        return {"name": pet["name"], "photoUrls": ["https://example.com/photo.jpg"]}
+
+    def test_listens_on_an_ephemeral_port(self, stub):
+        """Test the stub reports the port it was given"""
+        assert stub.port
+        assert stub.url("v2") == f"http://127.0.0.1:{stub.port}/v2"
+        assert stub.url("v3") == f"http://127.0.0.1:{stub.port}/api/v3"
+
+    @pytest.mark.parametrize("version,status", [("v2", 405), ("v3", 422)])
+    def test_invalid_pet_status(self, stub, version, status):
+        """Test schema failures answer 405 on v2 and 422 on v3, like the public servers"""
+        response = http_transport.post(f"{stub.url(version)}/pet", json=self.INVALID_PET)
+
+        assert response.status_code == status
+
+    @pytest.mark.parametrize("version,status", [("v2", 404), ("v3", 200)])
+    def test_delete_unknown_pet_status(self, stub, version, status):
+        """Test deleting an unknown pet answers 404 on v2 and 200 on v3"""
+        response = http_transport.delete(f"{stub.url(version)}/pet/987654321")
+
+        assert response.status_code == status
+
+    @pytest.mark.parametrize("version", ["v2", "v3"])
+    def test_add_get_delete_pet(self, stub, version, valid_pet_data):
+        """Test a created pet can be fetched, then deleted, then is gone"""
+        created = http_transport.post(f"{stub.url(version)}/pet", json=valid_pet_data)
+        assert created.status_code == 200
+        pet_url = f"{stub.url(version)}/pet/{created.json()['id']}"
+
+        assert http_transport.get(pet_url).json()["name"] == valid_pet_data["name"]
+        assert http_transport.delete(pet_url).status_code == 200
+        assert http_transport.get(pet_url).status_code == 404
+
+    @pytest.mark.parametrize("version", ["v2", "v3"])
+    def test_malformed_json_and_media_type(self, stub, version):
+        """Test malformed JSON answers 400 and non-JSON bodies 415"""
+        url = f"{stub.url(version)}/pet"
+
+        assert http_transport.post(url, data="{", headers={"Content-Type": "application/json"}).status_code == 400
+        assert http_transport.post(url, data="name=x", headers={"Content-Type": "text/plain"}).status_code == 415
+
+    @pytest.mark.parametrize("version,status", [("v2", 200), ("v3", 400)])
+    def test_invalid_find_by_status(self, stub, version, status):
+        """Test an unknown findByStatus value answers 400 on v3 and an empty list on v2"""
+        response = http_transport.get(f"{stub.url(version)}/pet/findByStatus", params={"status": "lost"})
+
+        assert response.status_code == status
+        if status == 200:
+            assert response.json() == []
+
+    def test_non_numeric_pet_id(self, stub):
+        """Test a non-numeric pet id answers 400"""
+        assert http_transport.get(f"{stub.url('v3')}/pet/abc").status_code == 400
+
+    def test_injected_failures(self, stub):
+        """Test configure() injects failures with the configured status"""
+        stub.configure(error_rate=1, error_status=503)
+        try:
+            assert http_transport.get(f"{stub.url('v2')}/pet/1").status_code == 503
+        finally:
+            stub.configure(error_rate=0)
@@ -1,10 +1,12 @@
-import requests
 import pytest
 import os
 import json
 from io import BytesIO
-from PIL import Image
-import tempfile
+
+from cobaTest.utils import http_transport
+from cobaTest.utils.fixture_files import MultipartFile, image_file, large_jpeg, mapped
+from cobaTest.utils.petstore_stub import petstore_url
+from contract_testing.contract_validator import ContractValidator
 
 class TestPetstoreFileUpload:
     """
@@ -12,18 +14,13 @@ class TestPetstoreFileUpload:
     Endpoint: POST /pet/{petId}/uploadImage
     """
     
-    BASE_URL = "https://petstore.swagger.io/v2"
+    BASE_URL = petstore_url("v2")
     UPLOAD_ENDPOINT = "/pet/{pet_id}/uploadImage"
     
     @pytest.fixture
     def sample_image_file(self):
-        """Create a sample image file for testing"""
-        # Create a simple test image
-        img = Image.new('RGB', (100, 100), color='red')
-        img_bytes = BytesIO()
-        img.save(img_bytes, format='JPEG')
-        img_bytes.seek(0)
-        return img_bytes
+        """Cached 100x100 JPEG, served straight from its mmap"""
+        return mapped(image_file(100, 100, color='red'))
     
     @pytest.fixture
     def sample_text_file(self):
@@ -43,7 +40,7 @@ class TestPetstoreFileUpload:
         
         # Create pet first
         create_url = f"{self.BASE_URL}/pet"
-        response = requests.post(create_url, json=pet_data)
+        response = http_transport.post(create_url, json=pet_data)
         
         if response.status_code == 200:
             return pet_data["id"]
@@ -59,7 +56,7 @@ class TestPetstoreFileUpload:
         files = {'file': ('test_image.jpg', sample_image_file, 'image/jpeg')}
         data = {'additionalMetadata': 'Test image upload'}
         
-        response = requests.post(url, files=files, data=data)
+        response = http_transport.post(url, files=files, data=data)
         
         assert response.status_code == 200
         
@@ -77,7 +74,7 @@ class TestPetstoreFileUpload:
         files = {'file': ('profile.jpg', sample_image_file, 'image/jpeg')}
         data = {'additionalMetadata': metadata}
         
-        response = requests.post(url, files=files, data=data)
+        response = http_transport.post(url, files=files, data=data)
         
         assert response.status_code == 200
         response_data = response.json()
@@ -90,7 +87,7 @@ class TestPetstoreFileUpload:
         
         data = {'additionalMetadata': 'No file upload test'}
         
-        response = requests.post(url, data=data)
+        response = http_transport.post(url, data=data)
         
         # Should handle missing file gracefully
         assert response.status_code in [200, 400]
@@ -102,7 +99,7 @@ class TestPetstoreFileUpload:
         
         files = {'file': ('test.jpg', sample_image_file, 'image/jpeg')}
         
-        response = requests.post(url, files=files)
+        response = http_transport.post(url, files=files)
         
         # Should return error for invalid pet ID
         assert response.status_code in [404, 400]
@@ -112,16 +109,28 @@ class TestPetstoreFileUpload:
         pet_id = create_test_pet
         url = f"{self.BASE_URL}{self.UPLOAD_ENDPOINT.format(pet_id=pet_id)}"
         
-        # Create a larger test image
-        img = Image.new('RGB', (1000, 1000), color='blue')
-        img_bytes = BytesIO()
-        img.save(img_bytes, format='JPEG')
-        img_bytes.seek(0)
+        # Encoded once per machine, then mapped from the fixture cache
+        img_bytes = mapped(image_file(1000, 1000, color='blue'))
         
         files = {'file': ('large_image.jpg', img_bytes, 'image/jpeg')}
         data = {'additionalMetadata': 'Large file upload test'}
         
-        response = requests.post(url, files=files, data=data)
+        response = http_transport.post(url, files=files, data=data)
+        
+        assert response.status_code == 200
+    
+    @pytest.mark.skipif(not os.environ.get("PYSELE_LARGE_UPLOAD_MB"),
+                        reason="set PYSELE_LARGE_UPLOAD_MB to upload a multi-hundred-MB file")
+    def test_upload_very_large_file(self, create_test_pet):
+        """Test streaming upload of a sparse JPEG of PYSELE_LARGE_UPLOAD_MB megabytes"""
+        pet_id = create_test_pet
+        url = f"{self.BASE_URL}{self.UPLOAD_ENDPOINT.format(pet_id=pet_id)}"
+        
+        size = int(os.environ["PYSELE_LARGE_UPLOAD_MB"]) * 1024 * 1024
+        body = MultipartFile(large_jpeg(size), filename='very_large_image.jpg', content_type='image/jpeg',
+                             fields={'additionalMetadata': 'Very large file upload test'})
+        
+        response = http_transport.post(url, data=body, headers={'Content-Type': body.content_type}, timeout=600)
         
         assert response.status_code == 200
     
@@ -134,7 +143,7 @@ class TestPetstoreFileUpload:
         files = {'file': ('test.txt', sample_text_file, 'text/plain')}
         data = {'additionalMetadata': 'Text file upload test'}
         
-        response = requests.post(url, files=files, data=data)
+        response = http_transport.post(url, files=files, data=data)
         
         # Should accept different file types
         assert response.status_code == 200
@@ -146,7 +155,7 @@ class TestPetstoreFileUpload:
         
         files = {'file': ('structure_test.jpg', sample_image_file, 'image/jpeg')}
         
-        response = requests.post(url, files=files)
+        response = http_transport.post(url, files=files)
         
         assert response.status_code == 200
         assert response.headers.get('content-type') == 'application/json'
@@ -165,24 +174,17 @@ class TestPetstoreFileUpload:
         assert isinstance(response_data['message'], str)
     
     def test_upload_performance(self, sample_image_file, create_test_pet):
-        """Test upload performance and response time"""
-        import time
-        
+        """Test upload latency percentiles against the uploadImage budget"""
         pet_id = create_test_pet
         url = f"{self.BASE_URL}{self.UPLOAD_ENDPOINT.format(pet_id=pet_id)}"
+        contract = ContractValidator().performance_contract("POST /pet/{petId}/uploadImage")
         
         files = {'file': ('performance_test.jpg', sample_image_file, 'image/jpeg')}
         
-        start_time = time.time()
-        response = requests.post(url, files=files)
-        end_time = time.time()
-        
-        response_time = end_time - start_time
-        
-        assert response.status_code == 200
-        assert response_time < 10.0  # Should complete within 10 seconds
+        result = contract.measure(lambda: http_transport.post(url, files=files), target=self.BASE_URL)
         
-        print(f"Upload completed in {response_time:.2f} seconds")
+        print(result.format())
+        contract.assert_met(result)
 
 if __name__ == "__main__":
     # Run tests directly
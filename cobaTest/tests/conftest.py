@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from cobaTest.utils.command_trace import flush_test_trace, format_slowest_commands, slowest_commands
+from cobaTest.utils.driver_factory import leased_driver
+from cobaTest.utils.session_cache import logged_in_session
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--resume",
+        action="store_true",
+        help="Resume data-driven CSV runs from their checkpoints",
+    )
+    parser.addoption(
+        "--trace-commands",
+        action="store_true",
+        help="Trace WebDriver command latency per page-object caller",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("--resume"):
+        os.environ["PYSELE_RESUME"] = "1"
+    if config.getoption("--trace-commands"):
+        os.environ["PYSELE_TRACE"] = "1"
+
+
+@pytest.fixture
+def pooled_driver():
+    """Warm Chrome session leased from the shared pool and reset afterwards."""
+    with leased_driver() as driver:
+        yield driver
+
+
+@pytest.fixture
+def logged_in_driver():
+    """Pooled driver already on the appointment form as John Doe, from a cached session when possible."""
+    with logged_in_session("John Doe", "ThisIsNotAPassword") as driver:
+        yield driver
+
+
+@pytest.fixture(autouse=True)
+def command_trace(request):
+    """Write each test's WebDriver command trace when PYSELE_TRACE_DIR is set."""
+    yield
+    flush_test_trace(request.node.nodeid)
+
+
+def pytest_terminal_summary(terminalreporter):
+    rows = slowest_commands()
+    if rows:
+        terminalreporter.write_sep("=", "slowest WebDriver commands")
+        terminalreporter.write_line(format_slowest_commands(rows))
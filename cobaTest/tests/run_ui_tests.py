@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Parallel UI Test Runner
+Shards the Selenium page-object suites across headless Chrome worker processes
+and merges the per-worker results into one JUnit XML and one HTML report
+"""
+
+import html
+import json
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from cobaTest.utils.command_trace import (
+    format_slowest_commands,
+    merge_command_totals,
+    slowest_commands,
+    totals_files,
+)
+from cobaTest.utils.startup_timing import merge_startup_reports
+
+TESTS_DIR = os.path.join("cobaTest", "tests")
+
+UI_TEST_FILES = [
+    os.path.join(TESTS_DIR, "test_make_appointment.py"),
+    os.path.join(TESTS_DIR, "sample_csv.py"),
+    os.path.join(TESTS_DIR, "security", "test_authentication_security.py"),
+    os.path.join(TESTS_DIR, "security", "test_csrf_vulnerability.py"),
+    os.path.join(TESTS_DIR, "security", "test_sql_injection.py"),
+    os.path.join(TESTS_DIR, "security", "test_xss_vulnerability.py"),
+]
+
+# Rough resident size of one headless Chrome + chromedriver + pytest worker.
+DEFAULT_MB_PER_WORKER = 600
+DEFAULT_TEST_SECONDS = 30.0
+
+
+def available_memory_mb():
+    """Available RAM in MB (MemAvailable on Linux, total pages elsewhere)"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_worker_count(test_count, mb_per_worker=DEFAULT_MB_PER_WORKER):
+    """Scale workers with cores and RAM, never above the number of tests"""
+    workers = os.cpu_count() or 1
+    memory_mb = available_memory_mb()
+    if memory_mb:
+        workers = min(workers, memory_mb // mb_per_worker)
+    return max(1, min(workers, test_count))
+
+
+def collect_test_ids(test_files):
+    """Ask pytest for the node ids of every test in the given files"""
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider",
+         f"--rootdir={REPO_ROOT}", *test_files],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    test_ids = [line.strip() for line in result.stdout.splitlines() if "::" in line]
+    if not test_ids:
+        print(result.stdout)
+        print(result.stderr)
+    return test_ids
+
+
+def load_durations(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def shard_tests(test_ids, workers, durations):
+    """Longest-processing-time-first split using durations from the last run"""
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    ordered = sorted(test_ids, key=lambda t: durations.get(t, DEFAULT_TEST_SECONDS), reverse=True)
+    for test_id in ordered:
+        idx = loads.index(min(loads))
+        shards[idx].append(test_id)
+        loads[idx] += durations.get(test_id, DEFAULT_TEST_SECONDS)
+    return [shard for shard in shards if shard]
+
+
+def start_worker(worker_id, test_ids, output_dir, trace=False):
+    """Launch one pytest process with its own working dir, logs and driver"""
+    worker_dir = os.path.join(output_dir, f"worker-{worker_id}")
+    os.makedirs(worker_dir, exist_ok=True)
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    env["PYSELE_HEADLESS"] = "1"
+    env["PYSELE_WORKER_ID"] = str(worker_id)
+    env["PYSELE_STARTUP_REPORT"] = os.path.join(worker_dir, "startup_timing.json")
+    if trace:
+        env["PYSELE_TRACE_DIR"] = os.path.join(output_dir, "traces")
+
+    node_ids = [os.path.join(REPO_ROOT, test_id) for test_id in test_ids]
+    log_file = open(os.path.join(worker_dir, "pytest.log"), "w")
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "pytest", *node_ids,
+            "-v",
+            "-p", "no:cacheprovider",
+            f"--rootdir={REPO_ROOT}",
+            f"--junitxml={os.path.join(worker_dir, 'results.xml')}",
+        ],
+        cwd=worker_dir,  # relative log/screenshot paths land in the worker dir
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+    return process, log_file, worker_dir
+
+
+def merge_junit(worker_dirs, merged_path):
+    """Combine every worker's results.xml under a single <testsuites> root"""
+    merged = ET.Element("testsuites", name="ui-tests")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    total_time = 0.0
+
+    for worker_dir in worker_dirs:
+        path = os.path.join(worker_dir, "results.xml")
+        if not os.path.exists(path):
+            continue
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            suite.set("name", os.path.basename(worker_dir))
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            total_time += float(suite.get("time", 0))
+            merged.append(suite)
+
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    merged.set("time", f"{total_time:.3f}")
+    ET.ElementTree(merged).write(merged_path, encoding="utf-8", xml_declaration=True)
+    return merged
+
+
+def case_outcome(case):
+    for tag, outcome in (("failure", "failed"), ("error", "error"), ("skipped", "skipped")):
+        node = case.find(tag)
+        if node is not None:
+            return outcome, node.get("message", "")
+    return "passed", ""
+
+
+def write_html_report(merged, html_path, wall_time):
+    rows = []
+    for suite in merged.findall("testsuite"):
+        for case in suite.findall("testcase"):
+            outcome, message = case_outcome(case)
+            rows.append(
+                f"<tr class='{outcome}'><td>{html.escape(suite.get('name', ''))}</td>"
+                f"<td>{html.escape(case.get('classname', ''))}::{html.escape(case.get('name', ''))}</td>"
+                f"<td>{outcome}</td><td>{float(case.get('time', 0)):.2f}s</td>"
+                f"<td>{html.escape(message)}</td></tr>"
+            )
+
+    summary = ", ".join(f"{merged.get(key)} {key}" for key in ("tests", "failures", "errors", "skipped"))
+    document = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>UI Test Report</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+tr.passed td {{ background: #e6ffed; }}
+tr.failed td, tr.error td {{ background: #ffeef0; }}
+tr.skipped td {{ background: #fffbdd; }}
+</style>
+</head>
+<body>
+<h1>UI Test Report</h1>
+<p>Generated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} &mdash; {summary};
+wall time {wall_time:.1f}s, summed test time {float(merged.get('time', 0)):.1f}s</p>
+<table>
+<tr><th>Worker</th><th>Test</th><th>Outcome</th><th>Duration</th><th>Message</th></tr>
+{''.join(rows)}
+</table>
+</body>
+</html>
+"""
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(document)
+
+
+def save_durations(merged, path):
+    durations = {}
+    for case in merged.iter("testcase"):
+        module = case.get("classname", "").replace(".", "/")
+        test_id = f"{module}.py::{case.get('name')}"
+        durations[test_id] = float(case.get("time", 0))
+    with open(path, "w") as f:
+        json.dump(durations, f, indent=2)
+
+
+def run_ui_tests_parallel(workers=None, output_dir="ui_test_artifacts", test_files=None, trace=False):
+    """Run the UI suites sharded across worker processes"""
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    durations_path = os.path.join(output_dir, "durations.json")
+
+    print("=" * 60)
+    print("PARALLEL SELENIUM UI TESTS")
+    print("=" * 60)
+    print(f"Test execution started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    test_ids = collect_test_ids(test_files or UI_TEST_FILES)
+    if not test_ids:
+        print("❌ No tests collected")
+        return 1
+
+    workers = workers or default_worker_count(len(test_ids))
+    shards = shard_tests(test_ids, workers, load_durations(durations_path))
+    print(f"✓ {len(test_ids)} tests across {len(shards)} workers "
+          f"({os.cpu_count()} cores, {available_memory_mb()} MB available)")
+
+    for stale in totals_files(os.path.join(output_dir, "traces")):
+        os.remove(stale)  # command totals are per run; traces per test are overwritten
+
+    start_time = time.time()
+    running = [start_worker(i, shard, output_dir, trace) for i, shard in enumerate(shards)]
+    exit_code = 0
+    for process, log_file, worker_dir in running:
+        code = process.wait()
+        log_file.close()
+        print(f"   • {os.path.basename(worker_dir)} finished with exit code {code}")
+        exit_code = exit_code or code
+    wall_time = time.time() - start_time
+
+    merged_xml = os.path.join(output_dir, "ui_test_results.xml")
+    merged_html = os.path.join(output_dir, "ui_test_report.html")
+    merged = merge_junit([worker_dir for _, _, worker_dir in running], merged_xml)
+    write_html_report(merged, merged_html, wall_time)
+    save_durations(merged, durations_path)
+    startup_json = os.path.join(output_dir, "startup_timing.json")
+    merge_startup_reports(
+        [os.path.join(worker_dir, "startup_timing.json") for _, _, worker_dir in running], startup_json
+    )
+
+    command_rows = slowest_commands(merge_command_totals(totals_files(os.path.join(output_dir, "traces"))))
+
+    print("\n" + "=" * 60)
+    print("TEST EXECUTION SUMMARY")
+    print("=" * 60)
+    print(f"Wall time: {wall_time:.1f}s (summed test time {float(merged.get('time')):.1f}s)")
+    print("✅ ALL TESTS PASSED!" if exit_code == 0 else f"❌ SOME TESTS FAILED! Exit code: {exit_code}")
+    print("\n📊 Reports generated:")
+    print(f"   • HTML Report: {merged_html}")
+    print(f"   • JUnit XML: {merged_xml}")
+    print(f"   • Driver startup timings: {startup_json}")
+    if trace:
+        print(f"   • Command traces: {os.path.join(output_dir, 'traces')}/")
+    print(f"   • Per-worker logs: {output_dir}/worker-*/")
+    if command_rows:
+        print("\n🐢 Slowest WebDriver commands:")
+        print(format_slowest_commands(command_rows))
+    return exit_code
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parallel Selenium UI Test Runner")
+    parser.add_argument(
+        "--workers", "-n",
+        type=int,
+        help="Number of worker processes (default: scaled to cores and RAM)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="ui_test_artifacts",
+        help="Directory for per-worker artifacts and merged reports"
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Trace WebDriver commands per test and report the slowest"
+    )
+    parser.add_argument(
+        "tests",
+        nargs="*",
+        help="Test files relative to the repository root (default: all UI suites)"
+    )
+
+    args = parser.parse_args()
+    sys.exit(run_ui_tests_parallel(args.workers, args.output_dir, args.tests or None, args.trace))
@@ -1,37 +1,79 @@
 import csv
+import os
 from cobaTest.pages.login_page import LoginPage
 from cobaTest.pages.appointment_page import AppointmentPage
 from cobaTest.pages.confirmation_page import ConfirmationPage
 from cobaTest.pages.menu_page import MenuPage
-from cobaTest.utils.driver_factory import get_driver
+from cobaTest.pages.http_pages import (
+    HttpAppointmentPage,
+    HttpConfirmationPage,
+    HttpDriver,
+    HttpLoginPage,
+    HttpMenuPage,
+)
+from cobaTest.utils.data_driven import resume_requested, run_csv
 
-def test_make_appointment_from_csv():
-    with open('cobaTest/files/credentials.csv', newline='') as csvfile:
+CREDENTIALS_CSV = os.path.join(os.path.dirname(__file__), '..', 'files', 'credentials.csv')
+
+APPOINTMENT_CONFIG = {
+    "facility": "Seoul CURA Healthcare Center",
+    "readmission": True,
+    "healthcare_program": "Medicaid",
+    "visit_date": "25/07/2025",
+    "comment": "Follow-up appointment for check-up"
+}
+DATA_WORKERS = int(os.environ.get("PYSELE_DATA_WORKERS", "2"))
+
+def book_for_row(driver, row):
+    login_page = LoginPage(driver)
+    appointment_page = AppointmentPage(driver)
+    confirmation_page = ConfirmationPage(driver)
+    menu_page = MenuPage(driver)
+
+    login_page.open("https://katalon-demo-cura.herokuapp.com/")
+    login_page.go_to_login()
+    login_page.login(row['username'], row['password'])
+
+    appointment_page.book_appointment(APPOINTMENT_CONFIG)
+    details = confirmation_page.get_details()
+    print(f"User: {row['username']} - Details: {details}")
+    menu_page.logout()
+    return details
+
+def test_make_appointment_from_csv(resume=None):
+    summary = run_csv(
+        CREDENTIALS_CSV,
+        book_for_row,
+        concurrency=DATA_WORKERS,
+        output_path="appointment_results.jsonl",
+        resume=resume_requested() if resume is None else resume,
+    )
+    print(f"{summary['rows']} rows at {summary['rows_per_sec']} rows/sec")
+    assert summary["failed"] == 0, f"{summary['failed']} bookings failed, see {summary['output']}"
+
+def test_make_appointment_from_csv_over_http():
+    with open(CREDENTIALS_CSV, newline='') as csvfile:
         reader = csv.DictReader(csvfile)
         for row in reader:
-            driver = get_driver(headless=False)
-            driver.get("https://katalon-demo-cura.herokuapp.com/")
-
-            login_page = LoginPage(driver)
-            appointment_page = AppointmentPage(driver)
-            confirmation_page = ConfirmationPage(driver)
-            menu_page = MenuPage(driver)
+            driver = HttpDriver()
+            login_page = HttpLoginPage(driver)
+            appointment_page = HttpAppointmentPage(driver)
+            confirmation_page = HttpConfirmationPage(driver)
+            menu_page = HttpMenuPage(driver)
 
             login_page.go_to_login()
             login_page.login(row['username'], row['password'])
 
-            config = {
-                "facility": "Seoul CURA Healthcare Center",
-                "readmission": True,
-                "healthcare_program": "Medicaid",
-                "visit_date": "25/07/2025",
-                "comment": "Follow-up appointment for check-up"
-            }
-            appointment_page.book_appointment(config)
+            appointment_page.book_appointment(APPOINTMENT_CONFIG)
             details = confirmation_page.get_details()
             print(f"User: {row['username']} - Details: {details}")
             menu_page.logout()
             driver.quit()
 
 if __name__ == "__main__":
-    test_make_appointment_from_csv()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Book an appointment for every row of credentials.csv")
+    parser.add_argument("--resume", action="store_true", help="Continue from the last run's checkpoint")
+    args = parser.parse_args()
+    test_make_appointment_from_csv(resume=args.resume)
\ No newline at end of file
@@ -1,8 +1,13 @@
 import os
-import time
 from selenium.webdriver.common.by import By
+from cobaTest.pages.base_page import BasePage
+from cobaTest.utils.data_driven import resume_requested, run_csv
 from cobaTest.utils.driver_factory import get_driver
 
+FILES_DIR = os.path.join(os.path.dirname(__file__), '..', 'files')
+UPLOAD_CSV = os.path.join(FILES_DIR, 'file_upload.csv')
+FILE_INPUT = (By.XPATH, '//input[@type="file"]')
+
 def test_upload_sample_txt():
     file_path = "cobaTest/files/sample.txt"
     if not os.path.isfile(file_path):
@@ -10,17 +15,16 @@ def test_upload_sample_txt():
         return
 
     driver = get_driver(headless=False)
-    driver.get("https://filebin.net/") # type: ignore
+    page = BasePage(driver)
+    page.open("https://filebin.net/")
 
     try:
-        file_input = driver.find_element(By.XPATH, '//input[@type="file"]')
-        # time.sleep(10)  # Wait for the file input to be ready
+        file_input = page.wait_for_element(FILE_INPUT)
         file_input.send_keys(os.path.abspath(file_path))
         print(f"Uploaded file: {file_path}")
-        time.sleep(3)  # Wait for upload to complete
 
-        # Validation: Check that sample.txt appears in the uploaded files list
-        uploaded_file = driver.find_element(By.XPATH, f'//a[contains(text(), "sample.txt")]')
+        # Validation: Check that sample.txt appears in the uploaded files list once the upload completes
+        uploaded_file = page.wait_for_visible((By.XPATH, '//a[contains(text(), "sample.txt")]'), timeout=30)
         if uploaded_file:
             print("Validation passed: sample.txt is listed after upload.")
         else:
@@ -30,5 +34,38 @@ def test_upload_sample_txt():
     finally:
         driver.quit()
 
+def upload_for_row(driver, row):
+    # The CSV may hold absolute paths from another machine; fall back to files/.
+    file_path = row['filepath']
+    if not os.path.isfile(file_path):
+        file_path = os.path.join(FILES_DIR, os.path.basename(file_path))
+    file_name = os.path.basename(file_path)
+
+    page = BasePage(driver)
+    page.open("https://filebin.net/")
+    page.wait_for_element(FILE_INPUT).send_keys(os.path.abspath(file_path))
+    page.wait_for_visible((By.XPATH, f'//a[contains(text(), "{file_name}")]'), timeout=30)
+    return {"file": file_name, "url": driver.current_url}
+
+def test_upload_files_from_csv(resume=None):
+    summary = run_csv(
+        UPLOAD_CSV,
+        upload_for_row,
+        concurrency=2,
+        output_path="upload_results.jsonl",
+        resume=resume_requested() if resume is None else resume,
+    )
+    print(f"{summary['rows']} uploads at {summary['rows_per_sec']} rows/sec")
+    assert summary["failed"] == 0, f"{summary['failed']} uploads failed, see {summary['output']}"
+
 if __name__ == "__main__":
-    test_upload_sample_txt()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Upload sample files to filebin")
+    parser.add_argument("--csv", action="store_true", help="Upload every file listed in file_upload.csv")
+    parser.add_argument("--resume", action="store_true", help="Continue the CSV run from its checkpoint")
+    args = parser.parse_args()
+    if args.csv:
+        test_upload_files_from_csv(resume=args.resume)
+    else:
+        test_upload_sample_txt()
\ No newline at end of file
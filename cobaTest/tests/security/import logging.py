@@ -6,6 +6,7 @@ from cobaTest.tests.security.test_xss_vulnerability import test_xss_vulnerabilit
 from cobaTest.tests.security.test_sql_injection import test_sql_injection
 from cobaTest.tests.security.test_authentication_security import test_authentication_security
 from cobaTest.tests.security.test_csrf_vulnerability import test_csrf_vulnerability
+from cobaTest.tests.security.run_security_tests import run_logged_in
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
@@ -22,7 +23,7 @@ def run_all_security_tests():
         ("XSS Vulnerability Test", test_xss_vulnerability),
         ("SQL Injection Test", test_sql_injection),
         ("Authentication Security Test", test_authentication_security),
-        ("CSRF Vulnerability Test", test_csrf_vulnerability)
+        ("CSRF Vulnerability Test", run_logged_in(test_csrf_vulnerability))
     ]
     
     results = {}
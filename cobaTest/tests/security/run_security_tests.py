@@ -6,6 +6,7 @@ from cobaTest.tests.security.test_xss_vulnerability import test_xss_vulnerabilit
 from cobaTest.tests.security.test_sql_injection import test_sql_injection
 from cobaTest.tests.security.test_authentication_security import test_authentication_security
 from cobaTest.tests.security.test_csrf_vulnerability import test_csrf_vulnerability
+from cobaTest.utils.session_cache import logged_in_session
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
@@ -13,6 +14,13 @@ logging.basicConfig(level=logging.INFO,
                     filename='security_test_suite.log')
 logger = logging.getLogger(__name__)
 
+def run_logged_in(test_func):
+    """Run a test that expects to start on the appointment form as John Doe"""
+    def run():
+        with logged_in_session("John Doe", "ThisIsNotAPassword") as driver:
+            test_func(driver)
+    return run
+
 def run_all_security_tests():
     """Run all security tests and generate a summary report"""
     start_time = time.time()
@@ -22,7 +30,7 @@ def run_all_security_tests():
         ("XSS Vulnerability Test", test_xss_vulnerability),
         ("SQL Injection Test", test_sql_injection),
         ("Authentication Security Test", test_authentication_security),
-        ("CSRF Vulnerability Test", test_csrf_vulnerability)
+        ("CSRF Vulnerability Test", run_logged_in(test_csrf_vulnerability))
     ]
     
     results = {}
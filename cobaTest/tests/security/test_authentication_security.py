@@ -1,7 +1,8 @@
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from cobaTest.pages.login_page import LoginPage
+from cobaTest.pages.menu_page import MenuPage
 from cobaTest.utils.driver_factory import get_driver
 import logging
 
@@ -80,13 +81,8 @@ def test_authentication_security():
         )
         
         # Now logout
-        menu_toggle = driver.find_element(By.ID, "menu-toggle")
-        menu_toggle.click()
-        time.sleep(1)
-        
-        logout_link = driver.find_element(By.LINK_TEXT, "Logout")
-        logout_link.click()
-        time.sleep(1)
+        MenuPage(driver).logout()
+        LoginPage(driver).wait_until_ready()
         
         # Try to access appointment page again by using browser back button
         driver.back()
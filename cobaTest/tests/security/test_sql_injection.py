@@ -1,6 +1,7 @@
-import time
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoAlertPresentException
+from cobaTest.pages.login_page import LoginPage
+from cobaTest.pages.menu_page import MenuPage
 from cobaTest.utils.driver_factory import get_driver
 import logging
 
@@ -52,13 +53,8 @@ def test_sql_injection():
                 print(f"SQL Injection vulnerability detected with payload: {payload}")
                 
                 # If we got in, log out and try the next payload
-                menu_toggle = driver.find_element(By.ID, "menu-toggle")
-                menu_toggle.click()
-                time.sleep(1)
-                
-                logout_link = driver.find_element(By.LINK_TEXT, "Logout")
-                logout_link.click()
-                time.sleep(1)
+                MenuPage(driver).logout()
+                LoginPage(driver).wait_until_ready()
                 
                 # Navigate back to login page
                 make_appointment_btn = driver.find_element(By.LINK_TEXT, "Make Appointment")
@@ -1,21 +1,12 @@
-from cobaTest.pages.login_page import LoginPage
 from cobaTest.pages.appointment_page import AppointmentPage
 from cobaTest.pages.confirmation_page import ConfirmationPage
-from cobaTest.pages.menu_page import MenuPage
-from cobaTest.utils.driver_factory import get_driver
+from cobaTest.utils.session_cache import logged_in_session
 
-def test_make_appointment():
+def test_make_appointment(logged_in_driver):
 
-    driver = get_driver(headless=False)
-    driver.get("https://katalon-demo-cura.herokuapp.com/")
-
-    login_page = LoginPage(driver)
+    driver = logged_in_driver
     appointment_page = AppointmentPage(driver)
     confirmation_page = ConfirmationPage(driver)
-    menu_page = MenuPage(driver)
-
-    login_page.go_to_login()
-    login_page.login("John Doe", "ThisIsNotAPassword")
 
     config = {
         "facility": "Seoul CURA Healthcare Center",
@@ -27,8 +18,7 @@ def test_make_appointment():
     appointment_page.book_appointment(config)
     details = confirmation_page.get_details()
     print(details)
-    menu_page.logout()
-    driver.quit()
 
 if __name__ == "__main__":
-    test_make_appointment()
\ No newline at end of file
+    with logged_in_session("John Doe", "ThisIsNotAPassword") as driver:
+        test_make_appointment(driver)
\ No newline at end of file
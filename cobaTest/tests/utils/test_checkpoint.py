@@ -0,0 +1,125 @@
+import csv
+import io
+import os
+
+import pytest
+
+from cobaTest.utils import checkpoint as checkpoint_module
+from cobaTest.utils.checkpoint import RECORD, Checkpoint, CheckpointMismatch, iter_csv_rows_from
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A CSV with a quoted multi-line field, so rows and lines don't line up"""
+    path = tmp_path / "rows.csv"
+    path.write_text('name,note\na,one\nb,"two\nlines"\nc,three\nd,four\n', encoding="utf-8")
+    return str(path)
+
+
+def test_rows_carry_their_end_offsets(source):
+    """Test each row's end offset is where the next row starts"""
+    rows = list(iter_csv_rows_from(source))
+
+    assert [row["name"] for _, row, _ in rows] == ["a", "b", "c", "d"]
+    assert rows[1][1]["note"] == "two\nlines"
+    with open(source, "rb") as f:
+        data = f.read()
+    for (_, _, end), (_, row, _) in zip(rows, rows[1:]):
+        assert data[end:].startswith(row["name"].encode() + b",")
+    assert rows[-1][2] == len(data)
+
+
+def test_resume_from_offset(source):
+    """Test reading from a recorded offset continues with the following row and index"""
+    _, _, end = list(iter_csv_rows_from(source))[1]
+
+    resumed = list(iter_csv_rows_from(source, end, first_index=2))
+
+    assert [(index, row["name"]) for index, row, _ in resumed] == [(2, "c"), (3, "d")]
+
+
+def test_resume_point_after_passed_prefix(tmp_path, source):
+    """Test resuming starts at the first unfinished row and skips later passed ones"""
+    offsets = [end for _, _, end in iter_csv_rows_from(source)]
+    ckpt = Checkpoint(str(tmp_path / "rows.ckpt"), source)
+    ckpt.start()
+    ckpt.record(0, offsets[0], True)
+    ckpt.record(1, offsets[1], True)
+    ckpt.record(2, offsets[2], False)
+    ckpt.record(3, offsets[3], True)
+    ckpt.close()
+
+    assert ckpt.resume_point() == (2, offsets[1], {3})
+
+
+def test_retried_row_overrides_failure(tmp_path, source):
+    """Test a later record for the same row replaces the earlier one"""
+    offsets = [end for _, _, end in iter_csv_rows_from(source)]
+    ckpt = Checkpoint(str(tmp_path / "rows.ckpt"), source)
+    ckpt.start()
+    ckpt.record(0, offsets[0], False)
+    ckpt.close()
+    ckpt.start(resume=True)
+    ckpt.record(0, offsets[0], True)
+    ckpt.close()
+
+    assert ckpt.resume_point() == (1, offsets[0], set())
+
+
+def test_torn_record_is_cut_off(tmp_path, source):
+    """Test a partly written record is dropped and truncated on load"""
+    path = str(tmp_path / "rows.ckpt")
+    ckpt = Checkpoint(path, source)
+    ckpt.start()
+    ckpt.record(0, 10, True)
+    ckpt.close()
+    intact = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(RECORD.pack(1, 20, 1)[:5])
+
+    assert ckpt.load() == {0: (10, 1)}
+    assert os.path.getsize(path) == intact
+
+
+def test_changed_source_is_rejected(tmp_path, source):
+    """Test a checkpoint for another version of the CSV isn't trusted"""
+    ckpt = Checkpoint(str(tmp_path / "rows.ckpt"), source)
+    ckpt.start()
+    ckpt.close()
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("e,five\n")
+
+    with pytest.raises(CheckpointMismatch):
+        ckpt.load()
+
+
+def test_results_synced_before_checkpoint(tmp_path, source, monkeypatch):
+    """Test sync_first files are fsynced before the checkpoint itself"""
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(checkpoint_module.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    ckpt = Checkpoint(str(tmp_path / "rows.ckpt"), source, fsync_every=1)
+    with open(tmp_path / "results.jsonl", "w") as results:
+        ckpt.sync_first(results)
+        ckpt.start()
+        synced.clear()
+        ckpt.record(0, 10, True)
+
+        assert synced == [results.fileno(), ckpt._file.fileno()]
+    ckpt.close()
+
+
+@pytest.mark.parametrize("text", [
+    "a,b\n1,2\n",
+    "a,b\n1,2,3,4\n",
+    "a,b,c\n1\n",
+    "a,b\n\n1,2\n",
+])
+def test_rows_match_dict_reader(tmp_path, text):
+    """Test extra and missing columns come out as csv.DictReader has them"""
+    path = tmp_path / "rows.csv"
+    path.write_text(text, encoding="utf-8")
+
+    rows = [row for _, row, _ in iter_csv_rows_from(str(path))]
+
+    assert rows == list(csv.DictReader(io.StringIO(text)))
@@ -0,0 +1,114 @@
+import random
+import threading
+
+import pytest
+
+from cobaTest.utils.data_pool import _ID_MODULUS, _MASK, DataPool, _mix
+
+
+def _unmix(y):
+    """Inverse of splitmix64's finaliser, so _mix is shown to be a bijection."""
+    def unshift(x, shift):
+        result = x
+        for _ in range(64 // shift + 1):
+            result = x ^ (result >> shift)
+        return result & _MASK
+
+    y = unshift(y, 31)
+    y = unshift(y * pow(0x94D049BB133111EB, -1, 1 << 64) & _MASK, 27)
+    y = unshift(y * pow(0xBF58476D1CE4E5B9, -1, 1 << 64) & _MASK, 30)
+    return (y - 0x9E3779B97F4A7C15) & _MASK
+
+
+def test_mix_matches_splitmix64():
+    """Test _mix is splitmix64: its first output for seed 0 is the reference value"""
+    assert _mix(0) == 0xE220A8397B1DCDAF
+
+
+def test_mix_is_a_bijection():
+    """Test _mix can be inverted, so distinct inputs never collide"""
+    rng = random.Random(7)
+    for x in [0, 1, _MASK] + [rng.getrandbits(64) for _ in range(1000)]:
+        assert _unmix(_mix(x)) == x
+
+
+def test_pet_ids_are_unique_and_in_range():
+    """Test pet ids are a bijection of the index onto [1, 2**31 - 1]"""
+    pool = DataPool(seed=42)
+    ids = [pool.pet_id_at(i) for i in range(50_000)]
+
+    assert len(set(ids)) == len(ids)
+    assert all(1 <= pet_id <= _ID_MODULUS for pet_id in ids)
+    inverse = pow(pool._id_multiplier, -1, _ID_MODULUS)
+    for index in (0, 1, 12345, _ID_MODULUS - 1):
+        pet_id = pool.pet_id_at(index)
+        assert (pet_id - 1 - pool._id_offset) * inverse % _ID_MODULUS == index
+
+
+def test_same_seed_same_items():
+    """Test a run is reproducible from its seed"""
+    first, second = DataPool(seed=1234, batch_size=4), DataPool(seed=1234, batch_size=7)
+
+    assert [first.pet() for _ in range(10)] == [second.pet() for _ in range(10)]
+    assert [first.user() for _ in range(10)] == [second.user() for _ in range(10)]
+    assert first.appointment() == second.appointment()
+    assert DataPool(seed=1235).pet_at(0) != first.pet_at(0)
+
+
+def test_items_never_repeat_across_batches():
+    """Test taking past several batch boundaries hands out new items only"""
+    pool = DataPool(seed=5, batch_size=3)
+    pets = [pool.pet() for _ in range(20)]
+    users = [pool.user() for _ in range(20)]
+
+    assert len({pet["id"] for pet in pets}) == 20
+    assert len({pet["name"] for pet in pets}) == 20
+    assert len({user["username"] for user in users}) == 20
+
+
+def test_bulk_reserves_its_own_block():
+    """Test bulk() and single takes never share an index"""
+    pool = DataPool(seed=9, batch_size=5)
+    single = pool.pet()
+    bulk = list(pool.bulk("pet", 100))
+    after = pool.pet()
+
+    ids = [single["id"], after["id"]] + [pet["id"] for pet in bulk]
+    assert len(set(ids)) == len(ids)
+    assert bulk[0] == pool.pet_at(5)
+
+
+def test_bulk_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        list(DataPool(seed=1).bulk("owner", 1))
+
+
+def test_overrides_replace_fields():
+    pet = DataPool(seed=3).pet(status="sold", name="Rex")
+
+    assert pet["status"] == "sold"
+    assert pet["name"] == "Rex"
+    assert pet["photoUrls"]
+
+
+def test_concurrent_takes_are_unique():
+    """Test pets taken from many threads at once are all distinct"""
+    pool = DataPool(seed=11, batch_size=16)
+    taken = []
+
+    def take():
+        taken.extend(pool.pet()["id"] for _ in range(200))
+
+    threads = [threading.Thread(target=take) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(taken)) == len(taken) == 1600
+
+
+def test_seed_from_environment(monkeypatch):
+    monkeypatch.setenv("PYSELE_DATA_SEED", "77")
+
+    assert DataPool().seed == 77
@@ -0,0 +1,98 @@
+import os
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import pytest
+from PIL import Image
+
+from cobaTest.utils import fixture_files
+from cobaTest.utils.fixture_files import MultipartFile, image_file, large_jpeg, mapped
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    """A fresh fixtures cache, with the per-process path and mmap memos emptied"""
+    monkeypatch.setenv("PYSELE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(fixture_files, "_paths", {})
+    monkeypatch.setattr(fixture_files, "_views", {})
+    return tmp_path / "fixtures"
+
+
+def test_fixture_generated_once(cache):
+    """Test the same parameters reuse one cached file, other parameters get their own"""
+    first = image_file(20, 10, color="green")
+    fixture_files._paths.clear()
+
+    assert image_file(20, 10, color="green") == first
+    assert image_file(20, 11, color="green") != first
+    assert len(os.listdir(cache)) == 2
+    with Image.open(first) as image:
+        assert image.size == (20, 10)
+
+
+@pytest.mark.parametrize("size", [5_000, 70_001, 3 * 65_535 + 17])
+def test_large_jpeg_exact_size_and_decodable(size):
+    """Test padded JPEGs have exactly the requested size and still decode"""
+    path = large_jpeg(size, width=16, height=8)
+
+    assert os.path.getsize(path) == size
+    with Image.open(path) as image:
+        image.load()
+        assert image.size == (16, 8)
+
+
+def test_large_jpeg_rejects_impossible_sizes():
+    """Test sizes below the encoded image, or too small for a segment header, are refused"""
+    base = os.path.getsize(image_file(64, 64, "blue"))
+
+    assert os.path.getsize(large_jpeg(base)) == base
+    for size in (base - 1, base + 1, base + 3):
+        with pytest.raises(ValueError):
+            large_jpeg(size)
+
+
+def test_mapped_view_is_shared_and_read_only():
+    path = image_file(8, 8)
+
+    view = mapped(path)
+
+    assert mapped(path) is view
+    assert view.readonly
+    with open(path, "rb") as f:
+        assert bytes(view) == f.read()
+
+
+def _parse(body):
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {body.content_type}\r\n\r\n".encode() + b"".join(bytes(c) for c in body))
+    return {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+
+
+def test_multipart_file_streams_a_valid_body():
+    """Test the streamed body parses as multipart with the fields and the exact file bytes"""
+    path = large_jpeg(70_001)
+    body = MultipartFile(path, filename="pet.jpg", content_type="image/jpeg",
+                         fields={"additionalMetadata": "load"}, chunk_size=4096)
+
+    parts = _parse(body)
+
+    assert parts["additionalMetadata"].get_content() == "load"
+    assert parts["file"].get_filename() == "pet.jpg"
+    assert parts["file"].get_content_type() == "image/jpeg"
+    with open(path, "rb") as f:
+        assert parts["file"].get_payload(decode=True) == f.read()
+
+
+def test_multipart_file_length_matches_reads():
+    """Test len() is the number of bytes read() hands out, in chunks no larger than asked"""
+    body = MultipartFile(image_file(8, 8), fields={"a": "b"})
+    sizes = []
+    while True:
+        chunk = body.read(100)
+        if not chunk:
+            break
+        sizes.append(len(chunk))
+
+    assert sum(sizes) == len(body)
+    assert max(sizes) <= 100
+    assert body.read() == b""
@@ -0,0 +1,94 @@
+import pytest
+
+from cobaTest.pages.http_pages import HttpConfirmationPage, text_by_id
+
+
+def test_nested_markup_is_flattened():
+    """Test an element's text includes its descendants', with whitespace normalized"""
+    source = '<div id="comment">  Hello\n  <b>bold</b> <i>and <u>deep</u></i>  </div>'
+
+    assert text_by_id(source, ["comment"]) == {"comment": "Hello bold and deep"}
+
+
+def test_void_tags_and_missing_ids():
+    source = '<div id="a">one<br>two<img src="x.png"><input value="v">three</div>'
+
+    assert text_by_id(source, ["a", "missing"]) == {"a": "onetwothree"}
+
+
+@pytest.mark.parametrize("source,expected", [
+    # An unclosed <p> before the target
+    ('<div><p>intro<p>more</div><p id="a">target</p>', {"a": "target"}),
+    # An unclosed <p> inside the target
+    ('<div id="a"><p>one <p>two</div><span id="b">after</span>', {"a": "one two", "b": "after"}),
+    # Targets that are themselves implicitly closed
+    ('<ul><li id="a">one<li id="b">two</ul><span id="c">after</span>', {"a": "one", "b": "two", "c": "after"}),
+    ('<select><option id="a">A<option id="b">B</select>', {"a": "A", "b": "B"}),
+    ('<table><tr><td id="a">1<td id="b">2<tr><td id="c">3</table>', {"a": "1", "b": "2", "c": "3"}),
+    ('<dl><dt id="a">term<dd id="b">definition</dl>', {"a": "term", "b": "definition"}),
+    ('<p id="a">para<div id="b">block</div>', {"a": "para", "b": "block"}),
+])
+def test_implicitly_closed_elements(source, expected):
+    """Test elements without end tags neither swallow their targets nor drop them"""
+    assert text_by_id(source, expected) == expected
+
+
+def test_stray_end_tags_are_ignored():
+    source = '<div id="a">x</span></p>y</div><div id="b">z</div>'
+
+    assert text_by_id(source, ["a", "b"]) == {"a": "xy", "b": "z"}
+
+
+def test_unterminated_target_is_collected_at_end_of_input():
+    assert text_by_id('<body><div id="a">cut short', ["a"]) == {"a": "cut short"}
+
+
+def test_first_element_with_an_id_wins():
+    source = '<p id="a">first</p><p id="a">second</p>'
+
+    assert text_by_id(source, ["a"]) == {"a": "first"}
+
+
+class _Driver:
+    current_url = "https://katalon-demo-cura.herokuapp.com/appointment.php#summary"
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+
+
+CONFIRMATION = """
+<section id="summary"><div class="container"><div class="row">
+  <div class="col-xs-12 text-center"><h2>Appointment Confirmation</h2>
+    <p class="lead">Please be informed that your appointment has been booked as following:</p>
+  </div>
+  <div class="col-xs-4"><label>Facility</label></div>
+  <div class="col-xs-8"><p id="facility">Tokyo CURA Healthcare Center</p></div>
+  <div class="col-xs-4"><label>Apply for hospital readmission</label></div>
+  <div class="col-xs-8"><p id="hospital_readmission">Yes</p></div>
+  <div class="col-xs-4"><label>Healthcare Program</label></div>
+  <div class="col-xs-8"><p id="program">Medicare</p></div>
+  <div class="col-xs-4"><label>Visit Date</label></div>
+  <div class="col-xs-8"><p id="visit_date">01/02/2031</p></div>
+  <div class="col-xs-4"><label>Comment</label></div>
+  <div class="col-xs-8"><p id="comment">Checkup <br>please</p></div>
+</div></div></section>
+"""
+
+
+def test_confirmation_details():
+    details = HttpConfirmationPage(_Driver(CONFIRMATION)).get_details()
+
+    assert details == {
+        "facility": "Tokyo CURA Healthcare Center",
+        "readmission": "Yes",
+        "program": "Medicare",
+        "visit_date": "01/02/2031",
+        "comment": "Checkup please",
+    }
+
+
+def test_confirmation_missing_field():
+    source = CONFIRMATION.replace('id="program"', 'id="other"')
+
+    with pytest.raises(RuntimeError, match="program"):
+        HttpConfirmationPage(_Driver(source)).get_details()
@@ -0,0 +1,172 @@
+import http.server
+import io
+import threading
+
+import pytest
+
+from cobaTest.utils import http_transport
+from cobaTest.utils.http_transport import TransportStats, _iter_body, _RawResponse
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received = []
+
+    def _reply(self, body=b"", headers=()):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._reply()
+
+    def do_GET(self):
+        if self.path == "/cookie":
+            self._reply(b"set", [("Set-Cookie", "visit=1; Path=/")])
+        else:
+            self._reply(b"x" * 100_000)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.received.append(self.rfile.read(length))
+        self._reply(str(length).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(params=["http1", "http2"])
+def transport(request, monkeypatch):
+    """The module with a fresh adapter and stats, over HTTP/1.1 and (when installed) httpx"""
+    if request.param == "http2":
+        pytest.importorskip("h2")
+        pytest.importorskip("httpx")
+        monkeypatch.setenv("PYSELE_HTTP2", "1")
+    else:
+        monkeypatch.delenv("PYSELE_HTTP2", raising=False)
+    monkeypatch.setattr(http_transport, "_adapter", None)
+    monkeypatch.setattr(http_transport, "_default_session", None)
+    http_transport.stats.reset()
+    yield http_transport
+    http_transport.shared_adapter().shutdown()
+    http_transport.stats.reset()
+
+
+def test_stats_discount_prewarmed_connections():
+    """Test prewarmed connections don't count against reuse"""
+    stats = TransportStats()
+    stats.connected(0.010, prewarm=True)
+    stats.connected(0.020, prewarm=True)
+    stats.connected(0.030)
+    for _ in range(10):
+        stats.request()
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["reuse_ratio"] == pytest.approx(0.9)
+    assert snapshot["mean_connect_ms"] == pytest.approx(20)
+    assert snapshot["handshake_seconds_saved"] == pytest.approx(9 * 0.020)
+
+
+def test_iter_body_streams_file_likes_in_chunks(monkeypatch):
+    monkeypatch.setattr(http_transport, "BODY_CHUNK_SIZE", 4)
+
+    assert list(_iter_body(io.BytesIO(b"abcdefghij"))) == [b"abcd", b"efgh", b"ij"]
+    assert list(_iter_body(io.StringIO("abcdef"))) == [b"abcd", b"ef"]
+    assert list(_iter_body(iter([memoryview(b"ab"), "cd", b""]))) == [b"ab", b"cd"]
+
+
+def test_raw_response_reads_across_chunks():
+    raw = _RawResponse([("Content-Type", "text/plain")], iter([b"abc", b"de", b"fgh"]))
+
+    assert raw.read(4) == b"abcd"
+    assert raw.read(1) == b"e"
+    assert raw.read() == b"fgh"
+    assert raw.read(1) == b""
+
+
+def test_sessions_share_connections(transport, server):
+    """Test requests from separate sessions reuse one pooled connection"""
+    for _ in range(3):
+        with transport.session() as s:
+            assert s.get(f"{server}/").status_code == 200
+    transport.get(f"{server}/")
+
+    snapshot = transport.stats.snapshot()
+    assert snapshot["requests"] == 4
+    assert snapshot["connections"] == 1
+
+
+def test_prewarmed_connections_are_reused(transport, server):
+    """Test prewarm opens distinct connections that later requests draw from"""
+    expected = 1 if transport.shared_adapter().http2 else 3
+
+    assert transport.prewarm([server], 3) == expected
+    for _ in range(5):
+        transport.get(f"{server}/")
+
+    snapshot = transport.stats.snapshot()
+    assert snapshot["connections"] == snapshot["prewarmed"] == expected
+    assert snapshot["requests"] == 5
+    assert snapshot["reuse_ratio"] == 1
+
+
+def test_prewarm_ignores_unreachable_hosts(transport, server):
+    """Test a host that refuses connections doesn't stop the others from being prewarmed"""
+    opened = transport.prewarm(["http://127.0.0.1:1/", server], 2)
+
+    assert opened == (1 if transport.shared_adapter().http2 else 2)
+
+
+def test_streamed_response(transport, server):
+    response = transport.get(f"{server}/", stream=True)
+
+    assert sum(len(chunk) for chunk in response.iter_content(8192)) == 100_000
+
+
+def test_streamed_upload(transport, server):
+    """Test a file-like body is sent with its full length"""
+    _Handler.received.clear()
+    data = bytes(range(256)) * 5000
+
+    response = transport.post(f"{server}/", data=io.BytesIO(data))
+
+    assert response.text == str(len(data))
+    assert _Handler.received == [data]
+
+
+def test_cookies_stay_with_their_session(transport, server):
+    """Test a cookie set on one session isn't sent by another on the shared pool"""
+    with transport.session() as first, transport.session() as second:
+        first.get(f"{server}/cookie")
+
+        assert first.cookies.get("visit") == "1"
+        assert not second.cookies
+    transport.get(f"{server}/cookie")
+    assert not transport._session().cookies
+
+
+def test_http2_client_per_tls_setting(transport, server):
+    """Test verify= selects its own httpx client instead of being ignored"""
+    adapter = transport.shared_adapter()
+    if not adapter.http2:
+        pytest.skip("HTTP/1.1 pools are keyed by urllib3")
+
+    transport.get(f"{server}/")
+    transport.get(f"{server}/", verify=False)
+
+    assert len({key[0] for key in adapter._clients}) == 2
@@ -0,0 +1,102 @@
+import json
+import math
+import random
+
+import pytest
+
+from cobaTest.utils.latency_histogram import LatencyHistogram
+
+
+@pytest.mark.parametrize("significant_figures", [1, 2, 3, 4])
+def test_small_values_have_their_own_bucket(significant_figures):
+    """Test values below the first power-of-two split are recorded exactly"""
+    histogram = LatencyHistogram(significant_figures)
+    exact = 1 << histogram._sub_bucket_bits
+
+    indices = [histogram._index(value) for value in range(exact)]
+
+    assert indices == list(range(exact))
+    assert all(histogram._highest_equivalent(index) == index for index in indices)
+
+
+@pytest.mark.parametrize("significant_figures", [1, 2, 3, 4])
+def test_bucket_bounds_bracket_each_value(significant_figures):
+    """Test every value falls inside its bucket, whose width meets the precision"""
+    histogram = LatencyHistogram(significant_figures)
+    rng = random.Random(significant_figures)
+    values = [rng.randrange(1 << rng.randrange(1, 40)) for _ in range(5000)]
+
+    for value in values:
+        index = histogram._index(value)
+        highest = histogram._highest_equivalent(index)
+        lowest = histogram._highest_equivalent(index - 1) + 1 if index else 0
+        assert lowest <= value <= highest
+        assert highest - lowest <= value * 10 ** -significant_figures
+
+
+def test_bucket_index_is_monotonic():
+    histogram = LatencyHistogram()
+    indices = [histogram._index(value) for value in range(0, 1 << 20, 7)]
+
+    assert indices == sorted(indices)
+
+
+def test_percentiles_within_precision():
+    """Test percentiles match exact nearest-rank values to within the relative error"""
+    rng = random.Random(1)
+    values = [int(rng.lognormvariate(8, 1.5)) for _ in range(20_000)]
+    histogram = LatencyHistogram(3)
+    for value in values:
+        histogram.record(value)
+    values.sort()
+
+    for p in (1, 50, 90, 99, 99.9, 100):
+        exact = values[max(math.ceil(p / 100 * len(values)), 1) - 1]
+        assert exact <= histogram.percentile(p) <= exact * (1 + 1e-3) + 1
+    assert histogram.percentiles((50, 99)) == {"p50": histogram.percentile(50), "p99": histogram.percentile(99)}
+    assert histogram.percentile(100) == histogram.max == values[-1]
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+
+def test_merge_equals_recording_everything():
+    rng = random.Random(2)
+    values = [rng.randrange(1, 10 ** 7) for _ in range(3000)]
+    everything, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i, value in enumerate(values):
+        everything.record(value)
+        (first if i % 2 else second).record(value)
+
+    merged = first.merge(second)
+
+    assert merged.to_dict() == everything.to_dict()
+    with pytest.raises(ValueError):
+        merged.merge(LatencyHistogram(2))
+
+
+def test_json_round_trip():
+    histogram = LatencyHistogram(2, unit="ns")
+    for value in (0, 5, 1234, 98765, 98765):
+        histogram.record(value)
+
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+
+    assert restored.to_dict() == histogram.to_dict()
+    assert restored.percentiles() == histogram.percentiles()
+    assert restored.unit == "ns"
+
+
+def test_record_count_and_empty_histogram():
+    histogram = LatencyHistogram()
+
+    assert histogram.percentile(99) == 0
+    assert histogram.percentiles((50,)) == {"p50": 0}
+    histogram.record(10, count=4)
+    assert histogram.total == 4
+    assert histogram.mean == 10
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        LatencyHistogram().record(-1)
+    with pytest.raises(ValueError):
+        LatencyHistogram(significant_figures=6)
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+
+import pytest
+
+from cobaTest.utils.load_generator import LoadGenerator, Scenario
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+async def _ok(client):
+    return _Response(200)
+
+
+def _run(generator, **kwargs):
+    return asyncio.run(generator.run(**kwargs))
+
+
+def test_pick_follows_weights():
+    """Test scenarios are picked in proportion to their weights, never at weight 0"""
+    generator = LoadGenerator([Scenario("a", _ok, 3), Scenario("b", _ok, 1), Scenario("never", _ok, 0)])
+    rng = random.Random(4)
+
+    picks = Counter(generator._pick(rng).name for _ in range(20_000))
+
+    assert picks["never"] == 0
+    assert picks["a"] / 20_000 == pytest.approx(0.75, abs=0.02)
+
+
+def test_open_model_schedules_at_the_rate():
+    """Test constant arrivals send duration * rps requests"""
+    report = _run(LoadGenerator([Scenario("ok", _ok)], seed=1), duration=0.5, rps=100)
+
+    assert report.overall.requests == 50
+    assert report.overall.errors == 0
+    assert report.config["model"] == "open"
+
+
+def test_same_seed_same_mix():
+    """Test a seeded run picks the same scenarios again"""
+    def counts():
+        generator = LoadGenerator([Scenario("a", _ok, 2), Scenario("b", _ok, 1)], seed=99)
+        report = _run(generator, duration=0.3, rps=200, arrival="poisson")
+        return {name: s.requests for name, s in report.stats.items()}
+
+    assert counts() == counts()
+
+
+def test_latency_includes_queueing_delay():
+    """Test latency counts from the scheduled start, so a backed-up sender shows up in it"""
+    def slow(client):
+        time.sleep(0.02)
+        return _Response(200)
+
+    report = _run(LoadGenerator([Scenario("slow", slow)], threads=1, seed=1), duration=0.2, rps=200)
+    stats = report.stats["slow"]
+
+    assert stats.service.percentile(99) < 40_000
+    assert stats.latency.max > 5 * stats.service.max
+
+
+def test_arrivals_over_max_in_flight_are_dropped():
+    async def stalled(client):
+        await asyncio.sleep(0.3)
+        return _Response(200)
+
+    report = _run(LoadGenerator([Scenario("stalled", stalled)], max_in_flight=5, seed=1), duration=0.2, rps=100)
+
+    assert report.overall.requests == 5
+    assert report.dropped == 15
+
+
+def test_errors_by_status_and_exception():
+    def not_found(client):
+        return _Response(404)
+
+    async def broken(client):
+        raise ConnectionError("reset")
+
+    generator = LoadGenerator([Scenario("missing", not_found), Scenario("broken", broken),
+                               Scenario("created", lambda client: _Response(201), expect=(201,))], seed=3)
+    report = _run(generator, duration=0.3, rps=100)
+
+    assert report.stats["missing"].error_samples == {"HTTP 404": report.stats["missing"].requests}
+    assert report.stats["broken"].error_samples == {"ConnectionError": report.stats["broken"].requests}
+    assert report.stats["created"].errors == 0
+    assert report.overall.errors == report.stats["missing"].requests + report.stats["broken"].requests
+
+
+def test_closed_model_keeps_workers_busy():
+    calls = []
+
+    async def tracked(client):
+        calls.append(client)
+        await asyncio.sleep(0.01)
+        return _Response(200)
+
+    report = _run(LoadGenerator([Scenario("tracked", tracked)], client="client", seed=1), duration=0.2, concurrency=3)
+
+    assert report.config["model"] == "closed"
+    assert report.overall.requests == len(calls) > 3
+    assert set(calls) == {"client"}
+
+
+def test_report_renders():
+    report = _run(LoadGenerator([Scenario("<find>", _ok)], seed=1), duration=0.1, rps=50)
+
+    data = json.loads(json.dumps(report.to_dict()))
+
+    assert data["overall"]["requests"] == 5
+    assert data["histograms_us"]["<find>"]["total"] == 5
+    assert "&lt;find&gt;" in report.to_html()
+    assert "TOTAL" in report.format_table()
+
+
+def test_rejects_bad_configuration():
+    generator = LoadGenerator([Scenario("ok", _ok)])
+
+    with pytest.raises(ValueError):
+        LoadGenerator([])
+    with pytest.raises(ValueError):
+        _run(generator, duration=0.1)
+    with pytest.raises(ValueError):
+        _run(generator, duration=0.1, rps=10, concurrency=2)
+    with pytest.raises(ValueError):
+        _run(generator, duration=0.1, rps=10, arrival="burst")
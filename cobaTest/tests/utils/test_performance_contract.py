@@ -0,0 +1,157 @@
+import json
+import math
+
+import pytest
+
+from cobaTest.utils import performance_contract
+from cobaTest.utils.performance_contract import (
+    LatencyBudget,
+    PerformanceContract,
+    PerformanceHistory,
+    _history_target,
+    minimum_samples,
+    percentile_rank_interval,
+)
+
+
+class _Response:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+
+
+def _coverage(n, q, lower, upper):
+    """P(x_(lower) <= Q <= x_(upper)) for n samples, straight from the binomial pmf"""
+    return sum(math.comb(n, k) * q ** k * (1 - q) ** (n - k) for k in range(lower, upper))
+
+
+@pytest.fixture
+def history(tmp_path):
+    return PerformanceHistory(str(tmp_path / "history.jsonl"))
+
+
+@pytest.fixture
+def timed(monkeypatch):
+    """``timed(ms, ...)``: a call whose n-th run takes the n-th duration (cycling), on a fake clock"""
+    now = [0]
+    monkeypatch.setattr(performance_contract.time, "perf_counter_ns", lambda: now[0])
+
+    def make(*durations_ms):
+        index = [0]
+
+        def call():
+            now[0] += int(durations_ms[index[0] % len(durations_ms)] * 1e6)
+            index[0] += 1
+
+        return call
+
+    return make
+
+
+@pytest.mark.parametrize("n,q", [(20, 0.5), (40, 0.5), (100, 0.9), (400, 0.99)])
+def test_rank_interval_covers_the_quantile(n, q):
+    """Test the order-statistic interval reaches the confidence and is the tightest that does"""
+    lower, upper = percentile_rank_interval(n, q, 0.95)
+
+    assert 1 <= lower < upper <= n
+    assert _coverage(n, q, lower, upper) >= 0.95
+    assert _coverage(n, q, lower + 1, upper) < 0.95 + 0.025
+    assert _coverage(n, q, lower, upper - 1) < 0.95 + 0.025
+
+
+def test_rank_interval_known_values():
+    """Test the median of 20 samples is bracketed by the 6th and 15th order statistics"""
+    assert percentile_rank_interval(20, 0.5, 0.95) == (6, 15)
+
+
+@pytest.mark.parametrize("q,needed", [(0.5, 6), (0.95, 72), (0.99, 368)])
+def test_minimum_samples(q, needed):
+    """Test the sample counts quoted in the module docs, and that one fewer leaves a side unbounded"""
+    assert minimum_samples(q) == needed
+    assert None not in percentile_rank_interval(needed, q, 0.95)
+    assert None in percentile_rank_interval(needed - 1, q, 0.95)
+
+
+@pytest.mark.parametrize("target,expected", [
+    ("http://127.0.0.1:41234/v2", "http://127.0.0.1/v2"),
+    ("https://petstore3.swagger.io/api/v3/", "https://petstore3.swagger.io/api/v3"),
+    ("http://[::1]:8080/api", "http://[::1]/api"),
+    ("", ""),
+])
+def test_history_target_drops_the_port(target, expected):
+    assert _history_target(target) == expected
+
+
+def test_budget_breach_needs_the_whole_interval_over(history, timed):
+    """Test a budget fails only when the percentile's lower bound is over it"""
+    contract = PerformanceContract("GET /x", LatencyBudget({50: 10}, samples=20, warmup=0), history)
+
+    result = contract.measure(timed(*range(1, 21)))
+
+    # p50 is the 10th sample, but its interval (6th to 15th) reaches below 10ms.
+    assert result.percentiles_ms[50] == 10
+    assert result.intervals_ms[50] == (6, 15)
+    assert result.passed
+    result = contract.measure(timed(*range(6, 26)))
+    assert result.violations == ["p50 is over 10ms (at least 11.0ms)"]
+
+
+def test_strict_budget_needs_a_bounded_interval(history, timed):
+    """Test strict budgets fail while the interval is unbounded above"""
+    budget = LatencyBudget({99: 1000}, samples=20, warmup=0, strict=True)
+
+    result = PerformanceContract("GET /x", budget, history).measure(timed(1))
+
+    assert result.violations == ["p99 not shown to be under 1000ms (upper bound unbounded)"]
+
+
+def test_rare_outliers_are_set_aside(history, timed):
+    """Test one far-out sample is dropped, but a tail of them stays in"""
+    contract = PerformanceContract("GET /x", LatencyBudget({50: 1000}, samples=40, warmup=0), history)
+
+    # One 500ms sample in 40 (2.5%) is set aside...
+    rare = contract.measure(timed(500, *([10, 11, 12, 13] * 10)[:39]))
+    assert rare.outliers_ms == [500]
+    assert max(rare.samples_ms) == 13
+    # ...four (10%) are the endpoint's tail and stay in.
+    tail = contract.measure(timed(500, *[10, 11, 12, 13] * 3))
+    assert tail.outliers_ms == []
+    assert tail.samples_ms.count(500) == 4
+
+
+def test_unexpected_status_is_not_timed(history):
+    contract = PerformanceContract("GET /x", LatencyBudget({50: 1000}, samples=5, warmup=0), history)
+
+    with pytest.raises(AssertionError):
+        contract.measure(lambda: _Response(500))
+
+
+def test_regression_against_passing_history(history, timed):
+    """Test p50 is compared with the median of earlier passing runs on the same host"""
+    contract = PerformanceContract("GET /x", LatencyBudget({50: 1000}, samples=20, warmup=0), history)
+    for port, ms in ((1001, 10), (1002, 12), (1003, 11)):
+        assert contract.measure(timed(ms), target=f"http://127.0.0.1:{port}/v2").passed
+
+    result = contract.measure(timed(20), target="http://127.0.0.1:1004/v2")
+
+    assert result.violations == ["p50 regressed: at least 20.0ms vs 11.0ms median of the last 3 runs"]
+    # The failed run doesn't drag the baseline up for the next one.
+    assert len(history.previous("GET /x", "http://127.0.0.1/v2")) == 3
+    assert not contract.measure(timed(20), target="http://127.0.0.1:1005/v2").passed
+    assert contract.measure(timed(20), target="http://other/v2").passed
+
+
+def test_history_rotates_and_skips_bad_lines(tmp_path, timed):
+    """Test the file keeps the newest entries and survives a line cut short"""
+    path = tmp_path / "history.jsonl"
+    history = PerformanceHistory(str(path), max_entries=3)
+    contract = PerformanceContract("GET /x", LatencyBudget({50: 1000}, samples=5, warmup=0), history)
+    for _ in range(5):
+        contract.measure(timed(1), target="stub")
+
+    assert len(path.read_text().splitlines()) == 3
+    with open(path, "a") as f:
+        f.write('{"endpoint": "GET /x", "target": "stub", "passed"')
+
+    reloaded = PerformanceHistory(str(path), max_entries=3)
+    assert len(reloaded.previous("GET /x", "stub")) == 3
+    assert all(json.loads(line)["target"] == "stub" for line in path.read_text().splitlines()[:3])
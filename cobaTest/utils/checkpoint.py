@@ -0,0 +1,151 @@
+"""Crash-safe checkpoints for long data-driven runs.
+
+A checkpoint is an append-only binary log next to the results file: a small
+header identifying the source CSV, then one fixed-size record per finished
+row holding its index, the byte offset just past it in the CSV and whether
+it passed. Each record is a single ``O_APPEND`` write, and fsyncs are
+batched every ``fsync_every`` records or ``fsync_interval`` seconds, each
+one preceded by an fsync of the results file (``sync_first``), so a durable
+record never outlives the result it stands for. A record torn by a crash is
+cut off on the next load.
+
+Resuming seeks the CSV straight to the end of the last row of the finished
+prefix. Rows after it that already passed are skipped; failed rows run again.
+"""
+import csv
+import os
+import struct
+import time
+
+MAGIC = b"PYSCKPT1"
+HEADER = struct.Struct("<8sQQ")  # magic, source size, source mtime (ns)
+RECORD = struct.Struct("<QQB")  # row index, byte offset past the row, status
+PASSED, FAILED = 1, 2
+
+
+class CheckpointMismatch(RuntimeError):
+    """The checkpoint was written for a different version of the source file."""
+
+
+def _source_identity(source_path):
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class Checkpoint:
+    def __init__(self, path, source_path, fsync_every=50, fsync_interval=1.0):
+        self.path = path
+        self.source_path = source_path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._sync_first = []
+
+    def sync_first(self, f):
+        """fsync ``f`` before every fsync of the checkpoint."""
+        self._sync_first.append(f)
+
+    def _sync(self):
+        for f in self._sync_first:
+            if not f.closed:
+                f.flush()
+                os.fsync(f.fileno())
+        os.fsync(self._file.fileno())
+
+    def load(self):
+        """``{row index: (end offset, status)}`` for the rows already finished."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}
+        if len(data) < HEADER.size:
+            return {}
+        magic, size, mtime_ns = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise CheckpointMismatch(f"{self.path} is not a checkpoint file")
+        if (size, mtime_ns) != _source_identity(self.source_path):
+            raise CheckpointMismatch(f"{self.source_path} changed since {self.path} was written")
+        finished = {}
+        whole = HEADER.size + (len(data) - HEADER.size) // RECORD.size * RECORD.size
+        for index, end_offset, status in RECORD.iter_unpack(data[HEADER.size:whole]):
+            # A later record for the same row (a retried failure) wins.
+            finished[index] = (end_offset, status)
+        if whole != len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(whole)
+        return finished
+
+    def resume_point(self):
+        """``(first index, byte offset, indices to skip)`` for a resumed run."""
+        finished = self.load()
+        first, offset = 0, 0
+        while finished.get(first, (0, 0))[1] == PASSED:
+            offset = finished[first][0]
+            first += 1
+        skip = {index for index, (_, status) in finished.items() if index > first and status == PASSED}
+        return first, offset, skip
+
+    def start(self, resume=False):
+        """Open the log for appending, starting a fresh one unless resuming."""
+        if resume and os.path.exists(self.path) and os.path.getsize(self.path) >= HEADER.size:
+            self._file = open(self.path, "ab", buffering=0)
+        else:
+            self._file = open(self.path, "wb", buffering=0)
+            self._file.write(HEADER.pack(MAGIC, *_source_identity(self.source_path)))
+            os.fsync(self._file.fileno())
+
+    def record(self, index, end_offset, passed):
+        self._file.write(RECORD.pack(index, end_offset, PASSED if passed else FAILED))
+        self._unsynced += 1
+        now = time.monotonic()
+        if self._unsynced >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+            self._sync()
+            self._unsynced = 0
+            self._last_sync = now
+
+    def close(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+
+def iter_csv_rows_from(path, offset=0, first_index=0):
+    """Yield ``(index, row, end offset)`` from a CSV, starting at a byte offset.
+
+    ``offset`` 0 means the first data row; any other value must be an end
+    offset recorded by this function, i.e. the start of a row.
+    """
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8-sig")]))
+        if offset:
+            f.seek(offset)
+        position = [f.tell()]
+
+        def lines():
+            for raw in iter(f.readline, b""):
+                position[0] += len(raw)
+                yield raw.decode("utf-8")
+
+        # csv.reader pulls exactly the lines of one record per row, so the
+        # position after each row is that row's end offset.
+        index = first_index
+        for values in csv.reader(lines()):
+            if not values:
+                continue
+            yield index, _row_dict(header, values), position[0]
+            index += 1
+
+
+def _row_dict(header, values):
+    # Same as csv.DictReader: extra values under None, missing ones as None.
+    row = dict(zip(header, values))
+    if len(values) > len(header):
+        row[None] = values[len(header):]
+    else:
+        for key in header[len(values):]:
+            row[key] = None
+    return row
@@ -0,0 +1,243 @@
+"""Per-command WebDriver latency tracing.
+
+``trace_commands`` wraps ``driver.execute``, which every WebDriver command
+goes through, including the ones ``WebElement`` issues. Each command is
+recorded with its duration and the page-object methods that issued it, e.g.
+``AppointmentPage.book_appointment > BasePage.click``. Tracing is opt-in:
+with ``PYSELE_TRACE=1`` (or ``PYSELE_TRACE_DIR``) set, ``get_driver`` traces
+every session. Callers are labelled when they are instances of a class
+registered with ``register_caller_type``, which the pages layer does for
+``BasePage``.
+
+Running totals per (caller, command) feed the slowest-commands table. With
+``PYSELE_TRACE_DIR`` set, ``flush_test_trace`` also writes a Chrome trace
+(chrome://tracing, Perfetto) and a folded-stack file (flamegraph.pl,
+speedscope) per test, and a totals file per process is written at exit.
+"""
+import atexit
+import glob
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+MAX_STACK_DEPTH = 40
+NO_CALLER = "<direct>"
+
+_lock = threading.Lock()
+_events = []  # (command, start, seconds, callers, thread id)
+_totals = {}  # (caller, command) -> [count, total seconds, max seconds]
+_labels = {}  # code object -> "Class.method", or None for non page-object code
+_caller_types = ()
+_epoch = time.perf_counter()
+
+
+def tracing_enabled():
+    return os.environ.get("PYSELE_TRACE") == "1" or bool(os.environ.get("PYSELE_TRACE_DIR"))
+
+
+def register_caller_type(cls):
+    """Label commands issued from methods of ``cls`` (and its subclasses)."""
+    global _caller_types
+    with _lock:
+        if cls not in _caller_types:
+            _caller_types += (cls,)
+            _labels.clear()
+    return cls
+
+
+def _label(frame):
+    code = frame.f_code
+    try:
+        return _labels[code]
+    except KeyError:
+        pass
+    # Only the first frame of each code object is inspected; the result is
+    # the class that defines the method, which never changes.
+    label = None
+    owner = frame.f_locals.get("self")
+    if isinstance(owner, _caller_types):
+        for cls in type(owner).__mro__:
+            if getattr(cls.__dict__.get(code.co_name), "__code__", None) is code:
+                label = f"{cls.__name__}.{code.co_name}"
+                break
+    _labels[code] = label
+    return label
+
+
+def _callers():
+    stack = []
+    frame = sys._getframe(2)
+    for _ in range(MAX_STACK_DEPTH):
+        if frame is None:
+            break
+        label = _label(frame)
+        if label and (not stack or stack[-1] != label):
+            stack.append(label)
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def _record(command, start, seconds, callers):
+    caller = " > ".join(callers) or NO_CALLER
+    keep_events = bool(os.environ.get("PYSELE_TRACE_DIR"))
+    with _lock:
+        if keep_events:
+            _events.append((command, start, seconds, callers, threading.get_ident()))
+        totals = _totals.get((caller, command))
+        if totals is None:
+            totals = _totals[(caller, command)] = [0, 0.0, 0.0]
+        totals[0] += 1
+        totals[1] += seconds
+        if seconds > totals[2]:
+            totals[2] = seconds
+
+
+def trace_commands(driver):
+    """Record every command ``driver`` executes from now on."""
+    if "execute" in vars(driver):
+        return driver
+    execute = driver.execute
+
+    def traced_execute(driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            _record(driver_command, start, time.perf_counter() - start, _callers())
+
+    driver.execute = traced_execute
+    return driver
+
+
+def _micros(seconds):
+    return round(seconds * 1e6, 1)
+
+
+def chrome_trace_events(events):
+    """Complete ("X") events for the commands and their page-object callers.
+
+    Consecutive commands under the same caller prefix are merged into one
+    span per caller, so the trace viewer shows a flame chart.
+    """
+    pid = os.getpid()
+    out = []
+    by_thread = {}
+    for event in events:
+        by_thread.setdefault(event[4], []).append(event)
+    for tid, thread_events in by_thread.items():
+        spans = []  # open [label, start, end], outermost first
+
+        def close(depth):
+            while len(spans) > depth:
+                label, start, end = spans.pop()
+                out.append({"name": label, "cat": "page", "ph": "X", "pid": pid, "tid": tid,
+                            "ts": _micros(start - _epoch), "dur": _micros(end - start)})
+
+        for command, start, seconds, callers, _ in sorted(thread_events, key=lambda e: e[1]):
+            shared = 0
+            while shared < min(len(spans), len(callers)) and spans[shared][0] == callers[shared]:
+                shared += 1
+            close(shared)
+            spans.extend([label, start, start] for label in callers[shared:])
+            for span in spans:
+                span[2] = start + seconds
+            out.append({"name": command, "cat": "webdriver", "ph": "X", "pid": pid, "tid": tid,
+                        "ts": _micros(start - _epoch), "dur": _micros(seconds),
+                        "args": {"caller": " > ".join(callers) or NO_CALLER}})
+        close(0)
+    return out
+
+
+def folded_stacks(events, root):
+    """Brendan Gregg's folded format, weighted in microseconds."""
+    root = root.replace(";", ",").replace(" ", "_")
+    weights = Counter()
+    for command, _, seconds, callers, _ in events:
+        weights[";".join((root,) + callers + (command,))] += int(seconds * 1e6)
+    return "".join(f"{stack} {micros}\n" for stack, micros in sorted(weights.items()))
+
+
+def flush_test_trace(test_id):
+    """Write the events recorded since the last flush as ``test_id``'s trace.
+
+    Returns the Chrome trace path, or ``None`` when nothing was written.
+    """
+    with _lock:
+        events = _events[:]
+        del _events[:]
+    trace_dir = os.environ.get("PYSELE_TRACE_DIR")
+    if not trace_dir or not events:
+        return None
+    os.makedirs(trace_dir, exist_ok=True)
+    base = os.path.join(trace_dir, re.sub(r"[^\w.-]+", "_", test_id).strip("_"))
+    with open(f"{base}.trace.json", "w") as f:
+        json.dump({"traceEvents": chrome_trace_events(events), "displayTimeUnit": "ms",
+                   "otherData": {"test": test_id}}, f)
+    with open(f"{base}.folded", "w") as f:
+        f.write(folded_stacks(events, test_id))
+    return f"{base}.trace.json"
+
+
+def command_totals():
+    with _lock:
+        return [
+            {"caller": caller, "command": command, "count": count, "total": total, "max": worst}
+            for (caller, command), (count, total, worst) in _totals.items()
+        ]
+
+
+def merge_command_totals(paths):
+    """Combine totals files written by several processes."""
+    merged = {}
+    for path in paths:
+        try:
+            with open(path) as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for row in rows:
+            key = (row["caller"], row["command"])
+            if key not in merged:
+                merged[key] = dict(row)
+                continue
+            merged[key]["count"] += row["count"]
+            merged[key]["total"] += row["total"]
+            merged[key]["max"] = max(merged[key]["max"], row["max"])
+    return list(merged.values())
+
+
+def slowest_commands(rows=None, limit=15):
+    rows = command_totals() if rows is None else rows
+    return sorted(rows, key=lambda row: row["total"], reverse=True)[:limit]
+
+
+def format_slowest_commands(rows):
+    lines = [f"{'total s':>9} {'count':>6} {'mean ms':>9} {'max ms':>9}  command  (caller)"]
+    for row in rows:
+        lines.append(
+            f"{row['total']:9.3f} {row['count']:6d} {row['total'] / row['count'] * 1000:9.1f} "
+            f"{row['max'] * 1000:9.1f}  {row['command']}  ({row['caller']})"
+        )
+    return "\n".join(lines)
+
+
+def totals_files(trace_dir):
+    return glob.glob(os.path.join(trace_dir, "commands-*.json"))
+
+
+@atexit.register
+def _write_at_exit():
+    trace_dir = os.environ.get("PYSELE_TRACE_DIR")
+    if not trace_dir:
+        return
+    flush_test_trace(f"process-{os.getpid()}")
+    rows = command_totals()
+    if rows:
+        os.makedirs(trace_dir, exist_ok=True)
+        with open(os.path.join(trace_dir, f"commands-{os.getpid()}.json"), "w") as f:
+            json.dump(rows, f)
@@ -0,0 +1,271 @@
+"""Streaming, parallel execution of data-driven test rows.
+
+``run_csv`` reads a CSV file lazily and hands each row to ``task(driver,
+row)`` on a bounded pool of worker threads. Every worker leases a warm driver
+from a ``DriverPool`` per row, so browsers are reused and reset between rows
+rather than started per row. Results are appended to a JSONL file as they
+complete, one line per row, either in input order (the default) or in
+completion order. At most ``max_in_flight`` rows are read ahead of the last
+written result, so memory stays flat however large the file is.
+
+CSV runs with an output file also keep a checkpoint (see
+``cobaTest.utils.checkpoint``); ``resume=True`` picks up after the rows a
+previous, interrupted run already finished.
+"""
+import collections
+import contextlib
+import csv
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import traceback
+
+from cobaTest.utils.checkpoint import Checkpoint, iter_csv_rows_from
+from cobaTest.utils.driver_factory import DriverPool
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def resume_requested():
+    """Whether CSV runs should resume from their checkpoints (``--resume``)."""
+    return os.environ.get("PYSELE_RESUME") == "1"
+
+
+def iter_csv_rows(path):
+    """Yield the rows of a CSV file as dicts, one at a time."""
+    with open(path, newline="") as f:
+        yield from csv.DictReader(f)
+
+
+class ThreadLocalPool:
+    """``DriverPool``-like leasing of one long-lived object per worker thread.
+
+    For rows that need a client rather than a browser, e.g. an API client.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+        self._instances = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def lease(self):
+        instance = getattr(self._local, "instance", None)
+        if instance is None:
+            instance = self._local.instance = self._factory()
+            with self._lock:
+                self._instances.append(instance)
+        yield instance
+
+    def close(self):
+        with self._lock:
+            instances, self._instances = self._instances, []
+        for instance in instances:
+            close = getattr(instance, "close", None) or getattr(instance, "quit", None)
+            if close is not None:
+                close()
+
+
+class _ResultWriter:
+    """Writes results to JSONL, holding back out-of-order ones if asked.
+
+    ``on_written`` runs for every record, even once writing has failed: the
+    first error is kept in ``error`` and later records are only counted off,
+    so the run drains instead of blocking on rows that can never be written.
+    """
+
+    def __init__(self, out, ordered, on_written, checkpoint=None):
+        self.out = out
+        self.ordered = ordered
+        self.on_written = on_written
+        self.checkpoint = checkpoint
+        self.dispatched = collections.deque()  # indices in input order
+        self.pending = {}
+        self.error = None
+        self.lock = threading.Lock()
+
+    def dispatch(self, index, end_offset):
+        with self.lock:
+            self.dispatched.append((index, end_offset))
+
+    def add(self, record):
+        with self.lock:
+            if not self.ordered:
+                self.dispatched.remove(next(item for item in self.dispatched if item[0] == record["index"]))
+                self._write(record)
+                return
+            self.pending[record["index"]] = record
+            while self.dispatched and self.dispatched[0][0] in self.pending:
+                index, _ = self.dispatched.popleft()
+                self._write(self.pending.pop(index))
+
+    def _write(self, record):
+        end_offset = record.pop("_end_offset", None)
+        try:
+            if self.error is not None:
+                return
+            if self.out is not None:
+                self.out.write(json.dumps(record, default=str) + "\n")
+                self.out.flush()
+            if self.checkpoint is not None:
+                # Only after the result line is out, so a checkpointed row always
+                # has its result on disk.
+                self.checkpoint.record(record["index"], end_offset, record["status"] == "passed")
+        except Exception as e:
+            logger.error(f"Could not write the result of row {record['index']}: {e}")
+            self.error = e
+        finally:
+            self.on_written()
+
+
+def _open_output(output_path, append):
+    if not output_path:
+        return None
+    if append and os.path.exists(output_path):
+        out = open(output_path, "a+")
+        out.seek(0, os.SEEK_END)
+        if out.tell():
+            out.seek(out.tell() - 1)
+            if out.read(1) != "\n":
+                out.write("\n")  # close off a line torn by the crash
+        return out
+    return open(output_path, "w")
+
+
+def _run(items, task, concurrency=2, output_path=None, ordered=True, headless=False,
+         pool=None, max_in_flight=None, checkpoint=None, append=False):
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool(size=concurrency, headless=headless)
+    max_in_flight = max_in_flight or concurrency * 4
+    in_flight = threading.BoundedSemaphore(max_in_flight)
+    work = queue.Queue(maxsize=concurrency)
+    counts = {"passed": 0, "failed": 0}
+    counts_lock = threading.Lock()
+
+    def worker():
+        while True:
+            item = work.get()
+            if item is _DONE:
+                return
+            index, row, end_offset = item
+            start = time.perf_counter()
+            record = {"index": index, "row": row, "status": "failed"}
+            if checkpoint is not None:
+                record["_end_offset"] = end_offset
+            try:
+                with pool.lease() as driver:
+                    record["result"] = task(driver, row)
+                record["status"] = "passed"
+            except Exception as e:
+                logger.error(f"Row {index} failed: {e}")
+                record["error"] = f"{type(e).__name__}: {e}"
+                record["traceback"] = traceback.format_exc()
+            finally:
+                # Every dispatched row must reach the writer, or an ordered
+                # run waits for it (and its in-flight slot) forever.
+                record["seconds"] = round(time.perf_counter() - start, 3)
+                with counts_lock:
+                    counts[record["status"]] += 1
+                writer.add(record)
+
+    out = _open_output(output_path, append)
+    if out is not None and checkpoint is not None:
+        checkpoint.sync_first(out)
+    writer = _ResultWriter(out, ordered, in_flight.release, checkpoint)
+    threads = [threading.Thread(target=worker, name=f"data-driven-{i}", daemon=True) for i in range(concurrency)]
+    start = time.perf_counter()
+    total = 0
+    try:
+        for thread in threads:
+            thread.start()
+        try:
+            for index, row, end_offset in items:
+                in_flight.acquire()
+                if writer.error is not None:
+                    in_flight.release()
+                    break
+                writer.dispatch(index, end_offset)
+                work.put((index, row, end_offset))
+                total += 1
+        finally:
+            # Also when reading the rows fails: the rows already handed out
+            # must finish before their output file and drivers go away.
+            for _ in threads:
+                work.put(_DONE)
+            for thread in threads:
+                thread.join()
+    finally:
+        if out is not None:
+            if checkpoint is not None:
+                # Before the checkpoint's final fsync, which run_csv does after this.
+                out.flush()
+                os.fsync(out.fileno())
+            out.close()
+        if own_pool:
+            pool.close()
+    if writer.error is not None:
+        raise writer.error
+    seconds = time.perf_counter() - start
+    summary = {
+        "rows": total,
+        "passed": counts["passed"],
+        "failed": counts["failed"],
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(total / seconds, 3) if seconds else 0.0,
+        "concurrency": concurrency,
+        "output": output_path,
+    }
+    logger.info(
+        f"{total} rows in {seconds:.1f}s ({summary['rows_per_sec']} rows/sec, "
+        f"{concurrency} workers): {counts['passed']} passed, {counts['failed']} failed"
+    )
+    return summary
+
+
+def run_rows(rows, task, concurrency=2, output_path=None, ordered=True, headless=False,
+             pool=None, max_in_flight=None):
+    """Run ``task(driver, row)`` for every row and stream the results.
+
+    ``rows`` can be any iterable and is consumed lazily. ``task`` returns a
+    JSON-serializable result; an exception marks the row as failed. ``pool``
+    defaults to a ``DriverPool`` of ``concurrency`` Chrome sessions, closed
+    at the end. Returns a summary with pass/fail counts and rows per second.
+    """
+    return _run(
+        ((index, row, None) for index, row in enumerate(rows)), task, concurrency, output_path,
+        ordered, headless, pool, max_in_flight,
+    )
+
+
+def run_csv(path, task, output_path=None, checkpoint_path=None, resume=False, **kwargs):
+    """``run_rows`` over the rows of a CSV file, streamed from disk.
+
+    With an ``output_path`` the run is checkpointed (by default to
+    ``<output_path>.ckpt``). ``resume=True`` seeks past the finished prefix,
+    skips later rows that already passed and appends to the results file.
+    """
+    if output_path and checkpoint_path is None:
+        checkpoint_path = f"{output_path}.ckpt"
+    if not checkpoint_path:
+        return run_rows(iter_csv_rows(path), task, output_path=output_path, **kwargs)
+
+    checkpoint = Checkpoint(checkpoint_path, path)
+    first, offset, skip = checkpoint.resume_point() if resume else (0, 0, set())
+    if first or skip:
+        logger.info(f"Resuming {path} at row {first}, skipping {len(skip)} rows that already passed")
+    items = (item for item in iter_csv_rows_from(path, offset, first) if item[0] not in skip)
+    checkpoint.start(resume)
+    try:
+        summary = _run(items, task, output_path=output_path, checkpoint=checkpoint, append=resume, **kwargs)
+    finally:
+        checkpoint.close()
+    summary["resumed_from"] = first
+    summary["skipped"] = len(skip)
+    return summary
@@ -0,0 +1,177 @@
+"""Seeded, pre-generated test data.
+
+Every item a ``DataPool`` produces is a pure function of the seed, the kind
+of item and its index, so a run is reproducible from its seed and items are
+never repeated: the pool hands out indices 0, 1, 2, ... per kind, generated
+``batch_size`` at a time. Pet ids are the index run through a bijection of
+``[1, 2**31 - 1]``, so they look random but are unique, and names, usernames
+and comments carry the index.
+
+``bulk(kind, count)`` reserves a block of indices and yields its items
+lazily, for load tests that need millions of unique payloads.
+
+Names come from Faker when it is installed (seeded, so reproducible for a
+given Faker version) and from a small built-in list otherwise.
+"""
+import logging
+import os
+import random
+import threading
+from collections import deque
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+_MASK = (1 << 64) - 1
+_ID_MODULUS = (1 << 31) - 1  # prime, so index * multiplier is a bijection
+_VOCABULARY_SIZE = 500
+
+FIRST_NAMES = [
+    "Buddy", "Luna", "Max", "Bella", "Charlie", "Daisy", "Rocky", "Molly", "Coco", "Milo",
+    "Ava", "Noah", "Emma", "Liam", "Mia", "Ethan", "Zoe", "Leo", "Nora", "Owen",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Tan", "Garcia", "Kim", "Nguyen", "Brown", "Lee", "Wilson", "Santos",
+]
+PET_CATEGORIES = [{"id": 1, "name": "Dogs"}, {"id": 2, "name": "Cats"}, {"id": 3, "name": "Birds"}]
+PET_TAGS = [{"id": 1, "name": "friendly"}, {"id": 2, "name": "trained"}, {"id": 3, "name": "young"},
+            {"id": 4, "name": "vaccinated"}]
+PET_STATUSES = ["available", "pending", "sold"]
+FACILITIES = ["Tokyo CURA Healthcare Center", "Hongkong CURA Healthcare Center", "Seoul CURA Healthcare Center"]
+PROGRAMS = ["Medicare", "Medicaid", "None"]
+KINDS = ("pet", "user", "appointment")
+
+
+def _mix(x):
+    """splitmix64: a cheap, well-distributed 64-bit hash."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def _vocabulary(seed):
+    try:
+        from faker import Faker
+    except ImportError:
+        return FIRST_NAMES, LAST_NAMES
+    fake = Faker()
+    fake.seed_instance(seed)
+    first = sorted({fake.first_name() for _ in range(_VOCABULARY_SIZE)})
+    last = sorted({fake.last_name() for _ in range(_VOCABULARY_SIZE)})
+    return first, last
+
+
+def default_seed():
+    """``PYSELE_DATA_SEED`` if set, otherwise a fresh random seed."""
+    seed = os.environ.get("PYSELE_DATA_SEED")
+    return int(seed) if seed else random.SystemRandom().randrange(1 << 32)
+
+
+class DataPool:
+    def __init__(self, seed=None, batch_size=500):
+        self.seed = default_seed() if seed is None else seed
+        self.batch_size = batch_size
+        self._streams = {kind: _mix(self.seed * 31 + i) for i, kind in enumerate(KINDS)}
+        self._id_multiplier = 1 + _mix(self.seed) % (_ID_MODULUS - 1)
+        self._id_offset = _mix(self.seed ^ 0x5EED) % _ID_MODULUS
+        self._first_names, self._last_names = _vocabulary(self.seed)
+        self._next_index = dict.fromkeys(KINDS, 0)
+        self._batches = {kind: deque() for kind in KINDS}
+        self._lock = threading.Lock()
+        logger.info(f"DataPool seed {self.seed} (set PYSELE_DATA_SEED to reproduce)")
+
+    def _hash(self, kind, index):
+        return _mix(self._streams[kind] + index)
+
+    def pet_id_at(self, index):
+        return 1 + (index * self._id_multiplier + self._id_offset) % _ID_MODULUS
+
+    def pet_at(self, index):
+        h = self._hash("pet", index)
+        pet_id = self.pet_id_at(index)
+        tags = PET_TAGS[(h >> 24) % len(PET_TAGS):][:(h >> 28) % 3]
+        return {
+            "id": pet_id,
+            "name": f"{self._first_names[h % len(self._first_names)]} {index:x}",
+            "category": dict(PET_CATEGORIES[(h >> 16) % len(PET_CATEGORIES)]),
+            "photoUrls": [f"https://example.com/pets/{pet_id}/{i}.jpg" for i in range(1 + (h >> 32) % 2)],
+            "tags": [dict(tag) for tag in tags],
+            "status": PET_STATUSES[(h >> 40) % len(PET_STATUSES)],
+        }
+
+    def user_at(self, index):
+        h = self._hash("user", index)
+        first = self._first_names[h % len(self._first_names)]
+        last = self._last_names[(h >> 16) % len(self._last_names)]
+        username = f"{first}.{last}.{index:x}".lower().replace(" ", "")
+        return {
+            "id": self.pet_id_at(index) ^ 0x40000000,
+            "username": username,
+            "firstName": first,
+            "lastName": last,
+            "email": f"{username}@example.com",
+            "password": f"pw-{h >> 32:08x}",
+            "phone": f"08{h % 10 ** 10:010d}",
+            "userStatus": 1,
+        }
+
+    def appointment_at(self, index):
+        h = self._hash("appointment", index)
+        visit = date(2030, 1, 1) + timedelta(days=h % 3650)
+        return {
+            "facility": FACILITIES[(h >> 16) % len(FACILITIES)],
+            "readmission": bool((h >> 20) & 1),
+            "healthcare_program": PROGRAMS[(h >> 24) % len(PROGRAMS)],
+            "visit_date": visit.strftime("%d/%m/%Y"),
+            "comment": f"Data pool appointment {index:x}",
+        }
+
+    def _generate(self, kind, index):
+        return getattr(self, f"{kind}_at")(index)
+
+    def _reserve(self, kind, count):
+        start = self._next_index[kind]
+        self._next_index[kind] = start + count
+        return start
+
+    def _take(self, kind):
+        with self._lock:
+            batch = self._batches[kind]
+            if not batch:
+                start = self._reserve(kind, self.batch_size)
+                batch.extend(self._generate(kind, i) for i in range(start, start + self.batch_size))
+            return batch.popleft()
+
+    def pet(self, **overrides):
+        """The next unused pet, as a dict matching the Pet model."""
+        return {**self._take("pet"), **overrides}
+
+    def user(self, **overrides):
+        return {**self._take("user"), **overrides}
+
+    def appointment(self, **overrides):
+        """The next unused CURA appointment config for ``book_appointment``."""
+        return {**self._take("appointment"), **overrides}
+
+    def bulk(self, kind, count):
+        """Lazily yield ``count`` unused items of ``kind``, generated on demand."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown kind {kind!r}; choose from {KINDS}")
+        with self._lock:
+            start = self._reserve(kind, count)
+        generate = getattr(self, f"{kind}_at")
+        return (generate(i) for i in range(start, start + count))
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def default_pool():
+    """A process-wide pool, seeded from ``PYSELE_DATA_SEED`` when set."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = DataPool()
+        return _default_pool
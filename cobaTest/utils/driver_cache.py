@@ -0,0 +1,131 @@
+"""Resolution cache for WebDriver binaries.
+
+``ChromeDriverManager().install()`` asks the network for the latest matching
+driver on every call. Here the resolved binary path is remembered per
+(browser, installed browser version, platform): in memory for the rest of the
+process and in a JSON file shared by every process on the machine. Entries
+expire after ``PYSELE_DRIVER_CACHE_TTL`` seconds (default one day); with
+``PYSELE_DRIVER_OFFLINE=1`` the network is never touched and stale entries or
+a driver already on ``PATH`` are used instead.
+"""
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import threading
+import time
+
+from cobaTest.utils.paths import cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60
+DRIVER_NAMES = {"chrome": "chromedriver", "firefox": "geckodriver"}
+
+_resolved = {}
+_lock = threading.Lock()
+
+
+def _cache_file():
+    return os.path.join(cache_dir(), "drivers.json")
+
+
+def _browser_version(browser):
+    # Reads the version from the local browser binary; no network involved.
+    try:
+        from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+        browser_type = ChromeType.GOOGLE if browser == "chrome" else browser
+        return OperationSystemManager().get_browser_version_from_os(browser_type)
+    except Exception as e:
+        logger.debug(f"Could not detect {browser} version: {e}")
+        return None
+
+
+def _cache_key(browser):
+    version = _browser_version(browser) or "unknown"
+    return f"{browser}|{version}|{sys.platform}-{platform.machine()}"
+
+
+def _load_entries():
+    try:
+        with open(_cache_file()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_entry(key, path):
+    # Re-read before writing so concurrent processes don't drop each other's
+    # entries; os.replace keeps the file whole for readers.
+    entries = _load_entries()
+    entries[key] = {"path": path, "resolved_at": time.time()}
+    target = _cache_file()
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _install(browser):
+    if browser == "chrome":
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        return ChromeDriverManager().install()
+    if browser == "firefox":
+        from webdriver_manager.firefox import GeckoDriverManager
+
+        return GeckoDriverManager().install()
+    raise ValueError(f"Unsupported browser: {browser}")
+
+
+def resolve_driver_path(browser="chrome", ttl=None, offline=None):
+    """Return the driver binary for ``browser``, resolving over the network
+    only when no fresh cached entry exists.
+
+    Returns ``None`` when running offline with nothing cached or on ``PATH``;
+    Selenium then falls back to its own driver lookup.
+    """
+    if ttl is None:
+        ttl = float(os.environ.get("PYSELE_DRIVER_CACHE_TTL", DEFAULT_TTL))
+    if offline is None:
+        offline = os.environ.get("PYSELE_DRIVER_OFFLINE") == "1"
+
+    with _lock:
+        if browser in _resolved:
+            return _resolved[browser]
+
+        key = _cache_key(browser)
+        entry = _load_entries().get(key)
+        cached_path = entry["path"] if entry and os.path.isfile(entry["path"]) else None
+        fresh = cached_path and time.time() - entry["resolved_at"] < ttl
+
+        if fresh or (offline and cached_path):
+            path = cached_path
+        elif offline:
+            path = shutil.which(DRIVER_NAMES[browser])
+            if path is None:
+                logger.warning(f"Offline and no cached {DRIVER_NAMES[browser]}; deferring to Selenium Manager")
+        else:
+            try:
+                path = _install(browser)
+            except Exception as e:
+                if not cached_path:
+                    raise
+                logger.warning(f"Driver lookup failed ({e}); using stale cached {cached_path}")
+                path = cached_path
+            else:
+                try:
+                    _store_entry(key, path)
+                except OSError as e:
+                    # The driver is installed; only the next run's shortcut is lost.
+                    logger.warning(f"Could not cache the {DRIVER_NAMES[browser]} path: {e}")
+
+        _resolved[browser] = path
+        return path
@@ -1,17 +1,262 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
 from selenium import webdriver
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from cobaTest.utils.command_trace import trace_commands, tracing_enabled
+from cobaTest.utils.driver_cache import resolve_driver_path
+from cobaTest.utils.network_policy import (
+    apply_resource_policy,
+    enable_performance_log,
+    reapply_resource_policy,
+    resolve_policy,
+)
+from cobaTest.utils.profile_template import PROFILE_ARGS, attach_clone, clone_profile, remove_clone
+from cobaTest.utils.startup_timing import StartupTiming
+
+logger = logging.getLogger(__name__)
 
-def get_driver(headless=False):
+
+def get_driver(headless=False, profile_template=None, resource_policy=None, page_load_strategy=None):
+    if page_load_strategy is None:
+        page_load_strategy = os.environ.get("PYSELE_PAGE_LOAD_STRATEGY", "normal")
+    if profile_template is None:
+        profile_template = os.environ.get("PYSELE_PROFILE_TEMPLATE") == "1"
+    if resource_policy is None:
+        resource_policy = os.environ.get("PYSELE_RESOURCE_POLICY") or None
+    resource_policy = resolve_policy(resource_policy)
     chrome_options = Options()
+    # "eager" returns at DOMContentLoaded and "none" right after the response;
+    # page objects then wait for their own READY_WHEN conditions.
+    chrome_options.page_load_strategy = page_load_strategy
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--incognito")
-    if headless:
+    profile_dir = None
+    if profile_template:
+        # A cloned, already-initialized profile replaces incognito's fresh one.
+        profile_dir = clone_profile()
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        for arg in PROFILE_ARGS:
+            chrome_options.add_argument(arg)
+    else:
+        chrome_options.add_argument("--incognito")
+    # Parallel runners force headless for every worker without touching tests.
+    if headless or os.environ.get("PYSELE_HEADLESS") == "1":
         chrome_options.add_argument("--headless")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
\ No newline at end of file
+    if resource_policy is not None:
+        enable_performance_log(chrome_options)
+    timing = StartupTiming("chrome", chrome_options.arguments + [f"pageLoadStrategy={page_load_strategy}"])
+    with timing.measure("resolve_driver"):
+        service = Service(resolve_driver_path("chrome"))
+    timing.instrument_service(service)
+    start = time.perf_counter()
+    try:
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    except Exception:
+        if profile_dir:
+            remove_clone(profile_dir)
+        raise
+    timing.record("session_create", time.perf_counter() - start - timing.phases.get("service_start", 0.0))
+    if tracing_enabled():
+        trace_commands(driver)
+    timing.instrument_first_navigation(driver)
+    if profile_dir:
+        attach_clone(driver, profile_dir)
+    if resource_policy is not None:
+        apply_resource_policy(driver, resource_policy)
+    return driver
+
+
+def get_firefox_driver(headless=False):
+    firefox_options = FirefoxOptions()
+    if headless:
+        firefox_options.add_argument("--headless")
+    service = FirefoxService(resolve_driver_path("firefox"))
+    driver = webdriver.Firefox(service=service, options=firefox_options)
+    if tracing_enabled():
+        trace_commands(driver)
+    return driver
+
+
+def is_driver_healthy(driver):
+    """Cheap liveness probe: one script round trip to the browser."""
+    try:
+        return driver.execute_script("return 1") == 1
+    except WebDriverException:
+        return False
+
+
+def reset_driver(driver):
+    """Bring a live session back to a clean state without restarting Chrome.
+
+    Dismisses a pending alert, drops every window except a fresh blank tab
+    (which also discards sessionStorage), and clears cookies plus storage for
+    the origin that was last open.
+    """
+    try:
+        driver.switch_to.alert.dismiss()
+    except NoAlertPresentException:
+        pass
+
+    origin = driver.execute_script("return window.location.origin")
+
+    old_handles = driver.window_handles
+    driver.switch_to.new_window("tab")
+    fresh_handle = driver.current_window_handle
+    for handle in old_handles:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(fresh_handle)
+    # URL blocking is per tab, so the fresh tab needs the policy again.
+    reapply_resource_policy(driver)
+
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        if origin and origin.startswith("http"):
+            driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin",
+                {"origin": origin, "storageTypes": "all"},
+            )
+    except (AttributeError, WebDriverException):
+        # Not a Chromium session; fall back to what plain WebDriver offers.
+        driver.delete_all_cookies()
+
+    driver.get("about:blank")
+
+
+class DriverPool:
+    """Keeps warm Chrome sessions around and leases them out one at a time.
+
+    Sessions are reset between leases instead of quit, checked for liveness
+    before being handed out, and recycled after ``max_uses`` leases so a long
+    run does not accumulate browser memory.
+    """
+
+    def __init__(self, size=1, max_uses=25, headless=False, factory=None):
+        self.size = size
+        self.max_uses = max_uses
+        self._factory = factory or (lambda: get_driver(headless=headless))
+        self._idle = []
+        self._uses = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=None):
+        # One deadline for the whole call: every wakeup waits only for what is left.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if not self._idle and self._created >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if (remaining is not None and remaining <= 0) or not self._cond.wait(remaining):
+                        raise TimeoutError("No pooled driver became available")
+                    continue
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._created += 1
+
+            if driver is None:
+                try:
+                    driver = self._factory()
+                except Exception:
+                    self._forget(None)
+                    raise
+                with self._cond:
+                    self._uses[driver] = 0
+                return driver
+
+            if is_driver_healthy(driver):
+                return driver
+            logger.warning("Discarding unhealthy pooled driver")
+            self._discard(driver)
+
+    def release(self, driver):
+        with self._cond:
+            uses = self._uses[driver] = self._uses.get(driver, 0) + 1
+            retire = self._closed or uses >= self.max_uses
+        if retire:
+            self._discard(driver)
+            return
+        # Outside the lock: resetting talks to the browser.
+        try:
+            reset_driver(driver)
+        except WebDriverException as e:
+            logger.warning(f"Failed to reset pooled driver, discarding it: {e}")
+            self._discard(driver)
+            return
+        with self._cond:
+            # close() may have run while the driver was being reset.
+            if not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+        self._discard(driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        self._forget(driver)
+
+    def _forget(self, driver):
+        with self._cond:
+            self._uses.pop(driver, None)
+            self._created -= 1
+            self._cond.notify()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(headless=False):
+    with _pools_lock:
+        pool = _pools.get(headless)
+        if pool is None:
+            pool = _pools[headless] = DriverPool(headless=headless)
+        return pool
+
+
+@contextmanager
+def leased_driver(headless=False):
+    """Borrow a warm driver from the shared per-process pool."""
+    with get_pool(headless).lease() as driver:
+        yield driver
+
+
+@atexit.register
+def _close_pools():
+    for pool in list(_pools.values()):
+        pool.close()
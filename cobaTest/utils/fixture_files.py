@@ -0,0 +1,168 @@
+"""Synthetic binary fixtures, generated once per machine and served from mmap.
+
+Each fixture file is a pure function of its parameters, so it is written once
+under the ``fixtures`` cache directory (see ``cobaTest.utils.paths``), named
+after a hash of those parameters, and reused by every later test and process.
+Writes go to a temporary file and are ``os.replace``d into place, so readers
+never see a partial file. ``mapped(path)`` returns a read-only memoryview
+over an mmap of the file, opened once per process, which ``requests`` accepts
+as file content without copying it into Python objects first.
+
+``large_jpeg`` builds multi-hundred-MB uploads without encoding a big image:
+it takes a small encoded JPEG and pads it with empty APP15 segments after
+the JFIF header. The padding is written as a sparse file, so only the segment
+headers touch the disk, and the result is still a JPEG any decoder accepts.
+``MultipartFile`` streams such a file as a ``multipart/form-data`` body with a
+known length, so the upload never holds the whole body in memory.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+import uuid
+
+from cobaTest.utils.paths import cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump when a generator changes, so files cached by the old one are ignored.
+FORMAT_VERSION = 1
+SEGMENT_MAX = 4 + 0xFFFF - 2  # marker, length field and the largest payload
+APP15 = b"\xff\xef"
+
+_paths = {}
+_views = {}
+_lock = threading.Lock()
+
+
+def _fixture(kind, suffix, params, build):
+    """Path of the cached fixture for ``params``, calling ``build(path)`` if missing."""
+    key = json.dumps({"kind": kind, "version": FORMAT_VERSION, **params}, sort_keys=True)
+    with _lock:
+        path = _paths.get(key)
+        if path is not None:
+            return path
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        path = os.path.join(cache_dir("fixtures"), f"{kind}-{digest}{suffix}")
+        if not os.path.exists(path):
+            # Another process may be building the same file; the pid keeps the
+            # temporary names apart and the last replace wins with equal bytes.
+            tmp = f"{path}.{os.getpid()}.tmp"
+            try:
+                build(tmp)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            logger.info(f"Generated fixture {path} ({os.path.getsize(path)} bytes)")
+        _paths[key] = path
+        return path
+
+
+def image_file(width, height, color="red", fmt="JPEG"):
+    """Path of a solid-colour ``width`` x ``height`` image encoded as ``fmt``."""
+    from PIL import Image
+
+    def build(path):
+        with open(path, "wb") as f:
+            Image.new("RGB", (width, height), color=color).save(f, format=fmt)
+
+    params = {"width": width, "height": height, "color": color, "format": fmt}
+    return _fixture("image", f".{fmt.lower()}", params, build)
+
+
+def _jfif_end(jpeg):
+    # Padding goes after SOI and the APP0 JFIF segment, which readers expect first.
+    if jpeg[:2] != b"\xff\xd8":
+        raise ValueError("Not a JPEG: missing SOI marker")
+    if jpeg[2:4] == b"\xff\xe0":
+        return 4 + int.from_bytes(jpeg[4:6], "big")
+    return 2
+
+
+def large_jpeg(size, width=64, height=64, color="blue"):
+    """Path of a valid JPEG of exactly ``size`` bytes, padded sparsely."""
+    with open(image_file(width, height, color), "rb") as f:
+        base = f.read()
+    padding = size - len(base)
+    if padding < 0 or 0 < padding < 4:
+        raise ValueError(f"size must be {len(base)} or at least {len(base) + 4} bytes, got {size}")
+
+    def build(path):
+        split = _jfif_end(base)
+        segments = -(-padding // SEGMENT_MAX)
+        with open(path, "wb") as f:
+            f.write(base[:split])
+            # Spread the padding evenly so no segment is shorter than its header.
+            for i in range(segments):
+                length = padding // segments + (i < padding % segments)
+                f.write(APP15 + (length - 2).to_bytes(2, "big"))
+                f.seek(length - 4, os.SEEK_CUR)  # left as a hole: zeros, no disk
+            f.write(base[split:])
+
+    params = {"size": size, "width": width, "height": height, "color": color}
+    return _fixture("large-jpeg", ".jpg", params, build)
+
+
+def mapped(path):
+    """Read-only memoryview over an mmap of ``path``, shared for the process."""
+    path = os.path.abspath(path)
+    with _lock:
+        view = _views.get(path)
+        if view is None:
+            with open(path, "rb") as f:
+                # The mapping outlives the file object; it is released at exit.
+                view = _views[path] = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        return view
+
+
+class MultipartFile:
+    """A streamed ``multipart/form-data`` body holding one file and some fields.
+
+    Pass it as ``data=`` with ``headers={"Content-Type": body.content_type}``;
+    ``requests`` sends it with a Content-Length and reads it in chunks, each a
+    slice of the file's mapping.
+    """
+
+    def __init__(self, path, field="file", filename=None, content_type="application/octet-stream",
+                 fields=None, chunk_size=1 << 20):
+        self.view = mapped(path)
+        self.chunk_size = chunk_size
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        head = []
+        for name, value in (fields or {}).items():
+            head.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n')
+        head.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; '
+            f'filename="{filename or os.path.basename(path)}"\r\nContent-Type: {content_type}\r\n\r\n'
+        )
+        self._parts = [
+            memoryview("".join(head).encode()),
+            self.view,
+            memoryview(f"\r\n--{boundary}--\r\n".encode()),
+        ]
+        self._length = sum(part.nbytes for part in self._parts)
+        self._part = 0
+        self._offset = 0
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length
+        while self._part < len(self._parts):
+            part = self._parts[self._part]
+            if self._offset < part.nbytes:
+                chunk = part[self._offset:self._offset + size]
+                self._offset += chunk.nbytes
+                return chunk
+            self._part += 1
+            self._offset = 0
+        return b""
+
+    def __iter__(self):
+        return iter(lambda: self.read(self.chunk_size), b"")
@@ -0,0 +1,493 @@
+"""One shared HTTP transport for every API suite and client.
+
+Every ``requests.Session`` built by ``session()``, plus the module-level
+``get``/``post``/... helpers that replace bare ``requests.post`` calls, is
+mounted on a single process-wide adapter. A connection opened by one test is
+therefore reused by the next instead of paying for a new TCP and TLS
+handshake. Sessions closed by their clients leave the shared pool open.
+
+Knobs, read once when the adapter is first built:
+
+* ``PYSELE_HTTP_POOLS``: hosts to keep pools for (default 10)
+* ``PYSELE_HTTP_POOL_SIZE``: keep-alive connections per host (default 32)
+* ``PYSELE_HTTP_PREWARM``: connections per host that ``prewarm`` opens
+  (default 2, 0 disables)
+* ``PYSELE_HTTP2=1``: speak HTTP/2 through ``httpx`` when it is installed
+  with its ``http2`` extra, otherwise fall back to HTTP/1.1 keep-alive
+
+The adapter counts requests, connections and the time spent connecting, so
+``format_stats()`` can report the connection reuse ratio and roughly how much
+handshake time reuse saved.
+"""
+import logging
+import os
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.client import HTTPMessage
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.certs import where as default_ca_bundle
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+BODY_CHUNK_SIZE = 1 << 20
+PREWARM_TIMEOUT = 10
+
+# Set while prewarm() opens connections on this thread, so they're counted as prewarmed.
+_prewarming = threading.local()
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name) or default)
+
+
+class TransportStats:
+    """Request and connection counters shared by every session on the adapter."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.connections = 0
+            self.prewarmed = 0
+            self.connect_seconds = 0.0
+
+    def request(self):
+        with self._lock:
+            self.requests += 1
+
+    def connected(self, seconds, prewarm=False):
+        with self._lock:
+            self.connections += 1
+            self.prewarmed += prewarm
+            self.connect_seconds += seconds
+
+    def snapshot(self):
+        with self._lock:
+            # Prewarmed connections were opened off the critical path, so
+            # only the others count against reuse.
+            on_demand = self.connections - self.prewarmed
+            mean_connect = self.connect_seconds / self.connections if self.connections else 0.0
+            reused = max(self.requests - on_demand, 0)
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "prewarmed": self.prewarmed,
+                "reuse_ratio": reused / self.requests if self.requests else 0.0,
+                "mean_connect_ms": mean_connect * 1000,
+                "handshake_seconds_saved": reused * mean_connect,
+            }
+
+
+stats = TransportStats()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    default_socket_options = SOCKET_OPTIONS
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        stats.connected(time.perf_counter() - start, getattr(_prewarming, "active", False))
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    default_socket_options = SOCKET_OPTIONS
+
+    def connect(self):
+        # Covers the TCP connect and the TLS handshake.
+        start = time.perf_counter()
+        super().connect()
+        stats.connected(time.perf_counter() - start, getattr(_prewarming, "active", False))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class SharedAdapter(HTTPAdapter):
+    """``HTTPAdapter`` with timed connections and a pool that outlives sessions."""
+
+    http2 = False
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        response = super().send(request, *args, **kwargs)
+        if not getattr(_prewarming, "active", False):
+            stats.request()  # only answered requests, so failures don't count as reuse
+        return response
+
+    def close(self):
+        # Session.close() closes every mounted adapter; the pool is shared.
+        pass
+
+    def shutdown(self):
+        super().close()
+
+    def prewarm(self, url, barrier=None):
+        # A HEAD request sent the way sessions send theirs lands in the same
+        # pool and leaves its connection there. Parallel calls hold their
+        # response at the barrier so each opens a connection of its own;
+        # failed ones still check in, so the others aren't released early.
+        _prewarming.active = True
+        try:
+            settings = _session_settings(url)
+            try:
+                response = self.send(
+                    requests.Request("HEAD", url).prepare(),
+                    timeout=PREWARM_TIMEOUT,
+                    verify=settings["verify"],
+                    proxies=settings["proxies"],
+                    cert=settings["cert"],
+                )
+            finally:
+                if barrier is not None:
+                    try:
+                        barrier.wait(timeout=PREWARM_TIMEOUT)
+                    except threading.BrokenBarrierError:
+                        pass
+            # Reading the (empty) body returns the connection to the pool;
+            # close() would drop it.
+            response.content
+        finally:
+            _prewarming.active = False
+
+
+class _RawResponse:
+    """What ``requests`` reads from ``Response.raw``: the streamed body, if any, and the headers."""
+
+    def __init__(self, headers, chunks=()):
+        # Sessions pick Set-Cookie headers up from here.
+        self._original_response = type("OriginalResponse", (), {})()
+        self._original_response.msg = HTTPMessage()
+        for name, value in headers:
+            self._original_response.msg[name] = value
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def read(self, amt=None, *args, **kwargs):
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        size = len(self._buffer) if amt is None else min(amt, len(self._buffer))
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def close(self):
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+
+    def release_conn(self):
+        self.close()
+
+
+class Http2Adapter(requests.adapters.BaseAdapter):
+    """Sends ``requests`` requests over ``httpx`` HTTP/2 clients.
+
+    Responses are converted back to ``requests.Response``, so callers can't
+    tell the difference; with ``stream=True`` the body is read as the caller
+    iterates it. TLS and proxy settings are baked into an ``httpx`` client,
+    so there is one client per ``(verify, cert, proxy)`` combination seen.
+    """
+
+    http2 = True
+
+    def __init__(self, pool_connections, pool_maxsize):
+        super().__init__()
+        import httpx
+
+        self._httpx = httpx
+        self._limits = httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                                    max_keepalive_connections=pool_connections * pool_maxsize)
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._connecting = threading.local()
+
+    def _client(self, verify=True, cert=None, proxy=None):
+        key = (verify, tuple(cert) if isinstance(cert, (list, tuple)) else cert, proxy)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                # requests has already resolved the environment's proxies and CA bundle.
+                client = self._httpx.Client(http2=True, limits=self._limits, verify=_ssl_context(verify, cert),
+                                            proxy=proxy, trust_env=False)
+                # Cookies belong to each requests.Session, not to the shared client.
+                client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                self._clients[key] = client
+            return client
+
+    def _trace(self, event, info):
+        # A connection is up after TCP connect for http, after TLS for https.
+        local = self._connecting
+        if event == "connection.connect_tcp.started":
+            local.started = time.perf_counter()
+        elif event == ("connection.start_tls.complete" if local.tls else "connection.connect_tcp.complete"):
+            stats.connected(time.perf_counter() - local.started, getattr(local, "prewarm", False))
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
+
+    def _stream_body(self, r, request):
+        try:
+            yield from r.iter_bytes()
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        finally:
+            r.close()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        self._connecting.tls = request.url.startswith("https:")
+        client = self._client(verify, cert, select_proxy(request.url, proxies or {}))
+        body = request.body
+        if body is not None and not isinstance(body, (bytes, str)):
+            body = _iter_body(body)
+        start = time.perf_counter()
+        try:
+            r = client.send(
+                client.build_request(request.method, request.url, headers=dict(request.headers), content=body,
+                                     timeout=self._timeout(timeout), extensions={"trace": self._trace}),
+                stream=stream,
+            )
+        except self._httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        stats.request()
+        response = requests.Response()
+        response.status_code = r.status_code
+        response.headers = CaseInsensitiveDict(r.headers.multi_items())
+        if stream:
+            response.raw = _RawResponse(r.headers.multi_items(), self._stream_body(r, request))
+        else:
+            response._content = r.content
+            response._content_consumed = True
+            response.raw = _RawResponse(r.headers.multi_items())
+        extract_cookies_to_jar(response.cookies, request, response.raw)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = r.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=time.perf_counter() - start)
+        return response
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        with self._clients_lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+
+    def prewarm(self, url, barrier=None):
+        self._connecting.tls = url.startswith("https:")
+        self._connecting.prewarm = True
+        try:
+            settings = _session_settings(url)
+            client = self._client(settings["verify"], settings["cert"], select_proxy(url, settings["proxies"]))
+            client.request("HEAD", url, timeout=PREWARM_TIMEOUT, extensions={"trace": self._trace})
+        finally:
+            self._connecting.prewarm = False
+
+
+def _session_settings(url):
+    """The ``verify``/``cert``/``proxies`` a session would send ``url`` with, so prewarming uses the same pool."""
+    with requests.Session() as session:
+        return session.merge_environment_settings(url, {}, None, None, None)
+
+
+def _iter_body(body):
+    """Stream a file-like or iterable request body in chunks instead of joining it in memory."""
+    chunks = iter(lambda: body.read(BODY_CHUNK_SIZE), None) if hasattr(body, "read") else body
+    for chunk in chunks:
+        if not len(chunk):
+            return
+        yield chunk.encode() if isinstance(chunk, str) else bytes(chunk)
+
+
+def _ssl_context(verify, cert):
+    """The ``requests`` ``verify``/``cert`` arguments as an SSL context for ``httpx``."""
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif isinstance(verify, str) and os.path.isdir(verify):
+        context = ssl.create_default_context(capath=verify)
+    else:
+        context = ssl.create_default_context(cafile=verify if isinstance(verify, str) else default_ca_bundle())
+    if isinstance(cert, (list, tuple)):
+        context.load_cert_chain(*cert)
+    elif cert:
+        context.load_cert_chain(cert)
+    return context
+
+
+def _build_adapter():
+    pools = _env_int("PYSELE_HTTP_POOLS", 10)
+    pool_size = _env_int("PYSELE_HTTP_POOL_SIZE", 32)
+    if os.environ.get("PYSELE_HTTP2") == "1":
+        try:
+            import h2  # noqa: F401  httpx only negotiates HTTP/2 with it installed
+            import httpx  # noqa: F401
+        except ImportError:
+            logger.warning("PYSELE_HTTP2=1 but httpx[http2] is not installed; using HTTP/1.1 keep-alive")
+        else:
+            return Http2Adapter(pools, pool_size)
+    return SharedAdapter(pool_connections=pools, pool_maxsize=pool_size)
+
+
+_adapter = None
+_default_session = None
+_lock = threading.Lock()
+_session_lock = threading.Lock()
+
+
+def shared_adapter():
+    """The process-wide adapter, built from the environment on first use."""
+    global _adapter
+    with _lock:
+        if _adapter is None:
+            _adapter = _build_adapter()
+        return _adapter
+
+
+def session(headers=None):
+    """A new ``requests.Session`` (own cookies and headers) on the shared pool."""
+    s = requests.Session()
+    adapter = shared_adapter()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    if headers:
+        s.headers.update(headers)
+    return s
+
+
+def _session():
+    global _default_session
+    with _session_lock:
+        if _default_session is None:
+            _default_session = session()
+            # Bare requests.post() keeps no cookies between calls; neither do these.
+            _default_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return _default_session
+
+
+def request(method, url, **kwargs):
+    """Drop-in for ``requests.request`` that reuses pooled connections."""
+    return _session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def prewarm(urls, connections=None):
+    """Open ``connections`` pooled connections to each URL's host in parallel.
+
+    Failures (e.g. no network) are logged and ignored; tests then connect on
+    demand as before. Returns the number of connections opened.
+    """
+    connections = _env_int("PYSELE_HTTP_PREWARM", 2) if connections is None else connections
+    adapter = shared_adapter()
+    # HTTP/2 multiplexes every request to a host on one connection.
+    jobs = [url for url in urls for _ in range(1 if adapter.http2 else connections)]
+    if not jobs:
+        return 0
+    before = stats.snapshot()["prewarmed"]
+    start = time.perf_counter()
+
+    barrier = threading.Barrier(len(jobs))
+
+    def warm(url):
+        try:
+            adapter.prewarm(url, barrier)
+        except Exception as e:
+            logger.debug(f"Could not prewarm {url}: {e}")
+
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="http-prewarm") as executor:
+        list(executor.map(warm, jobs))
+    opened = stats.snapshot()["prewarmed"] - before
+    logger.info(f"Prewarmed {opened} connection(s) in {time.perf_counter() - start:.2f}s")
+    return opened
+
+
+def format_stats():
+    s = stats.snapshot()
+    protocol = "HTTP/2" if _adapter is not None and _adapter.http2 else "HTTP/1.1"
+    return (
+        f"HTTP transport ({protocol}): {s['requests']} requests over {s['connections']} connections "
+        f"({s['prewarmed']} prewarmed), {s['reuse_ratio']:.0%} reused, "
+        f"{s['mean_connect_ms']:.0f} ms per handshake, ~{s['handshake_seconds_saved']:.1f}s of handshakes saved"
+    )
+
+
+class PytestPlugin:
+    """Prewarms the suites' hosts once collection is done and reports reuse at the end."""
+
+    name = "pysele-http-transport"
+
+    def __init__(self):
+        self.urls = []
+
+    def pytest_collection_finish(self, session):
+        if session.items and not session.config.option.collectonly:
+            prewarm(self.urls)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if stats.requests:
+            terminalreporter.write_sep("-", "http transport")
+            terminalreporter.write_line(format_stats())
+
+
+def register_pytest_plugin(config, *urls):
+    """Register the plugin once per run, adding ``urls`` to those it prewarms."""
+    plugin = config.pluginmanager.get_plugin(PytestPlugin.name)
+    if plugin is None:
+        plugin = PytestPlugin()
+        config.pluginmanager.register(plugin, PytestPlugin.name)
+    plugin.urls.extend(url for url in urls if url not in plugin.urls)
@@ -0,0 +1,116 @@
+"""HDR-style latency histograms.
+
+Values (microseconds by default) land in log-linear buckets, the layout
+HdrHistogram uses: every power-of-two range is split into the same number of
+linear sub-buckets. Recording is O(1), memory grows with the number of
+distinct buckets hit rather than the number of samples, and percentiles stay
+within ``10 ** -significant_figures`` relative error however long the tail.
+Histograms from several workers or runs merge by adding counts, and the
+JSON form keeps only the non-empty buckets.
+"""
+import math
+
+
+class LatencyHistogram:
+    def __init__(self, significant_figures=3, unit="us"):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        self.unit = unit
+        # Enough linear sub-buckets that two adjacent ones differ by less than
+        # the requested precision.
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self._half_bits = self._sub_bucket_bits - 1
+        self._half_count = 1 << self._half_bits
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._sum = 0
+
+    def _index(self, value):
+        bucket = max(value.bit_length() - self._sub_bucket_bits, 0)
+        sub_bucket = value >> bucket
+        return (bucket << self._half_bits) + sub_bucket
+
+    def _highest_equivalent(self, index):
+        bucket = max((index >> self._half_bits) - 1, 0)
+        sub_bucket = index - (bucket << self._half_bits)
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def record(self, value, count=1):
+        """Record a non-negative integer value ``count`` times."""
+        value = int(value)
+        if value < 0:
+            raise ValueError(f"Cannot record negative value {value}")
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self._sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("Cannot merge histograms of different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self._sum += other._sum
+        if other.total:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self):
+        return self._sum / self.total if self.total else 0.0
+
+    def percentile(self, percentile):
+        """The value at or below which ``percentile`` percent of samples fall."""
+        if not self.total:
+            return 0
+        rank = max(math.ceil(percentile / 100 * self.total), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def percentiles(self, percentiles=(50, 95, 99, 99.9)):
+        """``{"p50": ..., "p99.9": ...}`` computed in a single pass."""
+        result = {}
+        if not self.total:
+            return {f"p{p:g}": 0 for p in percentiles}
+        ranks = sorted((max(math.ceil(p / 100 * self.total), 1), p) for p in percentiles)
+        seen = 0
+        indices = iter(sorted(self.counts))
+        index = None
+        for rank, p in ranks:
+            while seen < rank:
+                index = next(indices)
+                seen += self.counts[index]
+            result[f"p{p:g}"] = min(self._highest_equivalent(index), self.max)
+        return result
+
+    def to_dict(self):
+        return {
+            "significant_figures": self.significant_figures,
+            "unit": self.unit,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "sum": self._sum,
+            "counts": [[index, count] for index, count in sorted(self.counts.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["significant_figures"], data.get("unit", "us"))
+        histogram.counts = {index: count for index, count in data["counts"]}
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        histogram._sum = data["sum"]
+        return histogram
@@ -0,0 +1,256 @@
+"""Weighted-scenario load generation with HDR latency histograms.
+
+A load run replays ``Scenario`` actions (usually one client call each) for a
+fixed duration, picking each request's scenario by weight from a seeded
+random stream. Two models are supported:
+
+* **Open model** (``rps=...``): requests are *scheduled* at the target
+  arrival rate, evenly spaced or as a Poisson process, and start on schedule
+  whether or not earlier ones have finished. Latency is measured from the
+  scheduled start, so a stalled server shows up as queueing delay in the
+  percentiles instead of silently lowering the request rate (coordinated
+  omission). Arrivals that would exceed ``max_in_flight`` are counted as
+  dropped rather than delayed.
+* **Closed model** (``concurrency=...``): that many workers each send the next
+  request as soon as the previous one completes. Simpler, but its latencies
+  understate queueing; prefer the open model for latency targets.
+
+Actions may be coroutine functions (run on the event loop, e.g. the
+``AsyncPetstore3APIClient`` methods) or plain functions (run on a thread
+pool, e.g. the synchronous clients). An action fails if it raises or returns
+an object whose ``status_code`` is not in the scenario's ``expect``.
+
+``LoadReport`` carries per-scenario and overall histograms, throughput and
+error rates, and renders them as JSON or an HTML table.
+"""
+import asyncio
+import html
+import inspect
+import json
+import logging
+import random
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+
+from cobaTest.utils.latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+class Scenario:
+    def __init__(self, name, action, weight=1, expect=(200,)):
+        self.name = name
+        self.action = action
+        self.weight = weight
+        self.expect = set(expect)
+        self.is_async = inspect.iscoroutinefunction(action)
+
+
+class _ScenarioStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()  # from scheduled start, in microseconds
+        self.service = LatencyHistogram()  # from actual send, in microseconds
+        self.requests = 0
+        self.errors = 0
+        self.error_samples = {}
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.service.merge(other.service)
+        self.requests += other.requests
+        self.errors += other.errors
+        for error, count in other.error_samples.items():
+            self.error_samples[error] = self.error_samples.get(error, 0) + count
+        return self
+
+    def summary(self, seconds):
+        percentiles = self.latency.percentiles(PERCENTILES)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "throughput_rps": self.requests / seconds if seconds else 0.0,
+            "latency_ms": {
+                **{name: value / 1000 for name, value in percentiles.items()},
+                "min": (self.latency.min or 0) / 1000,
+                "mean": self.latency.mean / 1000,
+                "max": (self.latency.max or 0) / 1000,
+            },
+            "service_p99_ms": self.service.percentile(99) / 1000,
+            "top_errors": dict(sorted(self.error_samples.items(), key=lambda item: -item[1])[:5]),
+        }
+
+
+class LoadReport:
+    def __init__(self, config, stats, seconds, dropped):
+        self.config = config
+        self.stats = stats
+        self.seconds = seconds
+        self.dropped = dropped
+        self.overall = _ScenarioStats()
+        for scenario_stats in stats.values():
+            self.overall.merge(scenario_stats)
+
+    def to_dict(self, histograms=True):
+        data = {
+            "config": self.config,
+            "seconds": round(self.seconds, 3),
+            "dropped": self.dropped,
+            "overall": self.overall.summary(self.seconds),
+            "scenarios": {name: s.summary(self.seconds) for name, s in self.stats.items()},
+        }
+        if histograms:
+            data["histograms_us"] = {name: s.latency.to_dict() for name, s in self.stats.items()}
+        return data
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def format_table(self):
+        header = f"{'scenario':<16}{'reqs':>8}{'err%':>7}{'rps':>9}" + "".join(
+            f"{'p' + format(p, 'g'):>10}" for p in PERCENTILES) + f"{'max':>10}"
+        lines = [header, "-" * len(header)]
+        rows = list(self.stats.items()) + [("TOTAL", self.overall)]
+        for name, s in rows:
+            summary = s.summary(self.seconds)
+            latency = summary["latency_ms"]
+            lines.append(
+                f"{name:<16}{summary['requests']:>8}{summary['error_rate']:>7.1%}{summary['throughput_rps']:>9.1f}"
+                + "".join(f"{latency['p' + format(p, 'g')]:>10.1f}" for p in PERCENTILES)
+                + f"{latency['max']:>10.1f}"
+            )
+        if self.dropped:
+            lines.append(f"{self.dropped} arrivals dropped at max_in_flight")
+        return "\n".join(lines)
+
+    def to_html(self):
+        """An HTML fragment (latencies in ms), for pytest-html extras or a standalone page."""
+        columns = ["scenario", "requests", "error rate", "rps"] + [f"p{p:g}" for p in PERCENTILES] + ["max"]
+        rows = []
+        for name, s in list(self.stats.items()) + [("TOTAL", self.overall)]:
+            summary = s.summary(self.seconds)
+            latency = summary["latency_ms"]
+            cells = [html.escape(name), summary["requests"], f"{summary['error_rate']:.2%}",
+                     f"{summary['throughput_rps']:.1f}"]
+            cells += [f"{latency[f'p{p:g}']:.1f}" for p in PERCENTILES] + [f"{latency['max']:.1f}"]
+            rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+        config = html.escape(", ".join(f"{key}={value}" for key, value in self.config.items()))
+        return (
+            f"<div class=\"load-report\"><p>Load run: {config}; {self.seconds:.1f}s, "
+            f"{self.dropped} dropped. Latencies in ms.</p>"
+            "<table border=\"1\" cellpadding=\"4\"><tr>"
+            + "".join(f"<th>{html.escape(column)}</th>" for column in columns)
+            + "</tr>" + "".join(rows) + "</table></div>"
+        )
+
+    def write_html(self, path):
+        with open(path, "w") as f:
+            f.write(f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Load report</title></head>"
+                    f"<body>{self.to_html()}</body></html>")
+        return path
+
+
+class LoadGenerator:
+    def __init__(self, scenarios, client=None, seed=None, max_in_flight=10000, threads=64):
+        if not scenarios:
+            raise ValueError("At least one scenario is required")
+        self.scenarios = list(scenarios)
+        self.client = client
+        self.seed = random.randrange(1 << 32) if seed is None else seed
+        self.max_in_flight = max_in_flight
+        self.threads = threads
+        self._cumulative = list(accumulate(s.weight for s in self.scenarios))
+
+    def _pick(self, rng):
+        return self.scenarios[bisect_right(self._cumulative, rng.random() * self._cumulative[-1])]
+
+    async def _call(self, scenario, stats, executor, scheduled_ns):
+        loop = asyncio.get_running_loop()
+        sent_ns = time.perf_counter_ns()
+        error = None
+
+        def send():
+            nonlocal sent_ns
+            # Once a pool thread picks it up; time waiting for one is queueing.
+            sent_ns = time.perf_counter_ns()
+            return scenario.action(self.client)
+
+        try:
+            if scenario.is_async:
+                result = await scenario.action(self.client)
+            else:
+                result = await loop.run_in_executor(executor, send)
+            status = getattr(result, "status_code", None)
+            if status is not None and status not in scenario.expect:
+                error = f"HTTP {status}"
+        except Exception as e:
+            error = type(e).__name__
+        done_ns = time.perf_counter_ns()
+        stats.requests += 1
+        stats.latency.record((done_ns - scheduled_ns) // 1000)
+        stats.service.record((done_ns - sent_ns) // 1000)
+        if error is not None:
+            stats.errors += 1
+            stats.error_samples[error] = stats.error_samples.get(error, 0) + 1
+
+    async def run(self, duration, rps=None, concurrency=None, arrival="constant"):
+        """Run for ``duration`` seconds at ``rps`` (open model) or ``concurrency`` (closed model)."""
+        if (rps is None) == (concurrency is None):
+            raise ValueError("Pass exactly one of rps or concurrency")
+        if arrival not in ("constant", "poisson"):
+            raise ValueError(f"Unknown arrival process {arrival!r}")
+        rng = random.Random(self.seed)
+        stats = {s.name: _ScenarioStats() for s in self.scenarios}
+        executor = ThreadPoolExecutor(max_workers=concurrency or self.threads, thread_name_prefix="load")
+        config = {"duration": duration, "seed": self.seed}
+        start_ns = time.perf_counter_ns()
+        end_ns = start_ns + int(duration * 1e9)
+        dropped = 0
+        try:
+            if rps is not None:
+                config.update(model="open", rps=rps, arrival=arrival)
+                dropped = await self._open(rng, stats, executor, rps, arrival, start_ns, end_ns)
+            else:
+                config.update(model="closed", concurrency=concurrency)
+                await self._closed(rng, stats, executor, concurrency, end_ns)
+        finally:
+            executor.shutdown(wait=False)
+        report = LoadReport(config, stats, (time.perf_counter_ns() - start_ns) / 1e9, dropped)
+        logger.info(f"Load run finished: {report.overall.requests} requests, {report.overall.errors} errors")
+        return report
+
+    async def _open(self, rng, stats, executor, rps, arrival, start_ns, end_ns):
+        interval_ns = 1e9 / rps
+        in_flight = set()
+        dropped = 0
+        scheduled_ns = start_ns
+        while scheduled_ns < end_ns:
+            # Sleeping even when behind schedule lets in-flight requests progress.
+            await asyncio.sleep(max((scheduled_ns - time.perf_counter_ns()) / 1e9, 0))
+            scenario = self._pick(rng)
+            if len(in_flight) >= self.max_in_flight:
+                dropped += 1
+            else:
+                # The scheduled time, not "now", is the request's start: a late
+                # sender must not hide the delay from the latency.
+                task = asyncio.ensure_future(self._call(scenario, stats[scenario.name], executor, int(scheduled_ns)))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            scheduled_ns += rng.expovariate(1.0) * interval_ns if arrival == "poisson" else interval_ns
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        return dropped
+
+    async def _closed(self, rng, stats, executor, concurrency, end_ns):
+        async def worker():
+            while time.perf_counter_ns() < end_ns:
+                scenario = self._pick(rng)
+                await self._call(scenario, stats[scenario.name], executor, time.perf_counter_ns())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
@@ -0,0 +1,260 @@
+"""Resolution-time benchmark for every page-object locator.
+
+Discovers the ``(By, value)`` class attributes in ``cobaTest.pages``, loads
+saved DOM snapshots of the CURA pages into a headless Chrome and times each
+locator the way the tests resolve it: ``driver.find_element`` round trips,
+interleaved with those of alternative selectors that resolve to the same
+node. The fastest alternative is suggested when its median round trip beats
+the current locator's by ``SPEEDUP_THRESHOLD``. The time the in-page
+``pyseleFind`` shim (used by the batched reads and waits) takes over many
+iterations is reported as a second column.
+
+    python -m cobaTest.utils.locator_benchmark --capture --iterations 2000
+"""
+import glob
+import importlib
+import inspect
+import json
+import logging
+import os
+import pathlib
+import pkgutil
+import statistics
+import time
+
+from selenium.webdriver.common.by import By
+
+from cobaTest.pages.js_locators import FIND_JS
+from cobaTest.utils.paths import cache_dir
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://katalon-demo-cura.herokuapp.com/"
+STRATEGIES = {value for name, value in vars(By).items() if name.isupper()}
+# Round trips are dominated by the WebDriver HTTP hop, so a modest ratio
+# already means a real difference in how the browser resolves the locator.
+SPEEDUP_THRESHOLD = 1.25
+SAMPLE_BOOKING = {
+    "facility": "Hongkong CURA Healthcare Center",
+    "readmission": True,
+    "healthcare_program": "Medicaid",
+    "visit_date": "01/01/2030",
+    "comment": "Locator benchmark snapshot",
+}
+
+BENCHMARK_JS = FIND_JS + """
+var by = arguments[0], value = arguments[1], iterations = arguments[2];
+var node = pyseleFind(by, value);
+if (!node) return null;
+
+function timeLocator(b, v) {
+    var start = performance.now();
+    for (var i = 0; i < iterations; i++) pyseleFind(b, v);
+    return (performance.now() - start) * 1000 / iterations;
+}
+function cssPath(el, stop) {
+    var parts = [];
+    while (el && el !== stop) {
+        var tag = el.tagName.toLowerCase(), index = 1;
+        for (var s = el.previousElementSibling; s; s = s.previousElementSibling) {
+            if (s.tagName === el.tagName) index++;
+        }
+        parts.unshift(tag + ":nth-of-type(" + index + ")");
+        el = el.parentElement;
+    }
+    return parts.join(" > ");
+}
+
+var tag = node.tagName.toLowerCase(), candidates = [];
+if (node.id) {
+    candidates.push(["id", node.id]);
+    candidates.push(["css selector", "#" + CSS.escape(node.id)]);
+}
+var name = node.getAttribute("name");
+if (name) candidates.push(["name", name]);
+if (node.classList.length) {
+    candidates.push(["css selector", tag + "." + Array.prototype.map.call(node.classList, CSS.escape).join(".")]);
+    candidates.push(["class name", node.classList[0]]);
+}
+candidates.push(["tag name", tag]);
+var anchor = node.parentElement;
+while (anchor && !anchor.id) anchor = anchor.parentElement;
+if (anchor) {
+    candidates.push(["css selector", "#" + CSS.escape(anchor.id) + " " + tag]);
+    candidates.push(["css selector", "#" + CSS.escape(anchor.id) + " > " + cssPath(node, anchor)]);
+}
+
+var results = [[by, value, timeLocator(by, value)]];
+for (var i = 0; i < candidates.length; i++) {
+    var c = candidates[i];
+    if (c[0] === by && c[1] === value) continue;
+    try {
+        if (pyseleFind(c[0], c[1]) !== node) continue;
+    } catch (e) {
+        continue;
+    }
+    results.push([c[0], c[1], timeLocator(c[0], c[1])]);
+}
+return results;
+"""
+
+
+def _is_locator(value):
+    return isinstance(value, tuple) and len(value) == 2 and value[0] in STRATEGIES and isinstance(value[1], str)
+
+
+def discover_locators(package="cobaTest.pages"):
+    """``[(Class.ATTR, (By, value))]`` for every page-object class in ``package``."""
+    found = []
+    root = importlib.import_module(package)
+    for info in pkgutil.iter_modules(root.__path__):
+        module = importlib.import_module(f"{package}.{info.name}")
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for attr, value in vars(cls).items():
+                if _is_locator(value):
+                    found.append((f"{class_name}.{attr}", tuple(value)))
+    return found
+
+
+def default_snapshot_dir():
+    return cache_dir("snapshots")
+
+
+def capture_snapshots(driver, snapshot_dir=None, base_url=BASE_URL):
+    """Save the DOM of each CURA page the page objects cover; returns the paths."""
+    from cobaTest.pages.appointment_page import AppointmentPage
+    from cobaTest.pages.confirmation_page import ConfirmationPage
+    from cobaTest.pages.login_page import LoginPage
+
+    snapshot_dir = snapshot_dir or default_snapshot_dir()
+    os.makedirs(snapshot_dir, exist_ok=True)
+    paths = []
+
+    def save(name):
+        path = os.path.join(snapshot_dir, f"{name}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(driver.execute_script("return document.documentElement.outerHTML"))
+        paths.append(path)
+
+    login_page = LoginPage(driver)
+    login_page.open(base_url)
+    save("home")
+    login_page.go_to_login()
+    login_page.wait_for_visible(LoginPage.USERNAME)
+    save("login")
+    login_page.login("John Doe", "ThisIsNotAPassword")
+    appointment_page = AppointmentPage(driver)
+    appointment_page.wait_until_ready()
+    save("appointment")
+    appointment_page.book_appointment(SAMPLE_BOOKING)
+    ConfirmationPage(driver).wait_until_ready()
+    save("confirmation")
+    return paths
+
+
+def _webdriver_ms(driver, locators, runs):
+    """Median ``find_element`` round trip per locator, in milliseconds.
+
+    The locators take turns, so drift in browser or machine load affects
+    them all alike.
+    """
+    timings = [[] for _ in locators]
+    for _ in range(runs):
+        for locator, samples in zip(locators, timings):
+            start = time.perf_counter()
+            driver.find_element(*locator)
+            samples.append((time.perf_counter() - start) * 1000)
+    return [statistics.median(samples) for samples in timings]
+
+
+def benchmark_locators(driver, snapshot_paths, locators=None, iterations=2000, webdriver_runs=20):
+    """Time each locator on every snapshot it matches.
+
+    Returns one result per (locator, snapshot) match, with the median
+    ``find_element`` round trip in milliseconds, the in-page shim's
+    resolution time in microseconds, and the alternatives found for the same
+    node, fastest round trip first.
+    """
+    locators = locators if locators is not None else discover_locators()
+    results = []
+    matched = set()
+    for path in snapshot_paths:
+        driver.get(pathlib.Path(os.path.abspath(path)).as_uri())
+        snapshot = os.path.splitext(os.path.basename(path))[0]
+        for name, locator in locators:
+            timings = driver.execute_script(BENCHMARK_JS, locator[0], locator[1], iterations)
+            if not timings:
+                continue
+            matched.add(name)
+            round_trips = _webdriver_ms(driver, [(by, value) for by, value, _ in timings], webdriver_runs)
+            (_, _, own_us), own_ms = timings[0], round_trips[0]
+            alternatives = sorted(
+                (
+                    {"locator": (by, value), "webdriver_ms": ms, "in_page_us": us}
+                    for (by, value, us), ms in zip(timings[1:], round_trips[1:])
+                ),
+                key=lambda alt: alt["webdriver_ms"],
+            )
+            suggestion = None
+            if alternatives and alternatives[0]["webdriver_ms"] * SPEEDUP_THRESHOLD <= own_ms:
+                suggestion = alternatives[0]
+            results.append({
+                "name": name,
+                "locator": locator,
+                "snapshot": snapshot,
+                "webdriver_ms": own_ms,
+                "in_page_us": own_us,
+                "alternatives": alternatives,
+                "suggestion": suggestion,
+            })
+    for name, locator in locators:
+        if name not in matched:
+            logger.warning(f"{name} {locator} matched no snapshot")
+    return results
+
+
+def format_report(results):
+    lines = [f"{'find ms':>8} {'in-page us':>10}  {'locator':<40} {'snapshot':<12} suggestion"]
+    for result in sorted(results, key=lambda r: r["webdriver_ms"], reverse=True):
+        suggestion = ""
+        if result["suggestion"]:
+            by, value = result["suggestion"]["locator"]
+            speedup = result["webdriver_ms"] / max(result["suggestion"]["webdriver_ms"], 1e-3)
+            suggestion = f"({by!r}, {value!r})  {result['suggestion']['webdriver_ms']:.2f}ms, {speedup:.1f}x faster"
+        lines.append(
+            f"{result['webdriver_ms']:8.2f} {result['in_page_us']:10.2f}  {result['name']:<40} "
+            f"{result['snapshot']:<12} {suggestion}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from cobaTest.utils.driver_factory import get_driver
+
+    parser = argparse.ArgumentParser(description="Benchmark page-object locators against DOM snapshots")
+    parser.add_argument("--snapshots", default=None, help="Snapshot directory (default: pysele cache)")
+    parser.add_argument("--capture", action="store_true", help="Capture fresh snapshots from the live site first")
+    parser.add_argument("--iterations", type=int, default=2000, help="In-page resolutions per locator")
+    parser.add_argument("--webdriver-runs", type=int, default=20, help="find_element round trips per locator and alternative")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full results as JSON")
+    args = parser.parse_args()
+
+    snapshot_dir = args.snapshots or default_snapshot_dir()
+    driver = get_driver(headless=True)
+    try:
+        if args.capture:
+            capture_snapshots(driver, snapshot_dir)
+        paths = sorted(glob.glob(os.path.join(snapshot_dir, "*.html")))
+        if not paths:
+            parser.error(f"No snapshots in {snapshot_dir}; run with --capture")
+        results = benchmark_locators(driver, paths, iterations=args.iterations, webdriver_runs=args.webdriver_runs)
+    finally:
+        driver.quit()
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,193 @@
+"""Resource blocking for Chrome sessions through the DevTools Protocol.
+
+A policy is a set of named presets plus custom URL patterns (``*`` wildcards,
+as understood by ``Network.setBlockedURLs``). Blocked and loaded requests are
+counted from Chrome's performance log, so every session can report how many
+requests were blocked and roughly how many bytes that saved. A blocked URL
+is never downloaded, so its size is taken from an earlier unblocked load in
+this process or, failing that, from the Content-Length of a HEAD request.
+
+``Network.setBlockedURLs`` applies per tab: windows opened later are not
+covered until ``apply_resource_policy`` is called again for them.
+"""
+import json
+import logging
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from selenium.common.exceptions import WebDriverException
+
+from cobaTest.utils import http_transport
+
+logger = logging.getLogger(__name__)
+
+
+def _extensions(*exts):
+    patterns = []
+    for ext in exts:
+        patterns.append(f"*.{ext}")
+        patterns.append(f"*.{ext}?*")
+    return patterns
+
+
+PRESETS = {
+    "images": _extensions("png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp", "avif"),
+    "fonts": _extensions("woff", "woff2", "ttf", "otf", "eot"),
+    "media": _extensions("mp4", "webm", "mp3", "ogg", "wav", "m4a", "mov"),
+    "analytics": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*adservice.google.com*",
+        "*connect.facebook.net*",
+        "*hotjar.com*",
+        "*segment.io*",
+        "*cdn.segment.com*",
+        "*mixpanel.com*",
+    ],
+}
+PRESETS["lean"] = PRESETS["images"] + PRESETS["fonts"] + PRESETS["media"] + PRESETS["analytics"]
+
+
+class ResourcePolicy:
+    def __init__(self, presets=(), patterns=()):
+        unknown = [name for name in presets if name not in PRESETS]
+        if unknown:
+            raise ValueError(f"Unknown resource presets: {unknown}; choose from {sorted(PRESETS)}")
+        self.presets = tuple(presets)
+        self.patterns = tuple(patterns)
+
+    def url_patterns(self):
+        seen = []
+        for name in self.presets:
+            seen.extend(p for p in PRESETS[name] if p not in seen)
+        seen.extend(p for p in self.patterns if p not in seen)
+        return seen
+
+    def __repr__(self):
+        return f"ResourcePolicy(presets={self.presets!r}, patterns={self.patterns!r})"
+
+
+def resolve_policy(spec):
+    """Turn a preset name, comma-separated string, list or policy into a policy.
+
+    List entries that name a preset select it; anything else is taken as a
+    URL pattern.
+    """
+    if spec is None or isinstance(spec, ResourcePolicy):
+        return spec
+    if isinstance(spec, str):
+        spec = [item.strip() for item in spec.split(",") if item.strip()]
+    presets = [item for item in spec if item in PRESETS]
+    patterns = [item for item in spec if item not in PRESETS]
+    return ResourcePolicy(presets, patterns)
+
+
+class _SessionStats:
+    def __init__(self, policy):
+        self.policy = policy
+        self.requests = {}
+        self.blocked_by_type = Counter()
+        self.blocked_requests = 0
+        self.bytes_loaded = 0
+        self.blocked_urls = []
+
+
+_sessions = weakref.WeakKeyDictionary()
+# Sizes of resources seen loading in any session of this process, or learned
+# from HEAD requests; ``None`` when the server wouldn't say.
+_known_sizes = {}
+
+
+def enable_performance_log(options):
+    """Capability needed for blocked/loaded request accounting."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def apply_resource_policy(driver, policy):
+    policy = resolve_policy(policy)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": policy.url_patterns()})
+    if driver not in _sessions:
+        _sessions[driver] = _SessionStats(policy)
+    _sessions[driver].policy = policy
+    logger.debug(f"Applied {policy} to session {driver.session_id}")
+    return policy
+
+
+def reapply_resource_policy(driver):
+    """Re-install the session's policy on the current tab, if it has one."""
+    stats = _sessions.get(driver)
+    if stats is not None:
+        apply_resource_policy(driver, stats.policy)
+
+
+def _consume_performance_log(driver, stats):
+    try:
+        entries = driver.get_log("performance")
+    except WebDriverException:
+        return
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method = message.get("method")
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            stats.requests[request_id] = (params["request"]["url"], params.get("type", "Other"))
+        elif method == "Network.loadingFinished":
+            size = int(params.get("encodedDataLength", 0))
+            stats.bytes_loaded += size
+            url, _ = stats.requests.pop(request_id, (None, None))
+            if url:
+                _known_sizes[url] = size
+        elif method == "Network.loadingFailed":
+            url, resource_type = stats.requests.pop(request_id, (None, params.get("type", "Other")))
+            if params.get("blockedReason") != "inspector":
+                continue
+            stats.blocked_requests += 1
+            stats.blocked_by_type[resource_type] += 1
+            if url:
+                stats.blocked_urls.append(url)
+
+
+def _head_size(url):
+    try:
+        response = http_transport.request("HEAD", url, timeout=5, allow_redirects=True)
+        length = response.headers.get("Content-Length")
+        return int(length) if response.ok and length and length.isdigit() else None
+    except requests.RequestException:
+        return None
+
+
+def _estimate_sizes(urls):
+    unknown = sorted({url for url in urls if url not in _known_sizes and url.startswith("http")})
+    if unknown:
+        with ThreadPoolExecutor(max_workers=min(8, len(unknown))) as pool:
+            _known_sizes.update(zip(unknown, pool.map(_head_size, unknown)))
+
+
+def resource_stats(driver, estimate_sizes=True):
+    """Blocked/loaded request counters for the session so far.
+
+    ``bytes_saved`` sums the sizes of the blocked URLs that could be sized;
+    the rest are counted in ``unsized_blocked``. With ``estimate_sizes=False``
+    no HEAD requests are made and only sizes already known are used.
+    """
+    stats = _sessions.get(driver)
+    if stats is None:
+        return None
+    _consume_performance_log(driver, stats)
+    if estimate_sizes:
+        _estimate_sizes(stats.blocked_urls)
+    sizes = [_known_sizes.get(url) for url in stats.blocked_urls]
+    return {
+        "policy": stats.policy.url_patterns(),
+        "blocked_requests": stats.blocked_requests,
+        "blocked_by_type": dict(stats.blocked_by_type),
+        "bytes_loaded": stats.bytes_loaded,
+        "bytes_saved": sum(size for size in sizes if size is not None),
+        "unsized_blocked": stats.blocked_requests - sum(size is not None for size in sizes),
+    }
@@ -0,0 +1,15 @@
+import os
+
+
+def cache_dir(*parts):
+    """Per-user cache directory shared by every pysele process on the machine.
+
+    Honours ``PYSELE_CACHE_DIR`` and then ``XDG_CACHE_HOME``; the directory is
+    created on first use.
+    """
+    base = os.environ.get("PYSELE_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pysele"
+    )
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
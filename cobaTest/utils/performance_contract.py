@@ -0,0 +1,267 @@
+"""Latency contracts that hold up statistically.
+
+A single timed request says little about an endpoint: one slow TLS handshake
+or a GC pause fails the test, and one lucky sample hides a regression.
+``PerformanceContract.measure`` instead discards ``warmup`` calls, times
+``samples`` calls with ``perf_counter_ns`` and summarises them:
+
+* **Outliers**: samples beyond Tukey's far-out fences (3 IQR past the
+  quartiles) are set aside, but only while they are rare (at most
+  ``max_outlier_fraction`` of the run). If there are more, they are the
+  endpoint's real tail and stay in.
+* **Percentiles**: nearest-rank percentiles of the remaining samples, each
+  with a distribution-free confidence interval from order statistics (the
+  binomial interval for a quantile). With few samples the interval is
+  unbounded on one side, e.g. a p95 needs 72 samples for a 95% interval and
+  a p99 needs 368.
+* **Budgets**: a percentile breaches its budget only when the whole
+  interval lies above it, so noise alone doesn't fail the run. With
+  ``strict=True`` the whole interval must lie below the budget instead.
+* **History**: every result is appended to a JSONL file
+  (``PYSELE_PERF_HISTORY``, by default in the pysele cache directory) that
+  keeps the newest ``HISTORY_MAX_ENTRIES`` results. A run regresses when its
+  p50 interval lies entirely above the median p50 of the last few passing
+  runs against the same target, plus ``max_regression``. Targets are compared
+  without their port, so runs against a stub on an ephemeral port line up.
+"""
+import json
+import logging
+import math
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from cobaTest.utils.paths import cache_dir
+
+logger = logging.getLogger(__name__)
+
+HISTORY_RUNS = 5
+HISTORY_MAX_ENTRIES = 2000
+
+
+@dataclass
+class LatencyBudget:
+    """Latency percentiles an endpoint must meet, in milliseconds."""
+
+    percentiles: dict
+    samples: int = 40
+    warmup: int = 5
+    confidence: float = 0.95
+    max_outlier_fraction: float = 0.05
+    max_regression: float = 0.5
+    strict: bool = False
+    expect: tuple = (200,)
+
+
+def percentile_rank_interval(n, q, confidence):
+    """1-based ranks ``(lower, upper)`` bracketing quantile ``q`` of ``n`` samples.
+
+    Either is ``None`` when ``n`` is too small to bound that side.
+    """
+    alpha = (1 - confidence) / 2
+    cdf, total = [], 0.0
+    for k in range(n + 1):
+        # In log space, so large n neither overflows nor underflows.
+        total += math.exp(math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+                          + k * math.log(q) + (n - k) * math.log(1 - q))
+        cdf.append(total)
+    # P(x_(l) <= Q <= x_(u)) = P(l <= B <= u - 1) for B ~ Binomial(n, q).
+    lower = max((j for j in range(1, n + 1) if cdf[j - 1] <= alpha), default=None)
+    upper = min((j for j in range(1, n + 1) if cdf[j - 1] >= 1 - alpha), default=None)
+    return lower, upper
+
+
+def minimum_samples(q, confidence=0.95):
+    """Fewest samples for which quantile ``q`` has a two-sided interval."""
+    alpha = (1 - confidence) / 2
+    return math.ceil(math.log(alpha) / math.log(max(q, 1 - q)))
+
+
+def _history_target(target):
+    """``target`` without its port, e.g. ``http://127.0.0.1:41234/v2`` -> ``http://127.0.0.1/v2``."""
+    parts = urlsplit(target)
+    if not parts.hostname:
+        return target
+    host = f"[{parts.hostname}]" if ":" in parts.hostname else parts.hostname
+    return f"{parts.scheme}://{host}{parts.path.rstrip('/')}"
+
+
+def _quartiles(sorted_values):
+    quartiles = statistics.quantiles(sorted_values, n=4)
+    return quartiles[0], quartiles[2]
+
+
+@dataclass
+class PerformanceResult:
+    endpoint: str
+    target: str
+    samples_ms: list
+    outliers_ms: list
+    percentiles_ms: dict
+    intervals_ms: dict
+    violations: list = field(default_factory=list)
+    notes: list = field(default_factory=list)
+
+    @property
+    def passed(self):
+        return not self.violations
+
+    def format(self):
+        parts = []
+        for p, value in self.percentiles_ms.items():
+            low, high = self.intervals_ms[p]
+            bounds = f"[{'-inf' if low is None else f'{low:.2f}'}, {'inf' if high is None else f'{high:.2f}'}]"
+            parts.append(f"p{p:g}={value:.2f}ms {bounds}")
+        line = f"{self.endpoint}: {len(self.samples_ms)} samples, {len(self.outliers_ms)} outliers; " + ", ".join(parts)
+        return "\n".join([line] + [f"  note: {note}" for note in self.notes]
+                         + [f"  VIOLATION: {violation}" for violation in self.violations])
+
+    def to_dict(self):
+        return {
+            "endpoint": self.endpoint,
+            "target": self.target,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "samples": len(self.samples_ms),
+            "outliers": len(self.outliers_ms),
+            "percentiles_ms": {f"p{p:g}": value for p, value in self.percentiles_ms.items()},
+            "intervals_ms": {f"p{p:g}": list(interval) for p, interval in self.intervals_ms.items()},
+            "passed": self.passed,
+        }
+
+
+class PerformanceHistory:
+    """JSONL record of the newest ``max_entries`` results, for regression checks.
+
+    The file is parsed once and re-read only when something else changed it.
+    """
+
+    def __init__(self, path=None, max_entries=HISTORY_MAX_ENTRIES):
+        self.path = path or os.environ.get("PYSELE_PERF_HISTORY") or os.path.join(
+            cache_dir("perf"), "history.jsonl"
+        )
+        self.max_entries = max_entries
+        self._entries = []
+        self._stamp = None
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self):
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            entries = []
+            if stamp is not None:
+                with open(self.path) as f:
+                    for line in f:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            continue  # blank, or cut short by an interrupted run
+            self._entries, self._stamp = entries, stamp
+        return self._entries
+
+    def previous(self, endpoint, target, runs=HISTORY_RUNS):
+        """The last ``runs`` passing results for ``endpoint`` against ``target``."""
+        return [e for e in self._load() if e["endpoint"] == endpoint and e["target"] == target
+                and e.get("passed")][-runs:]
+
+    def append(self, result):
+        entries = self._load() + [result.to_dict()]
+        if len(entries) > self.max_entries:
+            entries = entries[-self.max_entries:]
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            os.replace(tmp, self.path)
+        else:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entries[-1]) + "\n")
+        self._entries, self._stamp = entries, self._file_stamp()
+
+
+class PerformanceContract:
+    def __init__(self, endpoint, budget, history=None):
+        self.endpoint = endpoint
+        self.budget = budget
+        self.history = PerformanceHistory() if history is None else history
+        for p in budget.percentiles:
+            needed = minimum_samples(p / 100, budget.confidence)
+            if budget.samples < needed:
+                logger.warning(f"{endpoint}: p{p:g} needs {needed} samples to be asserted, budget takes {budget.samples}")
+
+    def _time(self, call):
+        start = time.perf_counter_ns()
+        result = call()
+        elapsed = time.perf_counter_ns() - start
+        status = getattr(result, "status_code", None)
+        if status is not None and status not in self.budget.expect:
+            raise AssertionError(f"{self.endpoint} returned {status}; latency of failing calls isn't measured")
+        return elapsed
+
+    def measure(self, call, target="", samples=None, warmup=None):
+        """Time ``call()`` and check the samples against the budget and history.
+
+        ``target`` (e.g. the base URL) keeps the history of different servers
+        apart. The result is recorded in the history either way.
+        """
+        budget = self.budget
+        target = _history_target(target)
+        for _ in range(budget.warmup if warmup is None else warmup):
+            self._time(call)
+        timings = sorted(self._time(call) / 1e6 for _ in range(budget.samples if samples is None else samples))
+
+        kept, outliers = timings, []
+        if len(timings) >= 4:
+            q1, q3 = _quartiles(timings)
+            # On near-constant timings the IQR collapses; keep the fences sane.
+            spread = max(q3 - q1, 0.1 * q3)
+            low, high = q1 - 3 * spread, q3 + 3 * spread
+            far_out = [t for t in timings if t < low or t > high]
+            if len(far_out) <= budget.max_outlier_fraction * len(timings):
+                kept = [t for t in timings if low <= t <= high]
+                outliers = far_out
+
+        result = PerformanceResult(self.endpoint, target, kept, outliers, {}, {})
+        if outliers:
+            result.notes.append(f"set aside {len(outliers)} far-out sample(s): "
+                                + ", ".join(f"{t:.1f}ms" for t in outliers))
+        n = len(kept)
+        wanted = sorted(set(budget.percentiles) | {50})
+        for p in wanted:
+            result.percentiles_ms[p] = kept[max(math.ceil(p / 100 * n), 1) - 1]
+            lower, upper = percentile_rank_interval(n, p / 100, budget.confidence)
+            result.intervals_ms[p] = (
+                None if lower is None else kept[lower - 1],
+                None if upper is None else kept[upper - 1],
+            )
+
+        for p, limit in budget.percentiles.items():
+            low, high = result.intervals_ms[p]
+            if budget.strict and (high is None or high > limit):
+                result.violations.append(
+                    f"p{p:g} not shown to be under {limit}ms (upper bound {'unbounded' if high is None else f'{high:.1f}ms'})")
+            elif not budget.strict and low is not None and low > limit:
+                result.violations.append(f"p{p:g} is over {limit}ms (at least {low:.1f}ms)")
+            elif low is None:
+                result.notes.append(f"p{p:g} can't be asserted with {n} samples")
+
+        previous = self.history.previous(self.endpoint, target)
+        if previous:
+            baseline = statistics.median(entry["percentiles_ms"]["p50"] for entry in previous)
+            low = result.intervals_ms[50][0]
+            if low is not None and low > baseline * (1 + budget.max_regression):
+                result.violations.append(
+                    f"p50 regressed: at least {low:.1f}ms vs {baseline:.1f}ms median of the last {len(previous)} runs")
+        self.history.append(result)
+        logger.info(result.format())
+        return result
+
+    def assert_met(self, result):
+        assert result.passed, result.format()
@@ -0,0 +1,342 @@
+"""In-process stand-in for the public Swagger Petstore v2 and v3 servers.
+
+``PetstoreStub`` serves the pet, user and uploadImage endpoints the API
+suites use, for both API versions (under ``/v2`` and ``/api/v3``), from an
+in-memory store on a background asyncio loop. It starts in a few
+milliseconds and answers with the status codes the public servers use:
+
+* 400 for malformed JSON or a non-numeric pet id, 404 for unknown pets and
+  users, 415 for bodies that aren't JSON
+* pets failing the schema: 405 "Invalid input" on v2, 422 "Validation
+  exception" on v3
+* invalid ``findByStatus`` values: 400 on v3, an empty list on v2
+* deleting an unknown pet: 404 on v2, 200 on v3
+
+``PYSELE_PETSTORE_STUB=1`` is the switch: ``petstore_url(version)`` then
+returns the URL of a process-wide stub instead of the public server, and the
+clients and tests take their base URL from it. Latency and failures can be
+injected for client behaviour under load, from the environment
+(``PYSELE_STUB_LATENCY_MS``, ``PYSELE_STUB_JITTER_MS``,
+``PYSELE_STUB_ERROR_RATE``) or at runtime with ``configure()``.
+"""
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_URLS = {
+    "v2": "https://petstore.swagger.io/v2",
+    "v3": "https://petstore3.swagger.io/api/v3",
+}
+PREFIXES = {"v2": "/v2", "v3": "/api/v3"}
+PET_STATUSES = ("available", "pending", "sold")
+
+_STORE = web.AppKey("store", dict) if hasattr(web, "AppKey") else "store"
+_VERSION = web.AppKey("version", str) if hasattr(web, "AppKey") else "version"
+
+
+def _json(data, status=200):
+    # Plain "application/json", no charset, like the public servers.
+    return web.Response(body=json.dumps(data).encode(), status=status, content_type="application/json")
+
+
+def _error(status, message):
+    return _json({"code": status, "type": "error", "message": message}, status)
+
+
+def _invalid_pet(pet):
+    """Why ``pet`` doesn't match the Pet schema, or ``None``."""
+    if not isinstance(pet, dict):
+        return "body is not an object"
+    if not isinstance(pet.get("name"), str) or not pet["name"]:
+        return "name is required"
+    if not isinstance(pet.get("photoUrls"), list) or not all(isinstance(url, str) for url in pet["photoUrls"]):
+        return "photoUrls must be a list of strings"
+    if "id" in pet and (not isinstance(pet["id"], int) or isinstance(pet["id"], bool)):
+        return "id must be an integer"
+    if "status" in pet and pet["status"] not in PET_STATUSES:
+        return f"status must be one of {PET_STATUSES}"
+    if "category" in pet and not isinstance(pet["category"], dict):
+        return "category must be an object"
+    if "tags" in pet and not isinstance(pet["tags"], list):
+        return "tags must be a list"
+    return None
+
+
+async def _read_json(request):
+    if request.content_type != "application/json":
+        return None, _error(415, f"Unsupported media type {request.content_type}")
+    try:
+        return json.loads(await request.read()), None
+    except ValueError:
+        return None, _error(400, "bad input")
+
+
+def _pet_id(request):
+    try:
+        return int(request.match_info["pet_id"])
+    except ValueError:
+        return None
+
+
+async def _save_pet(request, must_exist):
+    store, version = request.app[_STORE], request.app[_VERSION]
+    pet, error = await _read_json(request)
+    if error is not None:
+        return error
+    problem = _invalid_pet(pet)
+    if problem is not None:
+        return _error(405, "Invalid input") if version == "v2" else _error(422, f"Validation exception: {problem}")
+    pets = store["pets"]
+    if must_exist:
+        if pet.get("id") not in pets:
+            return _error(404, "Pet not found")
+    elif "id" not in pet:
+        pet["id"] = next(i for i in store["ids"] if i not in pets)
+    pet.setdefault("tags", [])
+    pet.setdefault("status", "available")
+    pets[pet["id"]] = pet
+    return _json(pet)
+
+
+async def add_pet(request):
+    return await _save_pet(request, must_exist=False)
+
+
+async def update_pet(request):
+    return await _save_pet(request, must_exist=True)
+
+
+async def get_pet(request):
+    pet_id = _pet_id(request)
+    if pet_id is None:
+        return _error(400, "Invalid ID supplied")
+    pet = request.app[_STORE]["pets"].get(pet_id)
+    return _json(pet) if pet is not None else _error(404, "Pet not found")
+
+
+async def delete_pet(request):
+    pet_id = _pet_id(request)
+    if pet_id is None:
+        return _error(400, "Invalid ID supplied")
+    deleted = request.app[_STORE]["pets"].pop(pet_id, None)
+    if deleted is None and request.app[_VERSION] == "v2":
+        return _error(404, "Pet not found")
+    return _json({"code": 200, "type": "unknown", "message": str(pet_id)})
+
+
+async def find_pets_by_status(request):
+    statuses = request.query.getall("status", [])
+    statuses = [s for value in statuses for s in value.split(",")]
+    if any(s not in PET_STATUSES for s in statuses):
+        if request.app[_VERSION] == "v3":
+            return _error(400, "Invalid status value")
+    pets = request.app[_STORE]["pets"].values()
+    return _json([pet for pet in pets if pet.get("status") in statuses])
+
+
+async def upload_image(request):
+    pet_id = _pet_id(request)
+    if pet_id is None:
+        return _error(400, "Invalid ID supplied")
+    if pet_id not in request.app[_STORE]["pets"]:
+        return _error(404, "Pet not found")
+    metadata = request.query.get("additionalMetadata")
+    filename, size = None, 0
+    if request.content_type.startswith("multipart/"):
+        # Streamed, so multi-hundred-MB uploads never sit in memory.
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name == "file":
+                filename = part.filename or "file"
+                while True:
+                    chunk = await part.read_chunk(1 << 20)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+            elif part.name == "additionalMetadata":
+                metadata = await part.text()
+    else:
+        filename = "upload"
+        async for chunk in request.content.iter_chunked(1 << 20):
+            size += len(chunk)
+        if not size:
+            filename = None
+    if filename is None:
+        return _error(400, "No file uploaded")
+    return _json({
+        "code": 200,
+        "type": "unknown",
+        "message": f"additionalMetadata: {metadata}\nFile uploaded to ./{filename}, {size} bytes",
+    })
+
+
+async def create_user(request):
+    user, error = await _read_json(request)
+    if error is not None:
+        return error
+    if not isinstance(user, dict) or not isinstance(user.get("username"), str) or not user["username"]:
+        return _error(400, "Invalid user supplied")
+    request.app[_STORE]["users"][user["username"]] = user
+    if request.app[_VERSION] == "v2":
+        return _json({"code": 200, "type": "unknown", "message": str(user.get("id", 0))})
+    return _json(user)
+
+
+async def get_user(request):
+    user = request.app[_STORE]["users"].get(request.match_info["username"])
+    return _json(user) if user is not None else _json({"code": 1, "type": "error", "message": "User not found"}, 404)
+
+
+async def update_user(request):
+    username = request.match_info["username"]
+    users = request.app[_STORE]["users"]
+    if username not in users:
+        return _json({"code": 1, "type": "error", "message": "User not found"}, 404)
+    user, error = await _read_json(request)
+    if error is not None:
+        return error
+    if not isinstance(user, dict):
+        return _error(400, "Invalid user supplied")
+    users.pop(username)
+    users[user.get("username", username)] = user
+    return _json({"code": 200, "type": "unknown", "message": str(user.get("id", 0))})
+
+
+async def delete_user(request):
+    if request.app[_STORE]["users"].pop(request.match_info["username"], None) is None:
+        return _json({"code": 1, "type": "error", "message": "User not found"}, 404)
+    return _json({"code": 200, "type": "unknown", "message": request.match_info["username"]})
+
+
+def _api(version):
+    app = web.Application()
+    app[_VERSION] = version
+    app[_STORE] = {"pets": {}, "users": {}, "ids": itertools.count(1)}
+    app.router.add_post("/pet", add_pet)
+    app.router.add_put("/pet", update_pet)
+    app.router.add_get("/pet/findByStatus", find_pets_by_status)
+    app.router.add_get("/pet/{pet_id}", get_pet)
+    app.router.add_delete("/pet/{pet_id}", delete_pet)
+    app.router.add_post("/pet/{pet_id}/uploadImage", upload_image)
+    app.router.add_post("/user", create_user)
+    app.router.add_get("/user/{username}", get_user)
+    app.router.add_put("/user/{username}", update_user)
+    app.router.add_delete("/user/{username}", delete_user)
+    return app
+
+
+def _env_float(name, default=0.0):
+    return float(os.environ.get(name) or default)
+
+
+class PetstoreStub:
+    def __init__(self, latency_ms=None, jitter_ms=None, error_rate=None, error_status=503, seed=None,
+                 host="127.0.0.1", port=0):
+        self.latency_ms = _env_float("PYSELE_STUB_LATENCY_MS") if latency_ms is None else latency_ms
+        self.jitter_ms = _env_float("PYSELE_STUB_JITTER_MS") if jitter_ms is None else jitter_ms
+        self.error_rate = _env_float("PYSELE_STUB_ERROR_RATE") if error_rate is None else error_rate
+        self.error_status = error_status
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._apis = {}
+        self._loop = None
+        self._thread = None
+        self._runner = None
+
+    def configure(self, **knobs):
+        """Change ``latency_ms``, ``jitter_ms``, ``error_rate`` or ``error_status`` while running."""
+        for name, value in knobs.items():
+            if name not in ("latency_ms", "jitter_ms", "error_rate", "error_status"):
+                raise TypeError(f"Unknown stub setting {name!r}")
+            setattr(self, name, value)
+        return self
+
+    def reset(self):
+        """Forget every pet and user."""
+        for api in self._apis.values():
+            api[_STORE]["pets"].clear()
+            api[_STORE]["users"].clear()
+
+    @web.middleware
+    async def _faults(self, request, handler):
+        self.requests += 1
+        delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return _error(self.error_status, "Injected failure")
+        return await handler(request)
+
+    async def _start(self):
+        app = web.Application(middlewares=[self._faults], client_max_size=1 << 30)
+        for version, prefix in PREFIXES.items():
+            self._apis[version] = _api(version)
+            app.add_subapp(prefix, self._apis[version])
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    def start(self):
+        started = time.perf_counter()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="petstore-stub", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        logger.info(f"Petstore stub on {self.url('v2')} and {self.url('v3')} "
+                    f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def url(self, version):
+        return f"http://{self.host}:{self.port}{PREFIXES[version]}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def stub_enabled():
+    return os.environ.get("PYSELE_PETSTORE_STUB") == "1"
+
+
+_shared = None
+_lock = threading.Lock()
+
+
+def shared_stub():
+    """The process-wide stub, started on first use and stopped at exit."""
+    global _shared
+    with _lock:
+        if _shared is None:
+            _shared = PetstoreStub().start()
+            atexit.register(_shared.stop)
+        return _shared
+
+
+def petstore_url(version):
+    """Base URL for Petstore ``"v2"`` or ``"v3"``: the stub's when enabled, else the public one."""
+    return shared_stub().url(version) if stub_enabled() else PUBLIC_URLS[version]
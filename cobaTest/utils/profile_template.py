@@ -0,0 +1,257 @@
+"""Pre-initialized Chrome profile templates cloned per session.
+
+Starting Chrome on an empty ``--user-data-dir`` (or in incognito) pays for
+first-run profile initialization on every session. The template is built
+once per machine with our prefs baked in and then cloned for each session,
+using reflinks where the filesystem supports them and real copies otherwise.
+Only component-updater downloads, which are installed into versioned
+directories and never modified afterwards, are shared through hardlinks.
+Clones are removed when the driver quits, or at interpreter exit at the
+latest.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import weakref
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from cobaTest.utils.driver_cache import resolve_driver_path
+from cobaTest.utils.paths import cache_dir
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_PREFS = {
+    "credentials_enable_service": False,
+    "profile": {
+        "password_manager_enabled": False,
+        "default_content_setting_values": {"notifications": 2},
+    },
+}
+
+PROFILE_ARGS = ["--no-first-run", "--no-default-browser-check", "--disable-notifications"]
+
+_MARKER = ".pysele-template"
+# Process-specific files Chrome leaves behind; a clone must never inherit them.
+_SKIP_NAMES = {"SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile"}
+# Chrome rewrites most profile files in place (SQLite stores, LevelDB, the
+# blockfile cache, the mmap'd "Visited Links"), and a hardlinked file shares
+# its inode with the template and every other clone. So every file is copied,
+# except those under these component-updater install directories: each
+# component version is unpacked into its own directory and never touched again.
+_SHARED_DIRS = {
+    "CertificateRevocation", "Crowd Deny", "FileTypePolicies", "FirstPartySetsPreloaded",
+    "hyphen-data", "MEIPreload", "OnDeviceHeadSuggestModel", "OriginTrials", "PKIMetadata",
+    "SafetyTips", "SSLErrorAssistant", "TrustTokenKeyCommitments", "WidevineCdm", "ZxcvbnData",
+}
+
+_live_clones = set()
+_reflink_supported = None
+
+
+def _template_dir():
+    key = hashlib.sha1(json.dumps(TEMPLATE_PREFS, sort_keys=True).encode()).hexdigest()[:12]
+    return os.path.join(cache_dir("profiles"), f"chrome-{key}")
+
+
+def ensure_profile_template():
+    """Return the template directory, building it the first time it's needed."""
+    template = _template_dir()
+    if os.path.exists(os.path.join(template, _MARKER)):
+        return template
+    if os.path.exists(template):
+        # The template is renamed into place complete with its marker, so one
+        # without it was left by an interrupted or older build.
+        logger.warning(f"Discarding incomplete Chrome profile template {template}")
+        _discard(template)
+
+    logger.info(f"Building Chrome profile template in {template}")
+    staging = tempfile.mkdtemp(prefix="pysele-template-", dir=os.path.dirname(template))
+    try:
+        _build_template(staging)
+    except BaseException:
+        # Otherwise every failed build leaves another staging dir behind.
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    try:
+        os.rename(staging, template)
+    except OSError:
+        if os.path.exists(os.path.join(template, _MARKER)):
+            # Another process finished its template first; keep theirs.
+            shutil.rmtree(staging, ignore_errors=True)
+        else:
+            _discard(template)
+            try:
+                os.rename(staging, template)
+            except OSError:
+                shutil.rmtree(staging, ignore_errors=True)
+    return template
+
+
+def _build_template(staging):
+    os.makedirs(os.path.join(staging, "Default"))
+    with open(os.path.join(staging, "Default", "Preferences"), "w") as f:
+        json.dump(TEMPLATE_PREFS, f)
+
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument(f"--user-data-dir={staging}")
+    for arg in PROFILE_ARGS:
+        options.add_argument(arg)
+    # One full start/stop cycle lets Chrome do its first-run initialization.
+    driver = webdriver.Chrome(service=Service(resolve_driver_path("chrome")), options=options)
+    try:
+        driver.get("about:blank")
+    finally:
+        driver.quit()
+
+    for name in _SKIP_NAMES:
+        path = os.path.join(staging, name)
+        if os.path.lexists(path):
+            os.remove(path)
+    open(os.path.join(staging, _MARKER), "w").close()
+
+
+def _discard(path):
+    """Move ``path`` out of the way atomically, then delete it."""
+    trash = f"{path}.discarded-{os.getpid()}"
+    try:
+        os.rename(path, trash)
+    except FileNotFoundError:
+        return
+    shutil.rmtree(trash, ignore_errors=True)
+
+
+def _can_share(relpath):
+    return relpath.split(os.sep)[0] in _SHARED_DIRS
+
+
+def _reflink_copy(src, dst):
+    if sys.platform.startswith("linux"):
+        cmd = ["cp", "-a", "--reflink=always", f"{src}/.", dst]
+    elif sys.platform == "darwin":
+        cmd = ["cp", "-c", "-R", f"{src}/.", dst]
+    else:
+        return False
+    return subprocess.run(cmd, capture_output=True).returncode == 0
+
+
+def _link_copy(src, dst):
+    for root, dirs, files in os.walk(src):
+        rel_root = os.path.relpath(root, src)
+        target_root = os.path.normpath(os.path.join(dst, rel_root))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            if name in _SKIP_NAMES or name == _MARKER:
+                continue
+            source = os.path.join(root, name)
+            target = os.path.join(target_root, name)
+            if os.path.islink(source):
+                continue
+            if _can_share(os.path.normpath(os.path.join(rel_root, name))):
+                try:
+                    os.link(source, target)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(source, target)
+
+
+def clone_profile(template=None):
+    """Create a throwaway user-data-dir from the template."""
+    global _reflink_supported
+    template = template or ensure_profile_template()
+    clone = tempfile.mkdtemp(prefix="pysele-profile-")
+
+    if _reflink_supported is not False:
+        _reflink_supported = _reflink_copy(template, clone)
+        if not _reflink_supported:
+            shutil.rmtree(clone, ignore_errors=True)
+            os.makedirs(clone)
+    if not _reflink_supported:
+        _link_copy(template, clone)
+    else:
+        marker = os.path.join(clone, _MARKER)
+        if os.path.exists(marker):
+            os.remove(marker)
+
+    _live_clones.add(clone)
+    return clone
+
+
+def remove_clone(clone):
+    _live_clones.discard(clone)
+    shutil.rmtree(clone, ignore_errors=True)
+
+
+def attach_clone(driver, clone):
+    """Delete ``clone`` once ``driver`` quits (or is garbage collected)."""
+    finalizer = weakref.finalize(driver, remove_clone, clone)
+    quit_driver = driver.quit
+
+    def quit_and_cleanup():
+        try:
+            quit_driver()
+        finally:
+            finalizer()
+
+    driver.quit = quit_and_cleanup
+
+
+@atexit.register
+def _remove_live_clones():
+    for clone in list(_live_clones):
+        remove_clone(clone)
+
+
+def measure_session_startup(runs=3, headless=True):
+    """Compare mean session creation time for incognito vs. template clones.
+
+    The template is built before timing starts so only the steady state is
+    compared.
+    """
+    from cobaTest.utils.driver_factory import get_driver
+
+    ensure_profile_template()
+    results = {}
+    for label, use_template in (("incognito", False), ("profile_template", True)):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            driver = get_driver(headless=headless, profile_template=use_template)
+            timings.append(time.perf_counter() - start)
+            driver.quit()
+        results[label] = sum(timings) / len(timings)
+    results["saving_seconds"] = results["incognito"] - results["profile_template"]
+    results["saving_percent"] = 100.0 * results["saving_seconds"] / results["incognito"]
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Chrome profile template tools")
+    parser.add_argument("--rebuild", action="store_true", help="Discard and rebuild the template")
+    parser.add_argument("--benchmark", type=int, metavar="RUNS", help="Measure session creation time saved")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        shutil.rmtree(_template_dir(), ignore_errors=True)
+    print(f"Template: {ensure_profile_template()}")
+    if args.benchmark:
+        timings = measure_session_startup(runs=args.benchmark)
+        print(f"Incognito session:        {timings['incognito']:.2f}s")
+        print(f"Profile template session: {timings['profile_template']:.2f}s")
+        print(f"Saved per session:        {timings['saving_seconds']:.2f}s ({timings['saving_percent']:.0f}%)")
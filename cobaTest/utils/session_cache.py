@@ -0,0 +1,162 @@
+"""Cookie cache for authenticated CURA sessions.
+
+Logging in through ``LoginPage`` costs two page loads and a form post per
+test. ``SessionCache`` logs in once per credential set, keeps the resulting
+cookies (in memory and in a 0600 JSON file under the pysele cache dir), and
+injects them into later drivers so they can go straight to ``#appointment``.
+A cached entry is dropped once it is older than ``max_age``, any of its
+cookies has expired, or the injected session turns out to be logged out; a
+real login then refreshes it.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from cobaTest.pages.appointment_page import AppointmentPage
+from cobaTest.pages.login_page import LoginPage
+from cobaTest.utils.driver_factory import leased_driver
+from cobaTest.utils.paths import cache_dir
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://katalon-demo-cura.herokuapp.com/"
+# The demo app doesn't advertise its server-side session lifetime; stay well
+# below PHP's default 24 minutes.
+DEFAULT_MAX_AGE = 15 * 60
+VERIFY_TIMEOUT = 5
+
+
+class SessionCache:
+    def __init__(self, path=None, max_age=DEFAULT_MAX_AGE):
+        self.path = path or os.path.join(cache_dir("sessions"), "cura.json")
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _key(self, base_url, username, password):
+        # Only a digest of the credentials ever reaches the disk.
+        return hashlib.sha256(f"{base_url}\0{username}\0{password}".encode()).hexdigest()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, self.path)
+
+    def cookies_for(self, base_url, username, password):
+        """Cached cookies for the credentials, or ``None`` if absent or expired."""
+        key = self._key(base_url, username, password)
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            expired = now - entry["created"] > self.max_age or any(
+                cookie.get("expiry", now + 1) <= now for cookie in entry["cookies"]
+            )
+            if expired:
+                self._drop(key)
+                return None
+            return entry["cookies"]
+
+    def store(self, base_url, username, password, cookies):
+        with self._lock:
+            self._load()[self._key(base_url, username, password)] = {"created": time.time(), "cookies": cookies}
+            self._save()
+
+    def invalidate(self, base_url, username, password):
+        with self._lock:
+            self._drop(self._key(base_url, username, password))
+
+    def _drop(self, key):
+        if self._load().pop(key, None) is not None:
+            self._save()
+
+    def login(self, driver, username, password, base_url=BASE_URL):
+        """Leave ``driver`` logged in on the appointment form.
+
+        Returns ``True`` when cached cookies were reused and ``False`` when a
+        real login through ``LoginPage`` was needed.
+        """
+        cookies = self.cookies_for(base_url, username, password)
+        if cookies:
+            inject_cookies(driver, cookies, base_url)
+            driver.get(urljoin(base_url, "#appointment"))
+            try:
+                AppointmentPage(driver).wait_until_ready(VERIFY_TIMEOUT)
+                return True
+            except TimeoutException:
+                logger.info(f"Cached session for {username!r} was rejected; logging in again")
+                self.invalidate(base_url, username, password)
+
+        login_page = LoginPage(driver)
+        login_page.open(base_url)
+        login_page.go_to_login()
+        login_page.login(username, password)
+        AppointmentPage(driver).wait_until_ready()
+        self.store(base_url, username, password, driver.get_cookies())
+        return False
+
+
+def inject_cookies(driver, cookies, base_url=BASE_URL):
+    """Install cookies for ``base_url`` without loading a page when possible."""
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_to_cdp(c, base_url) for c in cookies]})
+        return
+    except (AttributeError, WebDriverException):
+        pass
+    # Plain WebDriver only sets cookies for the document's own domain, so any
+    # page on the host will do; a missing one is the cheapest to load.
+    driver.get(urljoin(base_url, "favicon.ico"))
+    for cookie in cookies:
+        driver.add_cookie({k: v for k, v in cookie.items() if k != "sameSite" or v in ("Strict", "Lax", "None")})
+
+
+def _to_cdp(cookie, base_url):
+    cdp_cookie = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "domain": cookie.get("domain") or urlparse(base_url).hostname,
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if "expiry" in cookie:
+        cdp_cookie["expires"] = cookie["expiry"]
+    return cdp_cookie
+
+
+_default_cache = None
+
+
+def login_with_session_cache(driver, username, password, base_url=BASE_URL):
+    """``SessionCache.login`` on a process-wide cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SessionCache()
+    return _default_cache.login(driver, username, password, base_url)
+
+
+@contextmanager
+def logged_in_session(username, password, base_url=BASE_URL, headless=False):
+    """A pooled driver logged in on the appointment form, returned to the pool afterwards."""
+    with leased_driver(headless) as driver:
+        login_with_session_cache(driver, username, password, base_url)
+        yield driver
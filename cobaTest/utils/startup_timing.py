@@ -0,0 +1,149 @@
+"""Phase-level timing of WebDriver startup.
+
+``get_driver`` records how long each session spends in driver binary
+resolution, driver service spawn, WebDriver session creation and the first
+navigation. Each phase is pushed to the registered hooks as it completes and
+kept for a per-run report. The report has percentiles per phase, overall and
+per set of browser options, and is written as JSON. Set
+``PYSELE_STARTUP_REPORT=<path>`` to write it automatically at exit.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("resolve_driver", "service_start", "session_create", "first_navigation")
+PERCENTILES = (50, 90, 95, 99)
+
+_hooks = []
+_samples = []
+_lock = threading.Lock()
+
+
+def add_startup_hook(callback):
+    """Register ``callback(phase, seconds, timing)``, called as each phase ends."""
+    _hooks.append(callback)
+
+
+def remove_startup_hook(callback):
+    _hooks.remove(callback)
+
+
+class StartupTiming:
+    def __init__(self, browser, arguments):
+        self.browser = browser
+        # Per-session paths would split every sample into its own group.
+        self.arguments = [arg.split("=")[0] if arg.startswith("--user-data-dir") else arg for arg in arguments]
+        self.phases = {}
+        with _lock:
+            _samples.append(self)
+
+    def record(self, phase, seconds):
+        self.phases[phase] = seconds
+        for hook in list(_hooks):
+            try:
+                hook(phase, seconds, self)
+            except Exception:
+                logger.exception(f"Startup hook {hook!r} failed")
+
+    @contextmanager
+    def measure(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def instrument_service(self, service):
+        start_service = service.start
+
+        def timed_start(*args, **kwargs):
+            with self.measure("service_start"):
+                return start_service(*args, **kwargs)
+
+        service.start = timed_start
+
+    def instrument_first_navigation(self, driver):
+        navigate = driver.get
+
+        def timed_first_get(url):
+            del driver.get  # later calls go straight to WebDriver.get
+            with self.measure("first_navigation"):
+                return navigate(url)
+
+        driver.get = timed_first_get
+
+    def as_dict(self):
+        return {"browser": self.browser, "arguments": self.arguments, "phases": dict(self.phases)}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples):
+    summary = {}
+    for phase in PHASES:
+        values = sorted(s["phases"][phase] for s in samples if phase in s["phases"])
+        if not values:
+            continue
+        stats = {"count": len(values), "mean": sum(values) / len(values), "max": values[-1]}
+        for pct in PERCENTILES:
+            stats[f"p{pct}"] = percentile(values, pct)
+        summary[phase] = stats
+    return summary
+
+
+def build_report(samples):
+    by_options = {}
+    for sample in samples:
+        key = " ".join(sorted(sample["arguments"]))
+        by_options.setdefault(key, []).append(sample)
+    return {
+        "samples": samples,
+        "phases": summarize(samples),
+        "by_options": {key: summarize(group) for key, group in by_options.items()},
+    }
+
+
+def startup_samples():
+    with _lock:
+        return [timing.as_dict() for timing in _samples]
+
+
+def write_startup_report(path):
+    report = build_report(startup_samples())
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def merge_startup_reports(paths, out_path):
+    """Combine reports written by several processes into one."""
+    samples = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                samples.extend(json.load(f)["samples"])
+        except (OSError, ValueError, KeyError):
+            continue
+    report = build_report(samples)
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+@atexit.register
+def _write_report_at_exit():
+    path = os.environ.get("PYSELE_STARTUP_REPORT")
+    if path and _samples:
+        write_startup_report(path)